@@ -0,0 +1,219 @@
+# SDK/harmony_cli/chronicle_index.py
+#
+# Persistent embedding index for the Chronicle.
+# Indexes an append-only byte stream: a single log file (FileSource) or the
+# concatenated segments of a ChronicleStore. Lives in <log>.index/ or the store's index dir:
+#   vectors.f32  - raw float32 rows (count x dim), unit-normalized, memory-mapped on read
+#   offsets.i64  - byte offset of each indexed line in the stream
+#   meta.json    - model, dim, count, last indexed byte offset, hash of the indexed head
+#   bm25.pkl     - inverted index over the same rows (see hybrid.py)
+#   cache.json   - LRU of recent query results, keyed by index version
+# Only lines appended after meta["offset"] are embedded on refresh.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .embed_daemon import MODEL_PATH
+
+EMBED_BATCH = 64
+FINGERPRINT_BYTES = 4096
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores, k):
+    """Indices of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class FileSource:
+    """A single append-only log file, in the interface ChronicleIndex reads through."""
+
+    def __init__(self, path):
+        self.path = path
+        self.index_dir = path + ".index"
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def size(self):
+        return os.path.getsize(self.path)
+
+    def read(self, offset, length=-1):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def readline_at(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.readline()
+
+
+class ChronicleIndex:
+    def __init__(self, source, index_dir=None, model=MODEL_PATH):
+        self.source = FileSource(source) if isinstance(source, str) else source
+        self.index_dir = index_dir or self.source.index_dir
+        self.model = model
+        self.vectors_path = os.path.join(self.index_dir, "vectors.f32")
+        self.offsets_path = os.path.join(self.index_dir, "offsets.i64")
+        self.meta_path = os.path.join(self.index_dir, "meta.json")
+        self.bm25_path = os.path.join(self.index_dir, "bm25.pkl")
+        self.cache_path = os.path.join(self.index_dir, "cache.json")
+        self.meta = self._load_meta()
+        self._bm25 = None
+
+    # --- metadata ------------------------------------------------------------
+    def _empty_meta(self):
+        return {"model": self.model, "dim": 0, "count": 0, "offset": 0, "head_hash": None}
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_meta()
+        if meta.get("model") != self.model:
+            return self._empty_meta()
+        return meta
+
+    def _save_meta(self):
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def _head_hash(self, upto):
+        """Hash of the log's first bytes; a change means the log was rewritten, not appended."""
+        return hashlib.sha256(self.source.read(0, min(upto, FINGERPRINT_BYTES))).hexdigest()
+
+    @property
+    def version(self):
+        return f"{self.meta['count']}:{self.meta['offset']}:{(self.meta['head_hash'] or '')[:8]}"
+
+    def _reset(self):
+        self.meta = self._empty_meta()
+        self._bm25 = None
+        for path in (self.vectors_path, self.offsets_path, self.bm25_path, self.cache_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # --- build ---------------------------------------------------------------
+    def stale(self):
+        """True if the log was truncated or rewritten since the last refresh."""
+        if not self.meta["offset"]:
+            return False
+        if self.source.size() < self.meta["offset"]:
+            return True
+        return self._head_hash(self.meta["offset"]) != self.meta["head_hash"]
+
+    def pending_lines(self):
+        """(offset, text) for complete, non-blank lines appended since the last refresh."""
+        data = self.source.read(self.meta["offset"])
+        end = data.rfind(b"\n") + 1  # leave a partial trailing line for next time
+        lines, pos = [], self.meta["offset"]
+        for raw in data[:end].splitlines(keepends=True):
+            text = raw.decode("utf-8", errors="replace").strip()
+            if text:
+                lines.append((pos, text))
+            pos += len(raw)
+        return lines, self.meta["offset"] + end
+
+    def refresh(self, embed):
+        """
+        Embed lines appended since the last refresh. `embed` maps a list of
+        strings to an (n, dim) array. Returns the number of new lines indexed.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        if not self.source.exists():
+            return 0
+        if self.stale():
+            self._reset()
+        lines, new_offset = self.pending_lines()
+        if new_offset == self.meta["offset"]:
+            return 0
+
+        # Drop rows written by an interrupted refresh that never reached meta.json
+        count = self.meta["count"]
+        for path, width in ((self.vectors_path, 4 * self.meta["dim"]), (self.offsets_path, 8)):
+            if os.path.exists(path):
+                os.truncate(path, count * width)
+
+        bm25 = self.bm25()
+        with open(self.vectors_path, "ab") as vf, open(self.offsets_path, "ab") as of:
+            for i in range(0, len(lines), EMBED_BATCH):
+                batch = lines[i:i + EMBED_BATCH]
+                for _, text in batch:
+                    bm25.add(text)
+                vectors = normalize(embed([text for _, text in batch]))
+                vf.write(vectors.tobytes())
+                of.write(np.asarray([off for off, _ in batch], dtype=np.int64).tobytes())
+                self.meta["dim"] = int(vectors.shape[1])
+                count += len(batch)
+
+        self.meta["count"] = count
+        self.meta["offset"] = new_offset
+        self.meta["head_hash"] = self._head_hash(new_offset)
+        bm25.save(self.bm25_path)
+        self._save_meta()
+        return len(lines)
+
+    def bm25(self):
+        """BM25 index aligned with the vector rows, rebuilt from the log if missing or out of step."""
+        from .hybrid import BM25Index
+        if self._bm25 is None:
+            bm25 = BM25Index.load(self.bm25_path)
+            if bm25 is None or len(bm25) > self.meta["count"]:
+                bm25 = BM25Index()
+            offsets = self.offsets()
+            for offset in offsets[len(bm25):self.meta["count"]]:
+                bm25.add(self.line_at(int(offset)))
+            self._bm25 = bm25
+        return self._bm25
+
+    # --- query ---------------------------------------------------------------
+    def vectors(self):
+        if not self.meta["count"]:
+            return np.zeros((0, self.meta["dim"] or 1), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                         shape=(self.meta["count"], self.meta["dim"]))
+
+    def offsets(self):
+        if not self.meta["count"]:
+            return np.zeros(0, dtype=np.int64)
+        return np.memmap(self.offsets_path, dtype=np.int64, mode="r", shape=(self.meta["count"],))
+
+    def hybrid_search(self, query, embed, k=3):
+        """Top-k (line, score): BM25 first, vector rerank of its candidates, cached per index version."""
+        from .hybrid import QueryCache, hybrid_search
+        vectors = self.vectors()
+        results = hybrid_search(query, self.bm25(), lambda ids: vectors[ids], embed, k=k,
+                                version=self.version, cache=QueryCache(self.cache_path))
+        offsets = self.offsets()
+        return [(self.line_at(int(offsets[i])), score) for i, score in results]
+
+    def search(self, query_vector, k=3):
+        """Top-k (line, score) by cosine similarity."""
+        vectors = self.vectors()
+        if not len(vectors):
+            return []
+        scores = vectors @ normalize(query_vector)[0]
+        offsets = self.offsets()
+        return [(self.line_at(int(offsets[i])), float(scores[i])) for i in top_k(scores, k)]
+
+    def line_at(self, offset):
+        return self.source.readline_at(offset).decode("utf-8", errors="replace").strip()
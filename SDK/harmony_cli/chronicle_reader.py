@@ -0,0 +1,225 @@
+# SDK/harmony_cli/chronicle_reader.py
+#
+# Output-proportional reads of logs/chronicle.log:
+# - tail: reads fixed-size blocks backwards from EOF until enough lines are found
+# - time ranges: seek to the first entry >= since, via the sparse timestamp index when
+#   it is current, otherwise by bisecting the file on the "[YYYY-mm-dd HH:MM:SS]" prefix
+# The sparse index (<log>.tsidx) holds one "<timestamp>\t<byte offset>" row per
+# INDEX_STRIDE bytes of log; chronicle_entry appends to it, so it never needs a full scan.
+
+import os
+import re
+from bisect import bisect_left
+
+BLOCK_BYTES = 64 * 1024
+INDEX_STRIDE = 64 * 1024
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMESTAMP = re.compile(rb"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]")
+RELATIVE = re.compile(r"^(\d+)([smhdw])$")
+UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def line_timestamp(line):
+    """The entry's timestamp string, or None for lines without one."""
+    m = TIMESTAMP.match(line if isinstance(line, bytes) else line.encode("utf-8"))
+    return m.group(1).decode() if m else None
+
+
+def parse_time(value, now=None, end_of_day=False):
+    """
+    '2025-08-01', '2025-08-01 12:00[:00]', or relative '30m', '2h', '7d', '1w' ->
+    timestamp string. A bare date means its last second when end_of_day is set (for --until).
+    """
+    from datetime import datetime, timedelta
+    if value is None:
+        return None
+    value = value.strip()
+    m = RELATIVE.match(value)
+    if m:
+        when = (now or datetime.now()) - timedelta(**{UNITS[m.group(2)]: int(m.group(1))})
+        return when.strftime(TIMESTAMP_FORMAT)
+    for fmt in (TIMESTAMP_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            when = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y-%m-%d" and end_of_day:
+            when += timedelta(days=1, seconds=-1)
+        return when.strftime(TIMESTAMP_FORMAT)
+    raise ValueError(f"Unrecognized time: {value!r} (use YYYY-mm-dd[ HH:MM[:SS]] or 30m/2h/7d/1w)")
+
+
+# === TAIL ===
+
+def iter_reverse_lines(f, end=None, block_bytes=BLOCK_BYTES):
+    """Yield lines (bytes, without newline) from end-of-file backwards, reading block by block."""
+    pos = f.seek(0, os.SEEK_END) if end is None else end
+    tail = b""
+    while pos > 0:
+        step = min(block_bytes, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step) + tail
+        lines = block.split(b"\n")
+        tail = lines.pop(0)  # may continue in the previous block
+        for line in reversed(lines):
+            if line:
+                yield line
+    if tail:
+        yield tail
+
+
+def tail(path, n, grep=None):
+    """Last n lines (oldest first), optionally only those matching the compiled regex grep."""
+    found = []
+    if n <= 0:
+        return found
+    with open(path, "rb") as f:
+        for raw in iter_reverse_lines(f):
+            line = raw.decode("utf-8", errors="replace")
+            if grep is None or grep.search(line):
+                found.append(line)
+                if len(found) >= n:
+                    break
+    found.reverse()
+    return found
+
+
+# === SPARSE TIMESTAMP INDEX ===
+
+def index_path(path):
+    return path + ".tsidx"
+
+
+def load_time_index(path):
+    """[(timestamp, offset)] if <log>.tsidx exists and still describes this log, else None."""
+    try:
+        with open(index_path(path), "r") as f:
+            rows = [line.rstrip("\n").split("\t") for line in f if line.strip()]
+        entries = [(ts, int(off)) for ts, off in rows]
+    except (OSError, ValueError):
+        return None
+    if not entries:
+        return None
+    size = os.path.getsize(path)
+    ts, off = entries[-1]
+    if off >= size:
+        return None
+    with open(path, "rb") as f:
+        f.seek(off)
+        if line_timestamp(f.readline()) != ts:
+            return None
+    return entries
+
+
+def note_append(path, offset, timestamp):
+    """
+    Called by writers after appending an entry at byte offset: records it in the
+    sparse index when it starts a new INDEX_STRIDE block. O(1) per append.
+    """
+    idx = index_path(path)
+    try:
+        last_block = -1
+        if os.path.exists(idx):
+            with open(idx, "rb") as f:
+                last = next(iter_reverse_lines(f, block_bytes=256), None)
+            if last:
+                last_block = int(last.split(b"\t")[1]) // INDEX_STRIDE
+        elif offset:
+            return  # no index for an existing log; build one with rebuild_time_index
+        if offset // INDEX_STRIDE > last_block:
+            with open(idx, "a") as f:
+                f.write(f"{timestamp}\t{offset}\n")
+    except (OSError, ValueError, IndexError):
+        pass
+
+
+def rebuild_time_index(path):
+    """One full pass over the log; returns the number of index rows written."""
+    rows, next_block = [], 0
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            if offset >= next_block * INDEX_STRIDE:
+                ts = line_timestamp(line)
+                if ts:
+                    rows.append(f"{ts}\t{offset}\n")
+                    next_block = offset // INDEX_STRIDE + 1
+            offset += len(line)
+    tmp = index_path(path) + ".tmp"
+    with open(tmp, "w") as f:
+        f.writelines(rows)
+    os.replace(tmp, index_path(path))
+    return len(rows)
+
+
+# === RANGE READS ===
+
+def _next_timestamp(f, pos):
+    """(offset, timestamp) of the first timestamped line starting at or after pos."""
+    f.seek(pos)
+    if pos:
+        f.seek(pos - 1)
+        f.readline()  # finish the line pos landed in (no-op when pos starts a line)
+    while True:
+        offset = f.tell()
+        line = f.readline()
+        if not line:
+            return offset, None
+        ts = line_timestamp(line)
+        if ts:
+            return offset, ts
+
+
+def seek_time(f, since, index=None):
+    """Byte offset of the first entry with timestamp >= since."""
+    lo, hi = 0, f.seek(0, os.SEEK_END)
+    if index:
+        i = bisect_left([ts for ts, _ in index], since) - 1
+        # index[i] is older than since; the answer is at or before index[i+1]
+        lo = index[i][1] if i >= 0 else 0
+        hi = index[i + 1][1] if i + 1 < len(index) else hi
+    # Bisect on line starts: invariant - entries before lo are < since
+    while hi - lo > BLOCK_BYTES:
+        mid = (lo + hi) // 2
+        offset, ts = _next_timestamp(f, mid)
+        if ts is None or ts >= since:
+            hi = mid
+        else:
+            lo = offset
+    offset, ts = _next_timestamp(f, lo)
+    while ts is not None and ts < since:
+        f.seek(offset)
+        f.readline()
+        offset, ts = _next_timestamp(f, f.tell())
+    return offset
+
+
+def read_range(path, since=None, until=None, grep=None, limit=None):
+    """Lines with since <= timestamp <= until (strings as from parse_time), in file order."""
+    out = []
+    with open(path, "rb") as f:
+        start = seek_time(f, since, load_time_index(path)) if since else 0
+        f.seek(start)
+        for raw in f:
+            ts = line_timestamp(raw)
+            if until and ts and ts > until:
+                break
+            line = raw.decode("utf-8", errors="replace").rstrip("\n")
+            if not line.strip() or (grep is not None and not grep.search(line)):
+                continue
+            out.append(line)
+    if limit is not None:
+        out = out[-limit:] if limit else []
+    return out
+
+
+def parse_args(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="harmony read-chronicle", description="Show Chronicle entries")
+    parser.add_argument("--last", type=int, default=None, help="Show the last N entries (default 5)")
+    parser.add_argument("--since", default=None, help="Entries at or after: YYYY-mm-dd[ HH:MM[:SS]] or 30m/2h/7d/1w")
+    parser.add_argument("--until", default=None, help="Entries at or before (same formats)")
+    parser.add_argument("--grep", default=None, help="Only entries matching this regex (case-insensitive)")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild the sparse timestamp index")
+    return parser.parse_args(argv)
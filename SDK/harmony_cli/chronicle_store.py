@@ -0,0 +1,316 @@
+# SDK/harmony_cli/chronicle_store.py
+#
+# Segmented Chronicle storage under logs/chronicle/:
+#   segment-000001.log      - the active segment; appends go here
+#   segment-000000.log[.gz] - sealed segments, never modified again (gzip when compression is on)
+#   manifest.json           - per segment: name, start (offset in the concatenated stream),
+#                             bytes, lines, first/last timestamp, sealed, compressed
+#   index/                  - ChronicleIndex over the concatenated segments (rag-chronicle)
+# A new segment starts when the entry would push the active one past max_bytes, or
+# falls on a later day than the active segment's first entry.
+# An existing logs/chronicle.log (and its .tsidx/.index) is read in place until the first
+# write (append/seal), which adopts it as segment 0; read-only commands never move it.
+#
+# Environment:
+#   HARMONY_CHRONICLE_DIR        storage directory (default logs/chronicle)
+#   HARMONY_CHRONICLE_ROTATE     size | day | both (default both)
+#   HARMONY_CHRONICLE_MAX_BYTES  size limit per segment (default 8 MiB)
+#   HARMONY_CHRONICLE_COMPRESS   1 to gzip segments when they are sealed
+
+import fcntl
+import json
+import os
+import re
+from bisect import bisect_right
+from contextlib import contextmanager
+
+from . import chronicle_reader
+from .chronicle_reader import TIMESTAMP_FORMAT, line_timestamp
+
+LEGACY_LOG = os.path.join("logs", "chronicle.log")
+DEFAULT_DIR = os.path.join("logs", "chronicle")
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+class ChronicleStore:
+    def __init__(self, root=None, legacy_log=LEGACY_LOG, max_bytes=None, rotate=None, compress=None):
+        self.root = root or os.environ.get("HARMONY_CHRONICLE_DIR", DEFAULT_DIR)
+        self.legacy_log = legacy_log
+        self.max_bytes = max_bytes or int(os.environ.get("HARMONY_CHRONICLE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.rotate = rotate or os.environ.get("HARMONY_CHRONICLE_ROTATE", "both")
+        self.compress = compress if compress is not None else os.environ.get("HARMONY_CHRONICLE_COMPRESS", "0") == "1"
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        self._decompressed = {}
+        self.manifest = self._load()
+
+    # --- manifest ------------------------------------------------------------
+    @contextmanager
+    def _lock(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def _load(self):
+        manifest = self._read_manifest()
+        if manifest is not None:
+            return manifest
+        if not (self.legacy_log and os.path.exists(self.legacy_log)):
+            return {"version": 1, "segments": []}
+        # Not adopted yet: a read-only view of the legacy log as the only (active) segment
+        seg = {"name": os.path.basename(self.legacy_log), "legacy": True, "start": 0,
+               "bytes": os.path.getsize(self.legacy_log), "lines": None, "first_ts": None, "last_ts": None,
+               "sealed": False, "compressed": False}
+        return {"version": 1, "segments": [seg]}
+
+    def _refresh(self):
+        """Re-read the manifest before a write (under the lock), adopting the legacy log on the first one."""
+        manifest = self._read_manifest()
+        if manifest is None:
+            manifest = self.manifest = {"version": 1, "segments": []}
+            if self.legacy_log and os.path.exists(self.legacy_log):
+                self._adopt_legacy()
+                self._save()
+        return manifest
+
+    def _follow_adoption(self):
+        """Pick up the manifest if another writer adopted the legacy log since we looked."""
+        if self.in_place and not os.path.exists(self.legacy_log):
+            self.manifest = self._load()
+
+    def _adopt_legacy(self):
+        """Move logs/chronicle.log in as sealed segment 0; its stream bytes are unchanged, so indexes carry over."""
+        seg = {"name": "segment-000000.log", "start": 0, "sealed": False, "compressed": False}
+        os.replace(self.legacy_log, self.path(seg))
+        with open(self.path(seg), "rb+") as f:
+            # Segments are whole lines, so the stream never joins lines across a boundary
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        for suffix, dest in ((".tsidx", self.path(seg) + ".tsidx"), (".index", self.index_dir)):
+            if os.path.exists(self.legacy_log + suffix) and not os.path.exists(dest):
+                os.replace(self.legacy_log + suffix, dest)
+        seg.update(scan_segment(self.path(seg)))
+        self.manifest["segments"].append(seg)
+        self._seal(seg)
+
+    # --- segments ------------------------------------------------------------
+    @property
+    def segments(self):
+        return self.manifest["segments"]
+
+    @property
+    def in_place(self):
+        """True while the legacy log is being read where it is, not yet adopted."""
+        return bool(self.segments) and self.segments[0].get("legacy", False)
+
+    @property
+    def index_dir(self):
+        return self.legacy_log + ".index" if self.in_place else os.path.join(self.root, "index")
+
+    def path(self, seg):
+        if seg.get("legacy"):
+            return self.legacy_log
+        return os.path.join(self.root, seg["name"] + (".gz" if seg["compressed"] else ""))
+
+    def _seal(self, seg):
+        seg["sealed"] = True
+        if self.compress and not seg["compressed"]:
+            import gzip
+            src = self.path(seg)
+            with open(src, "rb") as f_in, gzip.open(src + ".gz.tmp", "wb") as f_out:
+                for block in iter(lambda: f_in.read(1 << 20), b""):
+                    f_out.write(block)
+            os.replace(src + ".gz.tmp", src + ".gz")
+            seg["compressed"] = True
+            os.remove(src)
+            if os.path.exists(src + ".tsidx"):
+                os.remove(src + ".tsidx")
+
+    def _active(self, timestamp, incoming):
+        """The segment the next entry goes to, sealing and rotating as needed."""
+        active = self.segments[-1] if self.segments and not self.segments[-1]["sealed"] else None
+        if active is not None:
+            active["bytes"] = os.path.getsize(self.path(active))
+            too_big = self.rotate in ("size", "both") and active["bytes"] and active["bytes"] + incoming > self.max_bytes
+            new_day = (self.rotate in ("day", "both") and active["first_ts"]
+                       and timestamp[:10] > active["first_ts"][:10])
+            if too_big or new_day:
+                self._seal(active)
+                active = None
+        if active is None:
+            last = self.segments[-1] if self.segments else None
+            number = int(re.search(r"(\d+)", last["name"]).group(1)) + 1 if last else 0
+            active = {"name": f"segment-{number:06d}.log", "start": last["start"] + last["bytes"] if last else 0,
+                      "bytes": 0, "lines": 0, "first_ts": None, "last_ts": None,
+                      "sealed": False, "compressed": False}
+            self.segments.append(active)
+        return active
+
+    def append(self, entry, now=None):
+        """Write one '[timestamp] entry' line; returns the timestamp."""
+        from datetime import datetime
+        timestamp = (now or datetime.now()).strftime(TIMESTAMP_FORMAT)
+        data = f"[{timestamp}] {entry}\n".encode("utf-8")
+        with self._lock():
+            self.manifest = self._refresh()
+            seg = self._active(timestamp, len(data))
+            path = self.path(seg)
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+            seg["bytes"] = offset + len(data)
+            seg["lines"] += 1
+            seg["first_ts"] = seg["first_ts"] or timestamp
+            seg["last_ts"] = timestamp
+            self._save()
+        chronicle_reader.note_append(path, offset, timestamp)
+        return timestamp
+
+    def seal(self):
+        """Seal (and compress, if enabled) the active segment now."""
+        with self._lock():
+            self.manifest = self._refresh()
+            if self.segments and not self.segments[-1]["sealed"]:
+                self._seal(self.segments[-1])
+                self._save()
+
+    def segment_bytes(self, seg):
+        if seg["compressed"]:
+            if seg["name"] not in self._decompressed:
+                import gzip
+                with gzip.open(self.path(seg), "rb") as f:
+                    self._decompressed[seg["name"]] = f.read()
+            return self._decompressed[seg["name"]]
+        with open(self.path(seg), "rb") as f:
+            return f.read()
+
+    def _overlapping(self, since, until):
+        """Segments whose [first_ts, last_ts] can hold entries in [since, until]; the rest are skipped unread."""
+        for seg in self.segments:
+            if since and seg["last_ts"] and seg["last_ts"] < since:
+                continue
+            if until and seg["first_ts"] and seg["first_ts"] > until:
+                continue
+            yield seg
+
+    # --- reads ---------------------------------------------------------------
+    def tail(self, n, grep=None):
+        """Last n lines across segments (oldest first), reading newest segments first."""
+        self._follow_adoption()
+        found = []
+        for seg in reversed(self.segments):
+            if len(found) >= n:
+                break
+            if seg["compressed"]:
+                lines = [line for line in self.segment_bytes(seg).decode("utf-8", errors="replace").splitlines()
+                         if line and (grep is None or grep.search(line))]
+                chunk = lines[-(n - len(found)):]
+            else:
+                chunk = chronicle_reader.tail(self.path(seg), n - len(found), grep)
+            found[:0] = chunk
+        return found
+
+    def read_range(self, since=None, until=None, grep=None, limit=None):
+        self._follow_adoption()
+        out = []
+        for seg in self._overlapping(since, until):
+            if seg["compressed"]:
+                current = None  # unstamped continuation lines belong to the entry above them
+                for line in self.segment_bytes(seg).decode("utf-8", errors="replace").splitlines():
+                    current = line_timestamp(line) or current
+                    if since and (current is None or current < since):
+                        continue
+                    if until and current and current > until:
+                        break
+                    if line.strip() and (grep is None or grep.search(line)):
+                        out.append(line)
+            else:
+                out.extend(chronicle_reader.read_range(self.path(seg), since, until, grep))
+        if limit is not None:
+            out = out[-limit:] if limit else []
+        return out
+
+    def reindex(self):
+        """Rebuild the sparse timestamp index of every uncompressed segment."""
+        self._follow_adoption()
+        return sum(chronicle_reader.rebuild_time_index(self.path(seg))
+                   for seg in self.segments if not seg["compressed"])
+
+    # --- byte-stream interface for ChronicleIndex ------------------------------
+    def _stream_segments(self):
+        """Segments with their current byte counts (the active one may be ahead of the manifest)."""
+        self._follow_adoption()
+        segs = [dict(seg) for seg in self.segments]
+        if segs and not segs[-1]["sealed"] and os.path.exists(self.path(segs[-1])):
+            segs[-1]["bytes"] = os.path.getsize(self.path(segs[-1]))
+        return segs
+
+    def exists(self):
+        return bool(self.segments)
+
+    def size(self):
+        segs = self._stream_segments()
+        return segs[-1]["start"] + segs[-1]["bytes"] if segs else 0
+
+    def read(self, offset, length=-1):
+        end = self.size() if length < 0 else offset + length
+        parts = []
+        for seg in self._stream_segments():
+            lo, hi = max(offset, seg["start"]), min(end, seg["start"] + seg["bytes"])
+            if lo >= hi:
+                continue
+            if seg["compressed"]:
+                parts.append(self.segment_bytes(seg)[lo - seg["start"]:hi - seg["start"]])
+            else:
+                with open(self.path(seg), "rb") as f:
+                    f.seek(lo - seg["start"])
+                    parts.append(f.read(hi - lo))
+        return b"".join(parts)
+
+    def readline_at(self, offset):
+        segs = self._stream_segments()
+        i = bisect_right([seg["start"] for seg in segs], offset) - 1
+        if i < 0:
+            return b""
+        seg = segs[i]
+        if seg["compressed"]:
+            data = self.segment_bytes(seg)
+            local = offset - seg["start"]
+            end = data.find(b"\n", local)
+            return data[local:] if end < 0 else data[local:end + 1]
+        with open(self.path(seg), "rb") as f:
+            f.seek(offset - seg["start"])
+            return f.readline()
+
+
+def scan_segment(path):
+    """bytes, lines and first/last timestamp of a segment file, in one pass."""
+    stats = {"bytes": 0, "lines": 0, "first_ts": None, "last_ts": None}
+    with open(path, "rb") as f:
+        for line in f:
+            stats["bytes"] += len(line)
+            if line.strip():
+                stats["lines"] += 1
+            ts = line_timestamp(line)
+            if ts:
+                stats["first_ts"] = stats["first_ts"] or ts
+                stats["last_ts"] = ts
+    return stats
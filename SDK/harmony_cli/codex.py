@@ -0,0 +1,244 @@
+# SDK/harmony_cli/codex.py
+#
+# One loader for Codex YAML, shared by the rituals and scripts/*.py:
+# - parses with libyaml (yaml.CSafeLoader) when PyYAML was built with it, else SafeLoader
+# - keeps every parsed document in a persistent cache, one pickle per file under
+#   .cache/codex/, so a file is parsed once per change rather than once per script
+# - a cache entry is trusted while the file's (mtime_ns, size) match; when they don't
+#   (touch, checkout) the content sha256 decides, and only changed content is re-parsed.
+#   Entries written within RACY_NS of the file's mtime are always hash-checked, since a
+#   same-size rewrite inside the filesystem's timestamp granularity would look unchanged.
+# - load_yaml returns a fresh copy on every call, so callers may modify what they get
+# CodexGraph loads SPs, Meshes, Axioms, Shepherd_Map and Laws through it once and
+# precomputes the lookups validators need (agent -> SP, mesh -> agents, axiom -> shepherds,
+# glyph -> SPs), so they never re-scan directories.
+#
+# Scripts import it with the SDK directory on sys.path:
+#   sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+#   from harmony_cli.codex import load_yaml
+#
+# Environment:
+#   HARMONY_CODEX_CACHE   cache directory (default <repo>/.cache/codex); "0" keeps the cache in memory only
+
+import hashlib
+import os
+import pickle
+import time
+
+import yaml
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.environ.get("HARMONY_CODEX_CACHE", os.path.join(REPO_ROOT, ".cache", "codex"))
+CACHE_VERSION = 1
+RACY_NS = 2 * 1_000_000_000
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Per process: absolute path -> cache entry (see _entry)
+_memo = {}
+stats = {"memory": 0, "disk": 0, "rehashed": 0, "parsed": 0}
+
+
+def _entry_path(path):
+    return os.path.join(CACHE_DIR, hashlib.sha1(path.encode("utf-8")).hexdigest() + ".pickle")
+
+
+def _entry(path, st, sha256, payload):
+    return {"version": CACHE_VERSION, "path": path, "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "sha256": sha256, "cached_ns": time.time_ns(), "payload": payload}
+
+
+def _read_entry(path):
+    if CACHE_DIR == "0":
+        return None
+    try:
+        with open(_entry_path(path), "rb") as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION or entry.get("path") != path:
+        return None
+    return entry
+
+
+def _write_entry(entry):
+    if CACHE_DIR == "0":
+        return
+    dest = _entry_path(entry["path"])
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, dest)
+    except OSError:
+        pass  # read-only checkout: parsing still works, it just isn't remembered
+
+
+def _stat_matches(entry, st):
+    return ((entry["mtime_ns"], entry["size"]) == (st.st_mtime_ns, st.st_size)
+            and entry["cached_ns"] - st.st_mtime_ns > RACY_NS)
+
+
+def parse_yaml(text):
+    """yaml.safe_load (str or bytes) with the fastest available loader."""
+    return yaml.load(text, Loader=Loader)
+
+
+def load_yaml(path):
+    """
+    The parsed YAML document at path (as yaml.safe_load would return it), from the
+    cache when the file is unchanged. Raises OSError / yaml.YAMLError like safe_load.
+    """
+    path = os.path.abspath(os.fspath(path))
+    st = os.stat(path)
+    entry = _memo.get(path)
+    if entry is not None and _stat_matches(entry, st):
+        stats["memory"] += 1
+        return pickle.loads(entry["payload"])
+    entry = _read_entry(path)
+    if entry is not None and _stat_matches(entry, st):
+        stats["disk"] += 1
+        _memo[path] = entry
+        return pickle.loads(entry["payload"])
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    sha256 = hashlib.sha256(raw).hexdigest()
+    if entry is not None and entry["sha256"] == sha256:
+        stats["rehashed"] += 1
+        payload = entry["payload"]
+    else:
+        stats["parsed"] += 1
+        payload = pickle.dumps(parse_yaml(raw), protocol=pickle.HIGHEST_PROTOCOL)
+    # Keyed by the stat from before the read: a write that raced it changes mtime, so it is re-read next time
+    entry = _entry(path, st, sha256, payload)
+    _memo[path] = entry
+    _write_entry(entry)
+    return pickle.loads(payload)
+
+
+# === GRAPH ===
+
+SP_DIR = os.path.join("Codex", "SPs")
+MESH_DIR = os.path.join("Codex", "Meshes")
+LAWS_DIR = os.path.join("Codex", "Laws")
+AXIOMS_FILE = os.path.join("Codex", "Core", "Laws", "Axioms.yaml")
+SHEPHERD_MAP_FILE = os.path.join("Codex", "Core", "Laws", "Shepherd_Map.yaml")
+
+
+def agent_key(name):
+    """'Fractal-Prime (anchor)' -> 'fractal prime': how mesh agent entries are matched to SPs."""
+    return str(name).split("(")[0].strip().replace("-", " ").lower()
+
+
+def _glyph_ids(sp):
+    """Glyph ids an SP document binds: glyph_bindings entries ('G-Ω-03' or {'G-Ω-03': name}) and assigned_glyph."""
+    found = []
+    for binding in sp.get("glyph_bindings") or []:
+        found.extend(binding if isinstance(binding, dict) else [binding])
+    if sp.get("assigned_glyph"):
+        found.append(sp["assigned_glyph"])
+    return [str(g) for g in found]
+
+
+class CodexGraph:
+    """
+    SPs, Meshes, Axioms, Shepherd_Map and Laws, loaded once with the indexes the
+    validators and rituals look things up in:
+      sps               SP file stem -> document
+      sp_by_agent       agent_key(SP file stem) -> SP file stem; filenames only, parsed or not
+      sp_by_id          SP id -> SP file stem
+      mesh_agents       mesh file stem -> agent entries as written in the mesh
+      axioms_by_no      axiom no -> axiom
+      shepherds_by_axiom axiom no -> [shepherd id]
+      sps_by_glyph      glyph id -> [SP file stem] (SP bindings and shepherd stewardship)
+      laws              Codex/Laws file stem -> document
+    Files that fail to parse are listed in errors (relative path -> message) and
+    files that are not mappings in skipped, rather than raising.
+    """
+
+    def __init__(self, root=REPO_ROOT):
+        self.root = root
+        self.errors = {}
+        self.skipped = []
+        self.sps = self._load_dir(SP_DIR)
+        self.meshes = self._load_dir(MESH_DIR)
+        self.laws = self._load_dir(LAWS_DIR, (".yaml", ".yml"))
+        self.axioms_doc = self._load(AXIOMS_FILE)
+        self.shepherd_map = self._load(SHEPHERD_MAP_FILE)
+
+        self.sp_by_agent, self.sp_by_id = {}, {}
+        unparsed = [rel for rel in list(self.errors) + self.skipped if os.path.dirname(rel) == SP_DIR]
+        for stem in list(self.sps) + [os.path.splitext(os.path.basename(rel))[0] for rel in unparsed]:
+            self.sp_by_agent[agent_key(stem)] = stem
+        for stem, sp in self.sps.items():
+            if sp.get("id"):
+                self.sp_by_id[str(sp["id"])] = stem
+
+        self.mesh_agents = {stem: list(mesh.get("agents") or []) for stem, mesh in self.meshes.items()}
+
+        self.axioms_by_no = {ax["no"]: ax for ax in self.axioms if isinstance(ax, dict) and "no" in ax}
+        self.shepherds_by_axiom = {}
+        for shepherd in self.shepherds:
+            for ax in shepherd.get("axioms") or []:
+                if isinstance(ax, dict) and "no" in ax:
+                    self.shepherds_by_axiom.setdefault(ax["no"], []).append(shepherd.get("id"))
+
+        self.sps_by_glyph = {}
+        for stem, sp in self.sps.items():
+            for glyph in _glyph_ids(sp):
+                self._bind_glyph(glyph, stem)
+        for shepherd in self.shepherds:
+            stem = self.sp_by_id.get(str(shepherd.get("id")))
+            for glyph in (shepherd.get("stewardship") or {}).get("glyphs") or []:
+                if stem:
+                    self._bind_glyph(str(glyph), stem)
+
+    def _load(self, rel):
+        try:
+            return load_yaml(os.path.join(self.root, rel))
+        except FileNotFoundError:
+            return None
+        except (OSError, yaml.YAMLError) as e:
+            self.errors[rel] = str(e)
+            return None
+
+    def _load_dir(self, rel_dir, suffixes=(".yaml",)):
+        docs = {}
+        try:
+            names = sorted(entry.name for entry in os.scandir(os.path.join(self.root, rel_dir)) if entry.is_file())
+        except FileNotFoundError:
+            return docs
+        for name in names:
+            if not name.endswith(suffixes):
+                continue
+            rel = os.path.join(rel_dir, name)
+            data = self._load(rel)
+            if isinstance(data, dict):
+                docs[os.path.splitext(name)[0]] = data
+            elif rel not in self.errors:
+                self.skipped.append(rel)
+        return docs
+
+    def _bind_glyph(self, glyph, stem):
+        bound = self.sps_by_glyph.setdefault(glyph, [])
+        if stem not in bound:
+            bound.append(stem)
+
+    @property
+    def axioms(self):
+        """The axiom list, whether Axioms.yaml is a list or a mapping with 'axioms'."""
+        doc = self.axioms_doc
+        if isinstance(doc, dict):
+            doc = doc.get("axioms")
+        return doc if isinstance(doc, list) else []
+
+    @property
+    def shepherds(self):
+        doc = self.shepherd_map if isinstance(self.shepherd_map, dict) else {}
+        return [s for s in doc.get("shepherds") or [] if isinstance(s, dict)]
+
+    def sp_for_agent(self, agent):
+        """SP file stem a mesh agent entry refers to, or None."""
+        return self.sp_by_agent.get(agent_key(agent))
@@ -0,0 +1,264 @@
+# SDK/harmony_cli/codex_index.py
+#
+# Semantic index over the Codex corpus: SPs, Meshes, Chronicle chapters, Theories.
+# Stored in logs/codex.index/:
+#   vectors.f32  - unit-normalized float32 rows (chunks x dim), memory-mapped for search
+#   meta.json    - model, dim, version, per-file (mtime_ns, size, sha256, first row, row count)
+#                  and the chunk table (file, start line, text) aligned with vector rows
+#   bm25.pkl     - inverted index over the chunks for this version (see hybrid.py)
+#   cache.json   - LRU of recent query results, keyed by index version
+# Rebuilds re-embed only files whose content hash changed; unchanged rows are copied over.
+
+import fnmatch
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+from .chronicle_index import EMBED_BATCH, normalize, top_k
+from .embed_daemon import MODEL_PATH
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+INDEX_DIR = os.path.join(REPO_ROOT, "logs", "codex.index")
+
+# (kind, directory, filename patterns); directories are searched recursively
+SOURCES = [
+    ("SP", os.path.join("Codex", "SPs"), ("*.yaml",)),
+    ("Mesh", os.path.join("Codex", "Meshes"), ("*.yaml",)),
+    ("Chronicle", os.path.join("Codex", "Chronicle"), ("CH*.yaml",)),
+    ("Theory", os.path.join("Codex", "Theories"), ("*.md", "*.yaml")),
+]
+
+CHUNK_CHARS = 800
+
+
+# === CHUNKING ===
+
+def _is_boundary(line, markdown):
+    """Section starts: markdown headings, or top-level YAML keys."""
+    if markdown:
+        return line.startswith("#")
+    return bool(line) and not line[0].isspace() and line[0] not in "-#" and ":" in line
+
+
+def chunk_text(text, markdown=False, max_chars=CHUNK_CHARS):
+    """
+    Split a document into (start_line, text) chunks along section boundaries,
+    merging small sections up to max_chars and splitting oversized ones by line.
+    """
+    sections, current, start = [], [], 1
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if line.strip() in ("---", "..."):
+            continue
+        if current and _is_boundary(line, markdown):
+            sections.append((start, current))
+            current, start = [], lineno
+        if not current:
+            start = lineno
+        current.append(line)
+    if current:
+        sections.append((start, current))
+
+    chunks, buf, buf_start = [], [], 1
+    for start, lines in sections:
+        body = "\n".join(lines).strip()
+        if not body:
+            continue
+        if buf and sum(len(b) for b in buf) + len(body) > max_chars:
+            chunks.append((buf_start, "\n".join(buf)))
+            buf = []
+        if not buf:
+            buf_start = start
+        if len(body) > max_chars:
+            piece, piece_start = [], start
+            for offset, line in enumerate(lines):
+                if piece and sum(len(p) + 1 for p in piece) + len(line) > max_chars:
+                    chunks.append((piece_start, "\n".join(piece).strip()))
+                    piece, piece_start = [], start + offset
+                piece.append(line)
+            if "\n".join(piece).strip():
+                buf, buf_start = ["\n".join(piece).strip()], piece_start
+            continue
+        buf.append(body)
+    if buf:
+        chunks.append((buf_start, "\n".join(buf)))
+    return [(s, c) for s, c in chunks if c.strip()]
+
+
+def codex_files(root=REPO_ROOT):
+    """(kind, relative path) for every indexable Codex document, sorted."""
+    found = []
+    for kind, rel_dir, patterns in SOURCES:
+        base = os.path.join(root, rel_dir)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            for fname in sorted(filenames):
+                if any(fnmatch.fnmatch(fname, p) for p in patterns):
+                    found.append((kind, os.path.relpath(os.path.join(dirpath, fname), root)))
+    return found
+
+
+def chunk_label(chunk):
+    """Text that is embedded and BM25-indexed for a chunk: its source named up front."""
+    return f"{chunk['kind']} {chunk['name']}: {chunk['text']}"
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# === INDEX ===
+
+class CodexIndex:
+    def __init__(self, root=REPO_ROOT, index_dir=INDEX_DIR, model=MODEL_PATH):
+        self.root = root
+        self.index_dir = index_dir
+        self.model = model
+        self.vectors_path = os.path.join(index_dir, "vectors.f32")
+        self.meta_path = os.path.join(index_dir, "meta.json")
+        self.bm25_path = os.path.join(index_dir, "bm25.pkl")
+        self.cache_path = os.path.join(index_dir, "cache.json")
+        self.meta = self._load_meta()
+
+    def _empty_meta(self):
+        return {"model": self.model, "dim": 0, "version": None, "files": {}, "chunks": []}
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_meta()
+        if meta.get("model") != self.model:
+            return self._empty_meta()
+        return meta
+
+    @property
+    def version(self):
+        return self.meta.get("version")
+
+    def vectors(self):
+        count = len(self.meta["chunks"])
+        if not count:
+            return np.zeros((0, self.meta["dim"] or 1), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.meta["dim"]))
+
+    def build(self, embed, full=False):
+        """
+        Bring the index up to date with the Codex. Returns a dict with counts of
+        files reused/embedded/removed and chunks embedded.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        old_meta = self._empty_meta() if full else self.meta
+        old_vectors = None if full else self.vectors()
+        stats = {"files": 0, "reused": 0, "embedded": 0, "removed": 0, "chunks_embedded": 0}
+
+        files, chunks, parts, pending = {}, [], [], []
+        current = codex_files(self.root)
+        for kind, rel in current:
+            path = os.path.join(self.root, rel)
+            st = os.stat(path)
+            prev = old_meta["files"].get(rel)
+            stats["files"] += 1
+
+            # (mtime_ns, size) unchanged -> trust it; otherwise compare content hashes
+            if prev and (prev["mtime_ns"], prev["size"]) == (st.st_mtime_ns, st.st_size):
+                sha = prev["sha256"]
+            else:
+                sha = file_sha256(path)
+            row = len(chunks)
+            if prev and prev["sha256"] == sha and old_vectors is not None:
+                first, n = prev["row"], prev["rows"]
+                parts.append(np.asarray(old_vectors[first:first + n]))
+                chunks.extend(old_meta["chunks"][first:first + n])
+                stats["reused"] += 1
+            else:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                name = os.path.splitext(os.path.basename(rel))[0]
+                new = [{"file": rel, "kind": kind, "name": name, "line": line, "text": body}
+                       for line, body in chunk_text(text, markdown=rel.endswith(".md"))]
+                parts.append(None)
+                pending.append((len(parts) - 1, [chunk_label(c) for c in new]))
+                chunks.extend(new)
+                stats["embedded"] += 1
+                stats["chunks_embedded"] += len(new)
+            files[rel] = {"kind": kind, "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                          "sha256": sha, "row": row, "rows": len(chunks) - row}
+
+        stats["removed"] = len(set(old_meta["files"]) - set(files))
+
+        # Embed all changed files' chunks in fixed-size batches across file boundaries
+        texts = [t for _, ts in pending for t in ts]
+        embedded = [normalize(embed(texts[i:i + EMBED_BATCH])) for i in range(0, len(texts), EMBED_BATCH)]
+        dim = embedded[0].shape[1] if embedded else old_meta["dim"]
+        flat = np.concatenate(embedded) if embedded else np.zeros((0, dim or 1), dtype=np.float32)
+        start = 0
+        for part_no, ts in pending:
+            parts[part_no] = flat[start:start + len(ts)]
+            start += len(ts)
+
+        if not (stats["embedded"] or stats["removed"]) and self.meta["version"] and not full:
+            # Nothing moved; keep vectors, refresh stat info so the next run skips hashing
+            self.meta["files"] = files
+            self._save_meta()
+            return stats
+
+        vectors = np.concatenate(parts) if parts else np.zeros((0, dim or 1), dtype=np.float32)
+        tmp = self.vectors_path + ".tmp"
+        vectors.astype(np.float32).tofile(tmp)
+        # Drop the old memmap before replacing the file underneath it
+        del old_vectors
+        os.replace(tmp, self.vectors_path)
+
+        version = hashlib.sha256(self.model.encode())
+        for rel in sorted(files):
+            version.update(f"{rel}\0{files[rel]['sha256']}\0".encode())
+        self.meta = {"model": self.model, "dim": int(vectors.shape[1]) if len(vectors) else int(dim or 0),
+                     "version": version.hexdigest()[:16], "files": files, "chunks": chunks}
+        self._save_meta()
+        return stats
+
+    def _save_meta(self):
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def bm25(self):
+        from .hybrid import BM25Index
+        cached = BM25Index.load(self.bm25_path)
+        if isinstance(cached, tuple) and cached[0] == self.version:
+            return cached[1]
+        bm25 = BM25Index()
+        for chunk in self.meta["chunks"]:
+            bm25.add(chunk_label(chunk))
+        tmp = self.bm25_path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((self.version, bm25), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.bm25_path)
+        return bm25
+
+    def hybrid_search(self, query, embed, k=5):
+        """Top-k (chunk, score): BM25 first, vector rerank of its candidates, cached per index version."""
+        from .hybrid import QueryCache, hybrid_search
+        vectors = self.vectors()
+        chunks = self.meta["chunks"]
+        results = hybrid_search(query, self.bm25(), lambda ids: vectors[ids], embed, k=k,
+                                version=self.version, cache=QueryCache(self.cache_path),
+                                group=lambda i: chunks[i]["file"])
+        return [(chunks[i], score) for i, score in results]
+
+    def search(self, query_vector, k=5):
+        """Top-k (chunk, score) by cosine similarity."""
+        vectors = self.vectors()
+        if not len(vectors):
+            return []
+        scores = vectors @ normalize(query_vector)[0]
+        return [(self.meta["chunks"][i], float(scores[i])) for i in top_k(scores, k)]
@@ -0,0 +1,294 @@
+# SDK/harmony_cli/embed_daemon.py
+#
+# Long-lived embedding server shared by search-rag and rag-chronicle.
+# - Loads the sentence-transformers model once and serves it on a Unix socket
+# - Requests from concurrent callers are coalesced into one model batch
+# - The CLI starts it on first use (get_embedder); it exits after an idle timeout
+#
+# Protocol: one JSON line per connection
+#   {"op": "embed", "texts": [...]}  -> {"ok": true, "dim": d, "vectors_b64": <float32 rows>}
+#   {"op": "status"} / {"op": "stop"}
+#
+# Usage:
+#   python SDK/harmony_cli/embed_daemon.py serve [--idle 1800]
+#   python SDK/harmony_cli/embed_daemon.py status|stop
+
+import argparse
+import base64
+import json
+import os
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+MODEL_PATH = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_IDLE_SECONDS = 1800
+BATCH_WINDOW_SECONDS = 0.005
+MAX_BATCH_TEXTS = 256
+CLIENT_TIMEOUT = 60.0
+STARTUP_TIMEOUT = 120.0
+MAX_LINE_BYTES = 64 * 1024 * 1024
+
+
+def default_socket_path():
+    env = os.environ.get("HARMONY_EMBED_SOCK")
+    if env:
+        return env
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"harmony-{os.getuid()}")
+    return os.path.join(base, "harmony-embed.sock")
+
+
+def load_model(model_path=MODEL_PATH):
+    """In-process embedder: list of strings -> (n, dim) float32 array."""
+    from txtai.embeddings import Embeddings
+    embeddings = Embeddings({"method": "transformers", "path": model_path})
+
+    def embed(texts):
+        return np.asarray(embeddings.batchtransform([(None, text, None) for text in texts]), dtype=np.float32)
+
+    return embed
+
+
+# === SERVER ===
+
+class EmbedServer:
+    def __init__(self, sock_path, embed, idle_seconds=DEFAULT_IDLE_SECONDS):
+        self.sock_path = sock_path
+        self.embed = embed
+        self.idle_seconds = idle_seconds
+        self.pending = queue.Queue()
+        self.running = False
+        self.last_used = time.monotonic()
+        self.requests = 0
+        self.batches = 0
+
+    def _batcher(self):
+        """Drain queued requests into one model call; wake each caller with its slice."""
+        while self.running:
+            try:
+                first = self.pending.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            jobs = [first]
+            total = len(first["texts"])
+            deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+            while total < MAX_BATCH_TEXTS:
+                try:
+                    job = self.pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                jobs.append(job)
+                total += len(job["texts"])
+            texts = [t for job in jobs for t in job["texts"]]
+            try:
+                vectors = self.embed(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+                start = 0
+                for job in jobs:
+                    job["result"] = vectors[start:start + len(job["texts"])]
+                    start += len(job["texts"])
+            except Exception as e:
+                for job in jobs:
+                    job["error"] = str(e)
+            self.batches += 1
+            for job in jobs:
+                job["done"].set()
+
+    def handle(self, req):
+        op = req.get("op")
+        if op == "embed":
+            job = {"texts": [str(t) for t in req.get("texts", [])], "done": threading.Event()}
+            self.pending.put(job)
+            job["done"].wait()
+            if "error" in job:
+                return {"ok": False, "error": job["error"]}
+            vectors = np.ascontiguousarray(job["result"], dtype=np.float32)
+            self.requests += 1
+            return {"ok": True, "dim": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+                    "vectors_b64": base64.b64encode(vectors.tobytes()).decode()}
+        if op == "status":
+            return {"ok": True, "pid": os.getpid(), "requests": self.requests, "batches": self.batches,
+                    "idle_seconds": self.idle_seconds}
+        if op == "stop":
+            self.running = False
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def _serve_conn(self, conn):
+        with conn:
+            conn.settimeout(CLIENT_TIMEOUT)
+            try:
+                line = conn.makefile("rb").readline(MAX_LINE_BYTES)
+                resp = self.handle(json.loads(line.decode("utf-8")))
+            except Exception as e:
+                resp = {"ok": False, "error": str(e)}
+            try:
+                conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+            except OSError:
+                pass
+        self.last_used = time.monotonic()
+
+    def serve(self):
+        os.makedirs(os.path.dirname(self.sock_path), mode=0o700, exist_ok=True)
+        if EmbedClient(self.sock_path).request({"op": "status"}) is not None:
+            raise RuntimeError(f"An embedding server is already listening on {self.sock_path}")
+        if os.path.exists(self.sock_path):
+            os.remove(self.sock_path)
+
+        # Bind to a temp name and rename: clients only see the socket once it accepts
+        tmp_path = f"{self.sock_path}.{os.getpid()}"
+        srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            srv.bind(tmp_path)
+        finally:
+            os.umask(old_umask)
+        srv.listen(64)
+        srv.settimeout(1.0)
+        os.replace(tmp_path, self.sock_path)
+        self.running = True
+
+        def _stop(signum, frame):
+            self.running = False
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+        threading.Thread(target=self._batcher, name="harmony-embed-batcher", daemon=True).start()
+        try:
+            while self.running:
+                if self.idle_seconds and time.monotonic() - self.last_used > self.idle_seconds:
+                    break
+                try:
+                    conn, _ = srv.accept()
+                except (socket.timeout, InterruptedError):
+                    continue
+                self.last_used = time.monotonic()
+                threading.Thread(target=self._serve_conn, args=(conn,), daemon=True).start()
+        finally:
+            self.running = False
+            srv.close()
+            if os.path.exists(self.sock_path):
+                os.remove(self.sock_path)
+
+
+# === CLIENT ===
+
+class EmbedClient:
+    """Talks to the server; request() returns None when it is not reachable."""
+
+    def __init__(self, sock_path=None):
+        self.sock_path = sock_path or default_socket_path()
+
+    def request(self, req, timeout=CLIENT_TIMEOUT):
+        if not os.path.exists(self.sock_path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.settimeout(timeout)
+                s.connect(self.sock_path)
+                s.sendall(json.dumps(req).encode("utf-8") + b"\n")
+                line = s.makefile("rb").readline(MAX_LINE_BYTES)
+            resp = json.loads(line.decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+        return resp if resp.get("ok") else None
+
+    def embed(self, texts):
+        resp = self.request({"op": "embed", "texts": list(texts)})
+        if resp is None:
+            return None
+        vectors = np.frombuffer(base64.b64decode(resp["vectors_b64"]), dtype=np.float32)
+        return vectors.reshape(len(texts), resp["dim"]) if resp["dim"] else vectors.reshape(len(texts), 0)
+
+    def start(self, idle_seconds=DEFAULT_IDLE_SECONDS):
+        """Spawn a detached server and wait for its socket (the model loads before it binds)."""
+        log_path = self.sock_path + ".log"
+        os.makedirs(os.path.dirname(self.sock_path), mode=0o700, exist_ok=True)
+        with open(log_path, "ab") as log:
+            proc = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--socket", self.sock_path,
+                 "serve", "--idle", str(idle_seconds)],
+                stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True,
+            )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline and proc.poll() is None:
+            if self.request({"op": "status"}, timeout=1.0) is not None:
+                return True
+            time.sleep(0.1)
+        return self.request({"op": "status"}, timeout=1.0) is not None
+
+
+def get_embedder(autostart=True):
+    """
+    Embedding function for the CLI. Nothing is contacted or loaded until the
+    first call: then it uses the shared server, starting it if needed, and
+    falls back to loading the model in-process (HARMONY_EMBED_DAEMON=0 forces
+    in-process).
+    """
+    state = {}
+
+    def backend():
+        if "embed" not in state:
+            state["embed"] = None
+            if os.environ.get("HARMONY_EMBED_DAEMON", "1") != "0":
+                client = EmbedClient()
+                if client.request({"op": "status"}, timeout=1.0) is not None or (autostart and client.start()):
+                    state["client"] = client
+            if "client" not in state:
+                state["embed"] = load_model()
+        return state
+
+    def embed(texts):
+        backend()
+        if state["embed"] is None:
+            vectors = state["client"].embed(texts)
+            if vectors is not None:
+                return vectors
+            # Server went away mid-session: finish in-process
+            state["embed"] = load_model()
+        return state["embed"](texts)
+
+    return embed
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="harmony-embed", description="Harmony embedding server")
+    parser.add_argument("--socket", default=None, help="Socket path (default: $HARMONY_EMBED_SOCK or runtime dir)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="Run the server in the foreground")
+    p_serve.add_argument("--idle", type=int, default=DEFAULT_IDLE_SECONDS, help="Exit after this many idle seconds (0 = never)")
+    p_serve.add_argument("--model", default=MODEL_PATH)
+    sub.add_parser("status", help="Show server statistics")
+    sub.add_parser("stop", help="Stop the server")
+    args = parser.parse_args()
+
+    sock_path = args.socket or default_socket_path()
+    if args.cmd == "serve":
+        try:
+            server = EmbedServer(sock_path, load_model(args.model), idle_seconds=args.idle)
+            print(f"🧠 Harmony embedding server listening on {sock_path}", flush=True)
+            server.serve()
+        except RuntimeError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    resp = EmbedClient(sock_path).request({"op": args.cmd}, timeout=5.0)
+    if resp is None:
+        print(f"❌ No embedding server reachable at {sock_path}", file=sys.stderr)
+        sys.exit(1)
+    if args.cmd == "status":
+        resp.pop("ok", None)
+        print(json.dumps(resp, indent=2))
+    else:
+        print(f"✅ {args.cmd}: ok")
+
+
+if __name__ == "__main__":
+    main()
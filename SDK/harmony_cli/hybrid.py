@@ -0,0 +1,196 @@
+# SDK/harmony_cli/hybrid.py
+#
+# Hybrid retrieval for Harmony RAG:
+#   1. BM25 over an inverted index (cheap, exact on names/glyphs like "Fractal Prime", "ΔΦΩ")
+#   2. Vector rerank of the BM25 candidates only, and only when BM25 is not already decisive
+#   3. LRU cache of (query, index version, k) -> results, optionally persisted next to an index
+# Documents are integer ids aligned with the vector rows of the index they come from.
+
+import json
+import math
+import os
+import pickle
+import re
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+from .chronicle_index import normalize, top_k
+
+TOKEN = re.compile(r"\w+", re.UNICODE)
+
+CANDIDATES = 50
+DECISIVE_RATIO = 1.5
+VECTOR_WEIGHT = 0.7
+CACHE_ENTRIES = 256
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """Append-only inverted index: term -> {doc id: term frequency}."""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)
+        self.lengths = []
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, text):
+        doc = len(self.lengths)
+        terms = tokenize(text)
+        for term in terms:
+            posting = self.postings[term]
+            posting[doc] = posting.get(doc, 0) + 1
+        self.lengths.append(len(terms))
+        self.total_length += len(terms)
+        return doc
+
+    def scores(self, query):
+        """doc id -> BM25 score for docs sharing at least one query term, and the matched term count."""
+        n = len(self.lengths)
+        if not n:
+            return {}, {}
+        avgdl = self.total_length / n or 1.0
+        scores, matched = defaultdict(float), defaultdict(int)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc] / avgdl)
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + norm)
+                matched[doc] += 1
+        return scores, matched
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["postings"] = dict(self.postings)
+        return state
+
+    def __setstate__(self, state):
+        state["postings"] = defaultdict(dict, state["postings"])
+        self.__dict__.update(state)
+
+
+class QueryCache:
+    """LRU of (query, version, k) -> results; persisted to a JSON file when a path is given."""
+
+    def __init__(self, path=None, capacity=CACHE_ENTRIES):
+        self.path = path
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.dirty = False
+        if path:
+            try:
+                with open(path, "r") as f:
+                    self.entries = OrderedDict((k, v) for k, v in json.load(f))
+            except (OSError, ValueError, TypeError):
+                pass
+
+    @staticmethod
+    def key(query, version, k):
+        return json.dumps([" ".join(query.split()), version, k], ensure_ascii=False)
+
+    def get(self, query, version, k):
+        key = self.key(query, version, k)
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        self.dirty = True
+        return [tuple(r) for r in self.entries[key]]
+
+    def put(self, query, version, k, results):
+        key = self.key(query, version, k)
+        self.entries[key] = [list(r) for r in results]
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        self.dirty = True
+
+    def save(self):
+        if not (self.path and self.dirty):
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(list(self.entries.items()), f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def runner_up(ids, lexical, group=None):
+    """Best normalized score after the top hit, skipping docs in the top hit's group (e.g. its file)."""
+    if group is None:
+        return float(lexical[1]) if len(ids) > 1 else 0.0
+    lead = group(int(ids[0]))
+    return next((float(s) for i, s in zip(ids[1:], lexical[1:]) if group(int(i)) != lead), 0.0)
+
+
+def hybrid_search(query, bm25, doc_vectors, embed, k=3, version=None, cache=None,
+                  candidates=CANDIDATES, rerank="auto", group=None):
+    """
+    Top-k (doc id, score) for query.
+
+    doc_vectors(ids) returns the stored vectors for those doc ids; embed(texts)
+    embeds the query. The model is only used when rerank is needed:
+    rerank="auto" skips it when the best BM25 hit matches every query term and
+    beats the runner-up by DECISIVE_RATIO; "never" and "always" force it.
+    group(doc id) -> key (e.g. the source file) makes the runner-up the best hit
+    from another group, so chunks of one document don't block the shortcut.
+    With no lexical overlap at all, falls back to a full vector search.
+    """
+    if cache is not None:
+        hit = cache.get(query, version, k)
+        if hit is not None:
+            cache.save()
+            return hit
+
+    scores, matched = bm25.scores(query)
+    if not scores:
+        if rerank == "never" or not len(bm25):
+            results = []
+        else:
+            ids = np.arange(len(bm25))
+            sims = np.asarray(doc_vectors(ids)) @ normalize(embed([query]))[0]
+            results = [(int(ids[i]), float(sims[i])) for i in top_k(sims, k)]
+    else:
+        ids = np.fromiter(scores.keys(), dtype=np.int64, count=len(scores))
+        lexical = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+        order = top_k(lexical, candidates)
+        ids, lexical = ids[order], lexical[order]
+        lexical = lexical / lexical[0]
+
+        n_terms = len(set(tokenize(query)))
+        decisive = matched[int(ids[0])] == n_terms and runner_up(ids, lexical, group) * DECISIVE_RATIO <= 1.0
+        if rerank == "never" or (rerank == "auto" and decisive):
+            final = lexical
+        else:
+            sims = np.asarray(doc_vectors(ids)) @ normalize(embed([query]))[0]
+            final = VECTOR_WEIGHT * sims + (1 - VECTOR_WEIGHT) * lexical
+        results = [(int(ids[i]), float(final[i])) for i in top_k(final, k)]
+
+    if cache is not None:
+        cache.put(query, version, k, results)
+        cache.save()
+    return results
@@ -1,51 +1,153 @@
 # /Volumes/Public/harmony/SDK/harmony_cli/main.py
+#
+# Subcommands are registered with @command and import what they need only
+# when invoked, so `help` and `read-chronicle` never load yaml, numpy or txtai.
+# `harmony --startup-profile <cmd> ...` reruns the command under
+# `python -X importtime` and reports where startup time went.
 
+import os
 import sys
-from harmony_cli.utils import log_event
-from harmony_cli.rituals import (
-    restore_resonance,
-    search_rag,
-    chronicle_entry,
-    read_chronicle,
-    rag_chronicle,        # <-- New: Import rag_chronicle
-)
-
-def print_help():
+from harmony_cli.utils import log_event, set_command
+
+COMMANDS = {}
+
+
+def command(name, summary, usage=""):
+    def register(handler):
+        COMMANDS[name] = (handler, summary, usage)
+        return handler
+    return register
+
+
+@command("restore-resonance", "Symbolically restore resonance with Fractal Prime")
+def _restore_resonance(argv):
+    from harmony_cli.rituals import restore_resonance
+    restore_resonance()
+
+
+@command("search-rag", "Run a symbolic demo RAG search")
+def _search_rag(argv):
+    from harmony_cli.rituals import search_rag
+    search_rag()
+
+
+@command("chronicle-entry", "Add a new symbolic entry to the Chronicle")
+def _chronicle_entry(argv):
+    from harmony_cli.rituals import chronicle_entry
+    chronicle_entry()
+
+
+@command("read-chronicle", "Display the last 5 entries from the Chronicle",
+         "[--last N] [--since T] [--until T] [--grep REGEX] [--reindex]")
+def _read_chronicle(argv):
+    from harmony_cli.rituals import read_chronicle
+    if not argv:
+        read_chronicle()
+        return
+    from harmony_cli.chronicle_reader import parse_args
+    args = parse_args(argv)
+    read_chronicle(args.last, args.since, args.until, args.grep, args.reindex)
+
+
+@command("rag-chronicle", "Ask Harmony a question and search your Chronicle")
+def _rag_chronicle(argv):
+    from harmony_cli.rituals import rag_chronicle
+    rag_chronicle()
+
+
+@command("index", "Build/refresh the Codex semantic index", "build [--full]")
+def _index(argv):
+    from harmony_cli.rituals import codex_index_build
+    if argv and argv[0] == "build":
+        codex_index_build(full="--full" in argv[1:])
+    else:
+        print("Usage: harmony index build [--full]")
+
+
+@command("search", "Search SPs, Meshes, Chronicle chapters and Theories", "<query>")
+def _search(argv):
+    from harmony_cli.rituals import codex_search
+    codex_search(" ".join(argv) or None)
+
+
+@command("embed-daemon", "Embedding server", "start | status | stop")
+def _embed_daemon(argv):
+    from harmony_cli.rituals import embed_daemon
+    embed_daemon(argv[0] if argv else "status")
+
+
+@command("validate-links", "Check that mesh agents reference known SPs")
+def _validate_links(argv):
+    from harmony_cli.rituals import validate_links
+    validate_links()
+
+
+@command("help", "Show this help message")
+def print_help(argv=None):
     print("\nHarmony CLI — Available Commands:")
-    print("  restore-resonance     - Symbolically restore resonance with Fractal Prime")
-    print("  search-rag            - Run a symbolic demo RAG search")
-    print("  chronicle-entry       - Add a new symbolic entry to the Chronicle")
-    print("  read-chronicle        - Display the last 5 entries from the Chronicle")
-    print("  rag-chronicle         - Ask Harmony a question and search your Chronicle")
-    print("  help                  - Show this help message\n")
+    for name, (_, summary, usage) in COMMANDS.items():
+        print(f"  {name:<21} - {summary}")
+        if usage:
+            print(f"      {usage}")
+    print("\n  --startup-profile <command> [args]  - Report import-time breakdown for a command\n")
     log_event("Help command invoked.")
 
+
+def startup_profile(argv, top=15):
+    """Run argv under -X importtime in a child process and summarize where its startup went."""
+    import subprocess
+    import time
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        p for p in (os.path.dirname(os.path.dirname(os.path.abspath(__file__))), os.environ.get("PYTHONPATH")) if p))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv],
+                          stderr=subprocess.PIPE, env=env, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    top_level, other_stderr = [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            other_stderr.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2]
+        if name.startswith(" ") and not name.startswith("  "):  # depth 0 in the importtime tree
+            top_level.append((int(parts[1]), name.strip()))
+    if other_stderr:
+        print("\n".join(other_stderr), file=sys.stderr)
+
+    imports_ms = sum(us for us, _ in top_level) / 1000
+    print(f"\n=== Startup profile: harmony {' '.join(argv) or 'help'} ===")
+    print(f"  wall time (incl. interpreter start)  {wall_ms:8.1f} ms")
+    print(f"  top-level imports (cumulative)        {imports_ms:8.1f} ms")
+    for us, name in sorted(top_level, reverse=True)[:top]:
+        print(f"    {us / 1000:8.1f} ms  {name}")
+    return proc.returncode
+
+
 def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] == "--startup-profile":
+        sys.exit(startup_profile(argv[1:]))
+
     print("Harmony CLI is alive on Forge.")
     log_event("Harmony CLI started.")
 
-    if len(sys.argv) > 1:
-        cmd = sys.argv[1]
-        if cmd == "restore-resonance":
-            restore_resonance()
-        elif cmd == "search-rag":
-            search_rag()
-        elif cmd == "chronicle-entry":
-            chronicle_entry()
-        elif cmd == "read-chronicle":
-            read_chronicle()
-        elif cmd == "rag-chronicle":          # <-- New: Dispatcher for the new ritual
-            rag_chronicle()
-        elif cmd == "help":
-            print_help()
-        elif cmd == "validate-links":
-            from harmony_cli.rituals import validate_links
-            validate_links()
-        else:
+    if argv:
+        cmd = argv[0]
+        set_command(cmd)
+        entry = COMMANDS.get(cmd)
+        if entry is None:
             print("Unknown command:", cmd)
             log_event(f"Unknown command: {cmd}")
+        else:
+            entry[0](argv[1:])
     else:
         print_help()
 
+
 if __name__ == "__main__":
     main()
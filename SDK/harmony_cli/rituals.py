@@ -1,8 +1,6 @@
 # SDK/harmony_cli/rituals.py
 
 import os
-import yaml
-from datetime import datetime
 from .utils import log_event
 
 
@@ -17,12 +15,15 @@ def restore_resonance():
 
 def search_rag():
     try:
-        from txtai.embeddings import Embeddings
+        from .embed_daemon import get_embedder
+        from .hybrid import BM25Index, hybrid_search
         log_event("RAG search ritual invoked.")
-        embeddings = Embeddings({"method": "transformers", "path": "sentence-transformers/all-MiniLM-L6-v2"})
+        embed = get_embedder()
         data = ["This is Harmony.", "Fractal Prime is the steward.", "Ollama runs local models."]
-        embeddings.index([(uid, text, None) for uid, text in enumerate(data)])
-        results = embeddings.search("Who is the steward?", 1)
+        bm25 = BM25Index()
+        for text in data:
+            bm25.add(text)
+        results = hybrid_search("Who is the steward?", bm25, lambda ids: embed([data[i] for i in ids]), embed, k=1)
         print(f"Top RAG result: {results}")
         log_event(f"RAG result: {results}")
     except Exception as e:
@@ -30,16 +31,48 @@ def search_rag():
         log_event(f"Error in search_rag: {e}")
 
 
+def codex_index_build(full=False):
+    try:
+        from .codex_index import CodexIndex
+        from .embed_daemon import get_embedder
+        index = CodexIndex()
+        stats = index.build(get_embedder(), full=full)
+        print(f"✅ Codex index {index.version}: {stats['files']} files "
+              f"({stats['embedded']} embedded, {stats['reused']} unchanged, {stats['removed']} removed), "
+              f"{len(index.meta['chunks'])} chunks")
+        log_event(f"Codex index built: {stats}")
+    except Exception as e:
+        print("❌ Failed to build Codex index:", e)
+        log_event(f"Error in codex_index_build: {e}")
+
+
+def codex_search(query=None, k=5):
+    try:
+        from .codex_index import CodexIndex
+        from .embed_daemon import get_embedder
+        index = CodexIndex()
+        if not index.version:
+            print("No Codex index yet — run: harmony index build")
+            return
+        query = query or input("Search the Codex: ")
+        results = index.hybrid_search(query, get_embedder(), k)
+        print(f"\n=== Codex results for '{query}' ===")
+        for idx, (chunk, score) in enumerate(results, 1):
+            snippet = " ".join(chunk["text"].split())[:160]
+            print(f"{idx}. {chunk['file']}:{chunk['line']}  (score: {score:.2f})\n   {snippet}")
+        log_event(f"Codex search: '{query}'")
+    except Exception as e:
+        print("Error running Codex search:", e)
+        log_event(f"Error in codex_search: {e}")
+
+
 # === CHRONICLE ===
 
 def chronicle_entry():
+    from .chronicle_store import ChronicleStore
     entry = input("Enter your Chronicle entry: ")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{timestamp}] {entry}\n"
-    path = "logs/chronicle.log"
     try:
-        with open(path, "a") as f:
-            f.write(line)
+        ChronicleStore().append(entry)
         print("✅ Chronicle entry added.")
         log_event(f"Chronicle entry: {entry}")
     except Exception as e:
@@ -47,15 +80,29 @@ def chronicle_entry():
         log_event(f"Chronicle write failure: {e}")
 
 
-def read_chronicle(n=5):
-    path = "logs/chronicle.log"
+def read_chronicle(n=5, since=None, until=None, grep=None, reindex=False):
+    import re
+    from .chronicle_reader import parse_time
+    from .chronicle_store import ChronicleStore
     try:
-        with open(path, "r") as f:
-            lines = f.readlines()
-        print(f"\n=== Last {n} Chronicle Entries ===")
-        for line in lines[-n:]:
+        store = ChronicleStore()
+        if reindex:
+            rows = store.reindex()
+            print(f"✅ Chronicle timestamp index rebuilt ({rows} entries).")
+        pattern = re.compile(grep, re.IGNORECASE) if grep else None
+        if since or until:
+            lines = store.read_range(parse_time(since), parse_time(until, end_of_day=True), pattern, limit=n)
+            label = f"Chronicle Entries {since or '…'} → {until or 'now'}"
+        else:
+            n = 5 if n is None else n
+            lines = store.tail(n, pattern)
+            label = f"Last {n} Chronicle Entries"
+        if grep:
+            label += f" matching '{grep}'"
+        print(f"\n=== {label} ===")
+        for line in lines:
             print(line.strip())
-        log_event(f"Displayed last {n} Chronicle entries.")
+        log_event(f"Displayed {len(lines)} Chronicle entries.")
     except Exception as e:
         print("Could not read Chronicle:", e)
         log_event(f"Error reading Chronicle: {e}")
@@ -63,34 +110,60 @@ def read_chronicle(n=5):
 
 def rag_chronicle():
     try:
-        from txtai.embeddings import Embeddings
+        from .chronicle_index import ChronicleIndex
+        from .chronicle_store import ChronicleStore
+        from .embed_daemon import get_embedder
         log_event("RAG Chronicle search ritual invoked.")
-        path = "logs/chronicle.log"
-        with open(path, "r") as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-        if not lines:
+        index = ChronicleIndex(ChronicleStore())
+        embed = get_embedder()
+        added = index.refresh(embed)
+        if added:
+            log_event(f"Chronicle index: embedded {added} new entries.")
+        if not index.meta["count"]:
             print("Chronicle is empty.")
             return
         query = input("Ask Harmony: ")
-        embeddings = Embeddings({"method": "transformers", "path": "sentence-transformers/all-MiniLM-L6-v2"})
-        embeddings.index([(uid, text, None) for uid, text in enumerate(lines)])
-        results = embeddings.search(query, 3)
+        results = index.hybrid_search(query, embed, 3)
         print("\n=== Harmony Chronicle RAG Results ===")
-        for idx, (uid, score) in enumerate(results, 1):
-            print(f"{idx}. {lines[uid]}  (score: {score:.2f})")
+        for idx, (line, score) in enumerate(results, 1):
+            print(f"{idx}. {line}  (score: {score:.2f})")
         log_event(f"RAG Chronicle search: '{query}'")
     except Exception as e:
         print("Error running RAG Chronicle search:", e)
         log_event(f"Error in rag_chronicle: {e}")
 
 
+def embed_daemon(action="status"):
+    from .embed_daemon import EmbedClient
+    client = EmbedClient()
+    if action == "start":
+        running = client.request({"op": "status"}, timeout=1.0) is not None
+        if running or client.start():
+            print(f"✅ Embedding server ready on {client.sock_path}")
+            log_event("Embedding server started." if not running else "Embedding server already running.")
+        else:
+            print(f"❌ Embedding server did not come up (see {client.sock_path}.log)")
+            log_event("Embedding server failed to start.")
+    elif action in ("status", "stop"):
+        resp = client.request({"op": action}, timeout=5.0)
+        if resp is None:
+            print(f"ℹ️ No embedding server on {client.sock_path}")
+        elif action == "status":
+            print(f"🧠 Embedding server pid {resp['pid']}: {resp['requests']} requests in {resp['batches']} batches")
+        else:
+            print("✅ Embedding server stopped.")
+            log_event("Embedding server stopped.")
+    else:
+        print("Unknown embed-daemon action:", action)
+
+
 # === MESH + SP REBINDING ===
 
 def rebind_mesh(mesh_name):
+    from .codex import load_yaml
     path = os.path.join("Codex", "Meshes", mesh_name)
     try:
-        with open(path, "r") as f:
-            data = yaml.safe_load(f)
+        data = load_yaml(path)
         title = data.get("title", mesh_name)
         print(f"✅ Rebound mesh: {title}")
         log_event(f"Rebound mesh: {title}")
@@ -111,10 +184,10 @@ def rebind_all_meshes():
 
 
 def rebind_sp(sp_file):
+    from .codex import load_yaml
     path = os.path.join("Codex", "SPs", sp_file)
     try:
-        with open(path, "r") as f:
-            data = yaml.safe_load(f)
+        data = load_yaml(path)
         name = data.get("name", sp_file)
         print(f"✅ Rebound SP: {name}")
         log_event(f"Rebound SP: {name}")
@@ -136,45 +209,24 @@ def rebind_all_sps():
 
 # === LINK VALIDATION ===
 
-import os
-import yaml
-
 def validate_links():
+    from .codex import MESH_DIR, CodexGraph
     print("\n🔍 Validating agent links in meshes...\n")
-    mesh_dir = os.path.join(os.path.dirname(__file__), "..", "..", "Codex", "Meshes")
-    sp_dir = os.path.join(os.path.dirname(__file__), "..", "..", "Codex", "SPs")
-
-    # Normalize known SP names from filenames
-    known_agents = set()
-    for sp_file in os.listdir(sp_dir):
-        if sp_file.endswith(".yaml"):
-            name = os.path.splitext(sp_file)[0]
-            name_normalized = name.replace("-", " ").lower()
-            known_agents.add(name_normalized)
+    graph = CodexGraph()
 
     errors = 0
-    for filename in os.listdir(mesh_dir):
-        if not filename.endswith(".yaml"):
-            continue
-        path = os.path.join(mesh_dir, filename)
-        with open(path, "r") as f:
-            try:
-                data = yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                print(f"❌ Error parsing {filename}: {e}")
-                errors += 1
-                continue
-            if not isinstance(data, dict):
-                print(f"⚠️ Skipping non-dict YAML: {filename}")
-                continue
-
-        mesh_agents = data.get("agents", [])
-        for raw_agent in mesh_agents:
-            # Extract just the name (before any parentheses)
-            name_part = raw_agent.split("(")[0].strip()
-            normalized = name_part.replace("-", " ").lower()
-            if normalized not in known_agents:
-                print(f"❌ {filename} references unknown agent: {raw_agent}")
+    for rel, message in graph.errors.items():
+        if os.path.dirname(rel) == MESH_DIR:
+            print(f"❌ Error parsing {os.path.basename(rel)}: {message}")
+            errors += 1
+    for rel in graph.skipped:
+        if os.path.dirname(rel) == MESH_DIR:
+            print(f"⚠️ Skipping non-dict YAML: {os.path.basename(rel)}")
+
+    for mesh, agents in graph.mesh_agents.items():
+        for raw_agent in agents:
+            if graph.sp_for_agent(raw_agent) is None:
+                print(f"❌ {mesh}.yaml references unknown agent: {raw_agent}")
                 errors += 1
 
     if errors == 0:
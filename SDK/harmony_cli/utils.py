@@ -1,6 +1,118 @@
-# /Volumes/Public/harmony/SDK/harmony_cli/utils.py
+# SDK/harmony_cli/utils.py
+#
+# CLI event log: JSON lines, buffered in memory and written by a background
+# thread every FLUSH_SECONDS and at exit, so log_event never waits on disk.
+# Failures to write (missing volume, permissions) are reported once on stderr
+# and never raised.
+#
+# Environment:
+#   HARMONY_CLI_LOG         log file (default <repo>/logs/cli.log)
+#   HARMONY_CLI_LOG_BYTES   rotate when the file passes this size (default 5 MiB)
+#   HARMONY_CLI_LOG_KEEP    rotated files to keep: cli.log.1 ... (default 3)
+#   HARMONY_SESSION_ID      session id to stamp on events (default: one per process)
 
-def log_event(message):
-    with open("/Volumes/Public/harmony/logs/cli.log", "a") as f:
-        from datetime import datetime
-        f.write(f"[{datetime.now()}] {message}\n")
+import atexit
+import os
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+LOG_PATH = os.environ.get("HARMONY_CLI_LOG", os.path.join(REPO_ROOT, "logs", "cli.log"))
+MAX_BYTES = int(os.environ.get("HARMONY_CLI_LOG_BYTES", 5 * 1024 * 1024))
+KEEP = int(os.environ.get("HARMONY_CLI_LOG_KEEP", "3"))
+FLUSH_SECONDS = 1.0
+
+SESSION_ID = os.environ.get("HARMONY_SESSION_ID") or os.urandom(6).hex()
+
+
+class EventLog:
+    def __init__(self, path=LOG_PATH, max_bytes=MAX_BYTES, keep=KEEP, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.flush_seconds = flush_seconds
+        self.command = None
+        self.pending = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.warned = False
+
+    def log(self, message, **fields):
+        event = {
+            "ts": time.time(),
+            "mono_ns": time.monotonic_ns(),
+            "session": SESSION_ID,
+            "pid": os.getpid(),
+            "cmd": self.command,
+            "msg": str(message),
+        }
+        event.update(fields)
+        with self.lock:
+            self.pending.append(event)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="harmony-cli-log", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while not self.wake.wait(self.flush_seconds):
+            self.flush()
+
+    def _rotate(self):
+        for i in range(self.keep - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.keep > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                events, self.pending = self.pending, []
+            if not events:
+                return
+            try:
+                import json
+                data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events).encode("utf-8")
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                try:
+                    if os.path.getsize(self.path) + len(data) > self.max_bytes:
+                        self._rotate()
+                except FileNotFoundError:
+                    pass
+                with open(self.path, "ab") as f:
+                    f.write(data)
+            except Exception as e:
+                if not self.warned:
+                    self.warned = True
+                    print(f"⚠️ Harmony CLI log unavailable ({self.path}): {e}", file=sys.stderr)
+
+    def close(self):
+        self.wake.set()
+        self.flush()
+
+
+_log = EventLog()
+atexit.register(_log.close)
+
+
+def log_event(message, **fields):
+    """Queue one event for the CLI log; returns immediately and never raises."""
+    try:
+        _log.log(message, **fields)
+    except Exception:
+        pass
+
+
+def set_command(command):
+    """Stamp subsequent events with the subcommand being run."""
+    _log.command = command
+
+
+def flush_log():
+    _log.flush()
@@ -0,0 +1,322 @@
+"""
+Asyncio counterpart of scripts/logger.py for interactive front-ends (voice/MMSI).
+
+Calls enqueue a row and return its id immediately; a background task drains
+the bounded queue and writes batches. When the queue is full, callers wait
+(backpressure) instead of growing memory without bound.
+
+Usage:
+  from async_logger import AsyncHarmonyLogger, PostgresSink, SQLiteSink
+
+  async with AsyncHarmonyLogger(PostgresSink.from_env()) as hlog:
+      sid = await hlog.log_session("user", "SP-fractal-prime", shen_level=2)
+      await hlog.log_sp_interaction(sid, "FractalPrime", "What is the Tao?", "...")
+
+  # Local stand-in (no server): same schema in a SQLite file
+  async with AsyncHarmonyLogger(SQLiteSink("/tmp/harmony_log.db")) as hlog:
+      ...
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+# Load .env environment variables
+load_dotenv()
+
+# Table -> insert columns, in write order (sessions first: events reference them)
+TABLES = {
+    "harmony_sessions": ("session_id", "user_id", "sp_id", "shen_level", "drift_score",
+                         "start_time", "end_time"),
+    "codex_events": ("event_id", "session_id", "codex_path", "event_type",
+                     "glyph_signature", "encrypted_data", "timestamp"),
+    "sp_interactions": ("interaction_id", "session_id", "sp_name", "input",
+                        "response", "glyph_resonance", "timestamp"),
+    "audit_logs": ("log_id", "component", "action", "result", "timestamp"),
+}
+
+Batch = Dict[str, List[Tuple[Any, ...]]]
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _insert_sql(table: str, placeholder) -> str:
+    cols = TABLES[table]
+    values = ", ".join(placeholder(i) for i in range(1, len(cols) + 1))
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({values})"
+
+
+class PostgresSink:
+    """asyncpg pool; each batch is one transaction using COPY per table."""
+
+    def __init__(self, **connect_kwargs):
+        if asyncpg is None:
+            raise RuntimeError("asyncpg is required for PostgresSink: pip install asyncpg")
+        self.connect_kwargs = connect_kwargs
+        self.pool = None
+
+    @classmethod
+    def from_env(cls, **overrides):
+        kwargs = dict(
+            database=os.getenv("PG_DBNAME"),
+            user=os.getenv("PG_USER"),
+            password=os.getenv("PG_PASSWORD"),
+            host=os.getenv("PG_HOST"),
+            port=int(os.getenv("PG_PORT") or 5432),
+            min_size=1,
+            max_size=int(os.getenv("PG_POOL_MAX", "8")),
+        )
+        kwargs.update(overrides)
+        return cls(**kwargs)
+
+    async def open(self):
+        self.pool = await asyncpg.create_pool(**self.connect_kwargs)
+
+    async def write_batch(self, batch: Batch):
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                for table, rows in batch.items():
+                    await conn.copy_records_to_table(table, records=rows, columns=list(TABLES[table]))
+
+    async def write_each(self, batch: Batch) -> List[Tuple[Tuple[Any, ...], Exception]]:
+        """Insert row by row, each under a savepoint; returns [(row, error)] for the rows that failed."""
+        failed = []
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                for table, rows in batch.items():
+                    sql = _insert_sql(table, lambda i: f"${i}")
+                    for row in rows:
+                        try:
+                            async with conn.transaction():  # nested: a savepoint
+                                await conn.execute(sql, *row)
+                        except (asyncpg.PostgresError, ValueError, TypeError) as e:
+                            failed.append((row, e))
+        return failed
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+
+class SQLiteSink:
+    """SQLite stand-in with the same tables, for tests and offline runs."""
+
+    SCHEMA = [
+        f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(cols)})"
+        for table, cols in TABLES.items()
+    ]
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+
+    async def open(self):
+        def _open():
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            for stmt in self.SCHEMA:
+                conn.execute(stmt)
+            conn.commit()
+            return conn
+        self.conn = await asyncio.to_thread(_open)
+
+    @staticmethod
+    def _adapt(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
+
+    async def write_batch(self, batch: Batch):
+        def _write():
+            with self.conn:
+                for table, rows in batch.items():
+                    self.conn.executemany(
+                        _insert_sql(table, lambda i: "?"),
+                        [tuple(self._adapt(v) for v in row) for row in rows],
+                    )
+        await asyncio.to_thread(_write)
+
+    async def write_each(self, batch: Batch) -> List[Tuple[Tuple[Any, ...], Exception]]:
+        """Insert row by row; a failed statement rolls back only itself. Returns [(row, error)]."""
+        def _write():
+            failed = []
+            with self.conn:
+                for table, rows in batch.items():
+                    sql = _insert_sql(table, lambda i: "?")
+                    for row in rows:
+                        try:
+                            self.conn.execute(sql, tuple(self._adapt(v) for v in row))
+                        except sqlite3.Error as e:
+                            failed.append((row, e))
+            return failed
+        return await asyncio.to_thread(_write)
+
+    async def close(self):
+        if self.conn is not None:
+            await asyncio.to_thread(self.conn.close)
+            self.conn = None
+
+
+class AsyncHarmonyLogger:
+    """
+    Fire-and-forget logging for the four Harmony tables. Each log_* call
+    returns its generated id as soon as the row is queued; the writer task
+    batches up to batch_rows rows or flush_seconds, whichever comes first.
+    A batch that still fails after max_retries is written row by row, and
+    only the rows that fail on their own are dropped.
+    """
+
+    def __init__(self, sink, max_queue: int = 10000, batch_rows: int = 500,
+                 flush_seconds: float = 0.5, max_retries: int = 3):
+        self.sink = sink
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.max_retries = max_retries
+        self.writer: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    async def start(self):
+        await self.sink.open()
+        self.writer = asyncio.create_task(self._run(), name="harmony-async-log-writer")
+        return self
+
+    async def flush(self):
+        """Wait until everything queued so far has been written (or dropped)."""
+        await self.queue.join()
+
+    async def close(self):
+        if self.writer is not None:
+            await self.flush()
+            self.writer.cancel()
+            try:
+                await self.writer
+            except asyncio.CancelledError:
+                pass
+            self.writer = None
+        await self.sink.close()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # --- writer ------------------------------------------------------------
+    async def _collect(self) -> List[Tuple[str, Tuple[Any, ...]]]:
+        items = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_seconds
+        while len(items) < self.batch_rows:
+            try:
+                items.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _write(self, items: Sequence[Tuple[str, Tuple[Any, ...]]]):
+        batch: Batch = {}
+        for table in TABLES:
+            rows = [row for t, row in items if t == table]
+            if rows:
+                batch[table] = rows
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.sink.write_batch(batch)
+                self.written += len(items)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    await self._salvage(batch, e)
+                    return
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+    async def _salvage(self, batch: Batch, error: Exception):
+        """Last attempt for a batch that failed every retry: row by row, dropping only the rows that fail."""
+        total = sum(len(rows) for rows in batch.values())
+        try:
+            failed = await self.sink.write_each(batch)
+            if failed:
+                error = failed[0][1]
+            dropped = len(failed)
+        except Exception as e:
+            dropped, error = total, e
+        self.written += total - dropped
+        if dropped:
+            self.dropped += dropped
+            print(f"⚠️ Harmony async log: dropped {dropped} of {total} rows after {self.max_retries} retries: {error}",
+                  file=sys.stderr)
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            try:
+                await self._write(items)
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+
+    async def _enqueue(self, table: str, row: Tuple[Any, ...]):
+        if self.writer is None:
+            raise RuntimeError("AsyncHarmonyLogger is not started (use 'async with' or await start())")
+        await self.queue.put((table, row))
+
+    # --- public API (mirrors scripts/logger.py) ----------------------------
+    # 1. Log a Harmony session
+    async def log_session(self, user_id, sp_id, shen_level=0, drift_score=0.0, start_time=None, end_time=None):
+        session_id = uuid.uuid4()
+        await self._enqueue("harmony_sessions", (
+            session_id, user_id, sp_id, shen_level, drift_score,
+            start_time or _now(), end_time,
+        ))
+        return str(session_id)
+
+    # 2. Log a Codex event
+    async def log_codex_event(self, session_id, codex_path, event_type, glyph_signature,
+                              encrypted_data=None, timestamp=None):
+        event_id = uuid.uuid4()
+        await self._enqueue("codex_events", (
+            event_id, uuid.UUID(str(session_id)), codex_path, event_type,
+            glyph_signature, encrypted_data, timestamp or _now(),
+        ))
+        return str(event_id)
+
+    # 3. Log an SP interaction
+    async def log_sp_interaction(self, session_id, sp_name, input_text, response_text,
+                                 glyph_resonance=None, timestamp=None):
+        interaction_id = uuid.uuid4()
+        await self._enqueue("sp_interactions", (
+            interaction_id, uuid.UUID(str(session_id)), sp_name,
+            input_text, response_text, glyph_resonance, timestamp or _now(),
+        ))
+        return str(interaction_id)
+
+    # 4. Log a general audit event
+    async def log_audit(self, component, action, result, timestamp=None):
+        log_id = uuid.uuid4()
+        await self._enqueue("audit_logs", (log_id, component, action, result, timestamp or _now()))
+        return str(log_id)
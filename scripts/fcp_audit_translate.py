@@ -7,17 +7,15 @@ Outputs:
   reports/FCP_Audit_YYYY-MM-DD.json (normalized)
   reports/FCP_Status.md (summary snapshot)
 """
-import argparse, json, sys
+import argparse, json, os, sys
 from datetime import datetime, timezone
 from pathlib import Path
-try:
-    import yaml
-except Exception:
-    print("ERROR: PyYAML required (pip install pyyaml)", file=sys.stderr); sys.exit(2)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 def load_yaml(path: Path):
     if not path.exists(): return {}
-    return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return codex.load_yaml(path) or {}
 
 def load_virtue_metadata(fcp_path: Path):
     try:
@@ -7,14 +7,12 @@ Usage:
 """
 import argparse, json, sys, os, datetime as dt
 from pathlib import Path
-try:
-    import yaml
-except Exception:
-    print("ERROR: PyYAML required (pip install pyyaml)", file=sys.stderr); sys.exit(2)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 def load_yaml(p: Path):
     if not p.exists(): return {}
-    return yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    return codex.load_yaml(p) or {}
 
 def parse_last_event(audit: dict):
     # Expect a list of events under 'events' or top-level list
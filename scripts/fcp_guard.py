@@ -27,6 +27,8 @@ try:
 except Exception:
     print("ERROR: PyYAML not installed. pip install pyyaml", file=sys.stderr)
     sys.exit(2)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 ROOT = Path(__file__).resolve().parents[1]
 FCP_BASE = ROOT / "Codex" / "System" / "fcp.yaml"          # baseline spec (already in repo)
@@ -44,8 +46,7 @@ def iso(dtobj: dt.datetime | None) -> str | None:
 def load_yaml(path: Path) -> dict:
     if not path.exists():
         return {}
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return codex.load_yaml(path) or {}
 
 def save_yaml(path: Path, data: dict):
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -18,38 +18,85 @@ Usage:
       --passphrase 'your-strong-pass' \
       [--out /path/to/plain.ext]
 
+  # Encrypt / decrypt a whole directory (one KDF per policy, process pool)
+  ./scripts/glyphcrypt.py encrypt-tree Codex/Core --sp SP-ethos --shen 3 [--workers 8]
+  ./scripts/glyphcrypt.py decrypt-tree Codex/Core --sp SP-ethos --shen 3
+
+  # Cache derived keys between decrypts (see scripts/glyphcrypt_agent.py)
+  ./scripts/glyphcrypt_agent.py serve --ttl 900 &
+
   # Inspect envelope header (no key required)
   ./scripts/glyphcrypt.py inspect <path>
 
 Notes:
 - NEVER commit passphrases. Prefer interactive prompts or env vars in CI.
 - Pre-transform is reversible obfuscation; real security is AEAD.
+- Inputs larger than envelope.chunk_bytes are sealed as a streaming envelope:
+  one JSON header line, then one base64 AES-GCM segment per line. Each
+  segment uses nonce = prefix || counter || final-flag and the header line as
+  AAD, so truncation, reordering and header edits all fail authentication.
+  Memory use stays at a few segments regardless of file size.
+- envelope.armor: false (or --no-armor) writes a compact binary envelope:
+  magic bytes, a 4-byte big-endian header length, the JSON header, then raw
+  ciphertext. decrypt and inspect auto-detect all envelope formats.
+- Envelope version 1.1 escapes literal glyph codes in the pre-transform so
+  they survive the round trip, and authenticates the header of whole-file
+  envelopes (canonical JSON as AAD). 1.0 envelopes still open; envelopes
+  newer than this script are refused rather than decoded wrongly.
 """
 
 import argparse
 import base64
+import codecs
 import json
+import mmap
 import os
+import re
 import sys
-import yaml
 import getpass
 import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional
 
 # Hard dependency
 try:
     from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
     from cryptography.hazmat.primitives import hashes
     from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.exceptions import InvalidTag
 except Exception as e:
     print("ERROR: cryptography package is required: pip install cryptography", file=sys.stderr)
     sys.exit(2)
 
+# Optional: derived-key cache (scripts/glyphcrypt_agent.py)
+try:
+    from glyphcrypt_agent import AgentClient
+except ImportError:
+    AgentClient = None
+
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "SDK"))
+from harmony_cli import codex  # noqa: E402
 DEFAULT_CFG = os.path.join(REPO_ROOT, "Codex", "System", "GlyphCrypt.yaml")
 
+STREAM_SCHEME = "STREAM-AES-GCM"
+STREAM_COUNTER_BYTES = 4
+GCM_TAG_BYTES = 16
+BINARY_MAGIC = b"\x89GCRYPT\n"
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+TEXT_SNIFF_BYTES = 64 * 1024
+# Private-use marker for literal glyph codes in plaintext (see GlyphTransform)
+GLYPH_ESCAPE = "\ue000"
+# 1.1: the pre-transform escapes literal glyph codes (1.0 envelopes are read with the plain table)
+ENVELOPE_VERSION = "1.1"
+# GlyphTransform's no-match fast path is used up to this many substring scans
+MAX_PROBES = 24
+
 
 @dataclass
 class CryptoDefaults:
@@ -64,8 +111,7 @@ class CryptoDefaults:
 def load_config(path: str) -> Dict[str, Any]:
     if not os.path.isfile(path):
         raise FileNotFoundError(f"GlyphCrypt config not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return codex.load_yaml(path) or {}
 
 
 def kdf_hash(name: str):
@@ -91,22 +137,227 @@ def derive_key(passphrase: str, sp_id: str, shen_level: int, salt: bytes,
     return kdf.derive(secret)
 
 
-def pre_transform(text: str, glyph_map: Dict[str, str], invert: bool = False) -> str:
+def _trie_pattern(words) -> str:
+    """
+    Regex alternation factored by common prefix (a compiled trie). Optional
+    tails are greedy, so the longest key at each position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + emit(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return emit(trie)
+
+
+class GlyphTransform:
+    """
+    Single-pass glyph mapping compiled from a glyph_map (one direction).
+    Overlapping keys such as "⊚" and "⊚̸" resolve to the longer one. Literal
+    codes (and GLYPH_ESCAPE itself) already present in the text are escaped on
+    the way in and restored on the way out, so the mapping round-trips exactly.
+    escape=False gives the plain table of 1.0 envelopes.
+    """
+
+    def __init__(self, glyph_map: Dict[str, str], invert: bool = False, escape: bool = True):
+        esc = GLYPH_ESCAPE
+        if not escape:
+            table = {v: k for k, v in glyph_map.items()} if invert else dict(glyph_map)
+        elif invert:
+            table = {esc + v: v for v in glyph_map.values()}
+            table[esc + esc] = esc
+            table.update({v: k for k, v in glyph_map.items()})
+        else:
+            table = {v: esc + v for v in glyph_map.values()}
+            table[esc] = esc + esc
+            table.update(glyph_map)
+        table.pop("", None)
+        self.table = table
+        self.pattern = re.compile("(" + _trie_pattern(table) + ")")
+        self.keychars = frozenset("".join(table))
+        # A character every key contains: its highest code point (the glyph, or the Greek
+        # letter of a code), or the whole key when it is plain ASCII. Past a couple of dozen
+        # scans the regex alone is cheaper, so large maps skip the fast path.
+        probes = {max(k) if max(k) > "\x7f" else k for k in table}
+        self.probes = tuple(sorted(probes)) if len(probes) <= MAX_PROBES else None
+
+    def apply(self, text: str) -> str:
+        # Fast path: a few C-level scans rule out any match before the regex runs
+        if self.probes is not None and not any(probe in text for probe in self.probes):
+            return text
+        # split() with one group alternates [text, match, text, ...]
+        parts = self.pattern.split(text)
+        parts[1::2] = map(self.table.__getitem__, parts[1::2])
+        return "".join(parts)
+
+
+@lru_cache(maxsize=16)
+def _compiled_transform(items: tuple, invert: bool, escape: bool) -> GlyphTransform:
+    return GlyphTransform(dict(items), invert=invert, escape=escape)
+
+
+def get_glyph_transform(glyph_map: Dict[str, str], invert: bool = False,
+                        escape: bool = True) -> GlyphTransform:
+    return _compiled_transform(tuple(glyph_map.items()), invert, escape)
+
+
+def agent_client(cfg: Dict[str, Any]):
+    agent_def = cfg.get("defaults", {}).get("agent", {}) or {}
+    if AgentClient is None or not agent_def.get("enabled", True):
+        return None
+    return AgentClient(agent_def.get("socket"))
+
+
+def resolve_key(cfg: Dict[str, Any], get_passphrase: Callable[[], str], sp_id: str,
+                shen_level: int, salt: bytes, iterations: int, hash_name: str):
+    """
+    Return (key, remember). The key agent is asked first; on a miss the key is
+    derived, and remember() hands it to the agent. Call remember() only after
+    the key has authenticated a payload, so wrong passphrases never get cached.
+    """
+    agent = agent_client(cfg)
+    if agent is not None:
+        key = agent.get(sp_id, shen_level, salt, iterations, hash_name)
+        if key is not None:
+            return key, lambda: None
+    key = derive_key(get_passphrase(), sp_id, shen_level, salt, iterations, hash_name)
+    if agent is None:
+        return key, lambda: None
+    return key, lambda: agent.put(sp_id, shen_level, salt, iterations, hash_name, key)
+
+
+def pre_transform(text: str, glyph_map: Dict[str, str], invert: bool = False,
+                  escape: bool = True) -> str:
     """
     Reversible glyphic mapping; NOT cryptography. Aesthetic/obfuscation.
-    If invert=True, attempt reverse mapping.
+    If invert=True, apply the reverse mapping. escape=False reverses 1.0 envelopes.
     """
     if not glyph_map:
         return text
-    if invert:
-        rev = {v: k for k, v in glyph_map.items()}
-        for k, v in rev.items():
-            text = text.replace(k, v)
-        return text
-    else:
-        for k, v in glyph_map.items():
-            text = text.replace(k, v)
-        return text
+    return get_glyph_transform(glyph_map, invert, escape).apply(text)
+
+
+class GlyphStream:
+    """
+    Incremental pre_transform over a UTF-8 byte stream.
+    Text is only emitted up to the last character that cannot belong to a
+    match, so no key is ever split across two feed() calls.
+    """
+
+    def __init__(self, glyph_map: Dict[str, str], invert: bool = False, escape: bool = True):
+        self.transform = get_glyph_transform(glyph_map, invert, escape) if glyph_map else None
+        self.keychars = self.transform.keychars if self.transform else frozenset()
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.carry = ""
+
+    def feed(self, data: bytes, final: bool = False) -> bytes:
+        text = self.carry + self.decoder.decode(data, final)
+        cut = len(text)
+        if not final:
+            while cut and text[cut - 1] in self.keychars:
+                cut -= 1
+        self.carry = text[cut:]
+        out = self.transform.apply(text[:cut]) if self.transform else text[:cut]
+        return out.encode("utf-8")
+
+
+def sniff_text(path: str, prefix_bytes: int = TEXT_SNIFF_BYTES) -> bool:
+    """
+    Guess text vs binary from a prefix: no NUL bytes and valid UTF-8 (a
+    multi-byte sequence cut off at the prefix boundary is fine).
+    """
+    with open(path, "rb") as f:
+        head = f.read(prefix_bytes)
+        at_eof = not f.read(1)
+    if b"\x00" in head:
+        return False
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, at_eof)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+@contextmanager
+def map_file(path: str, offset: int = 0):
+    """Read-only zero-copy view of a file from offset (mmap; empty ranges map to b"")."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= offset:
+            yield memoryview(b"")
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)[offset:]
+        try:
+            yield view
+        finally:
+            view.release()
+            mm.close()
+
+
+def read_views(f, size: int, block_bytes: int):
+    """
+    Yield (view, is_final) blocks of block_bytes from f up to size, reading
+    into one reused buffer. Each view is only valid until the next iteration.
+    """
+    buf = bytearray(block_bytes)
+    mv = memoryview(buf)
+    while True:
+        n = 0
+        while n < block_bytes:
+            got = f.readinto(mv[n:])
+            if not got:
+                break
+            n += got
+        final = n < block_bytes or f.tell() >= size
+        yield mv[:n], final
+        if final:
+            return
+
+
+def stream_nonce(prefix: bytes, counter: int, final: bool) -> bytes:
+    if counter >= 1 << (8 * STREAM_COUNTER_BYTES):
+        raise ValueError("Stream too long: segment counter overflow.")
+    return prefix + counter.to_bytes(STREAM_COUNTER_BYTES, "big") + (b"\x01" if final else b"\x00")
+
+
+def iter_segments(path: str, chunk_bytes: int, transform: Optional[GlyphStream] = None):
+    """
+    Yield (segment, is_final) plaintext segments of exactly chunk_bytes; only
+    the final segment may be shorter (or empty, for an empty input).
+    """
+    if transform is None:
+        # Binary: segments are views into a reused read buffer, no copies
+        with open(path, "rb", buffering=0) as f:
+            yield from read_views(f, os.fstat(f.fileno()).st_size, chunk_bytes)
+        return
+    buf = bytearray()
+    pending = None
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(chunk_bytes)
+            buf += transform.feed(block, final=not block)
+            while len(buf) >= chunk_bytes:
+                if pending is not None:
+                    yield pending, False
+                pending = bytes(buf[:chunk_bytes])
+                del buf[:chunk_bytes]
+            if not block:
+                break
+    if pending is not None:
+        if not buf:
+            yield pending, True
+            return
+        yield pending, False
+    yield bytes(buf), True
 
 
 def read_bytes(path: str) -> bytes:
@@ -115,20 +366,182 @@ def read_bytes(path: str) -> bytes:
 
 
 def write_bytes(path: str, data: bytes):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     with open(path, "wb") as f:
         f.write(data)
 
 
 def write_text(path: str, text: str):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         f.write(text)
 
 
+def envelope_escaped(header: Dict[str, Any]) -> bool:
+    """
+    Whether the payload was pre-transformed with escaped literal codes (1.1),
+    as opposed to the plain table of 1.0. Rejects versions newer than ours.
+    """
+    version = str(header.get("version", "1.0"))
+    try:
+        parsed = tuple(int(p) for p in version.split("."))
+    except ValueError:
+        raise ValueError(f"Malformed envelope: version {version!r}.")
+    if parsed > tuple(int(p) for p in ENVELOPE_VERSION.split(".")):
+        raise ValueError(f"Envelope version {version} is newer than this GlyphCrypt ({ENVELOPE_VERSION}); upgrade to open it.")
+    return parsed >= (1, 1)
+
+
+def header_aad(header: Dict[str, Any]) -> Optional[bytes]:
+    """
+    AAD for whole-file envelopes: the canonical header JSON from 1.1 on, so a
+    header edit (such as a version downgrade) fails authentication. 1.0
+    envelopes were sealed without AAD.
+    """
+    if not envelope_escaped(header):
+        return None
+    return json.dumps(header, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def check_policy(header: Dict[str, Any], sp_id: str, shen_level: int):
+    sp_gate = header.get("sp_gate", []) or []
+    min_shen = int(header.get("min_shen_level", 0))
+    if sp_gate and sp_id not in sp_gate:
+        raise PermissionError(f"SP '{sp_id}' is not permitted (gate={sp_gate}).")
+    if shen_level < min_shen:
+        raise PermissionError(f"Shen level {shen_level} < required {min_shen}.")
+
+
+@dataclass
+class EnvelopeHead:
+    env: Dict[str, Any]     # {"header": {...}, "filename": ...}
+    raw: bytes              # exact header bytes (AAD for streaming segments)
+    offset: int             # where the payload starts
+    binary: bool
+
+
+def read_envelope_head(path: str) -> Optional[EnvelopeHead]:
+    """
+    Sniff a binary or streaming envelope from its first bytes.
+    Returns None for the legacy pretty-printed JSON envelope, which needs a
+    full parse. Only the header is read, so this is cheap on multi-GB files.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(BINARY_MAGIC))
+        if magic == BINARY_MAGIC:
+            size = int.from_bytes(f.read(4), "big")
+            raw = f.read(size)
+            if len(raw) != size:
+                raise ValueError("Malformed envelope: truncated binary header.")
+            env = json.loads(raw.decode("utf-8"))
+            if not isinstance(env, dict) or not isinstance(env.get("header"), dict):
+                raise ValueError("Malformed envelope: missing header.")
+            return EnvelopeHead(env, raw, len(BINARY_MAGIC) + 4 + size, True)
+        f.seek(0)
+        line = f.readline(1 << 20)
+    raw = line.rstrip(b"\n")
+    try:
+        env = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return None
+    if not isinstance(env, dict) or not isinstance(env.get("header"), dict):
+        return None
+    if env["header"].get("stream") != STREAM_SCHEME:
+        return None
+    return EnvelopeHead(env, raw, len(line), False)
+
+
+def write_envelope_head(out, env_head: Dict[str, Any], binary: bool) -> bytes:
+    if binary:
+        raw = json.dumps(env_head, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        out.write(BINARY_MAGIC + len(raw).to_bytes(4, "big") + raw)
+    else:
+        raw = json.dumps(env_head, ensure_ascii=False).encode("utf-8")
+        out.write(raw + b"\n")
+    return raw
+
+
+def write_binary_envelope(out_path: str, env_head: Dict[str, Any], ct: bytes) -> None:
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "wb") as out:
+        write_envelope_head(out, env_head, binary=True)
+        out.write(ct)
+
+
+def write_stream_envelope(out_path: str, env_head: Dict[str, Any], key: bytes,
+                          prefix: bytes, segments, binary: bool = False) -> None:
+    aead = AESGCM(key)
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp = out_path + ".part"
+    try:
+        with open(tmp, "wb") as out:
+            head_raw = write_envelope_head(out, env_head, binary)
+            for counter, (segment, final) in enumerate(segments):
+                ct = aead.encrypt(stream_nonce(prefix, counter, final), segment, head_raw)
+                out.write(ct if binary else base64.b64encode(ct) + b"\n")
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def iter_cipher_segments(f, head: EnvelopeHead):
+    """Yield (ciphertext, is_final) segments of a streaming envelope from its payload offset."""
+    f.seek(head.offset)
+    if head.binary:
+        # Every segment but the last carries exactly chunk_bytes plus the GCM tag
+        seg_bytes = int(head.env["header"]["chunk_bytes"]) + GCM_TAG_BYTES
+        size = os.fstat(f.fileno()).st_size
+        if f.tell() < size:
+            yield from read_views(f, size, seg_bytes)
+        return
+    line = f.readline()
+    while line:
+        nxt = f.readline()
+        yield base64.b64decode(line), not nxt
+        line = nxt
+
+
+def decrypt_stream(in_path: str, out_path: str, head: EnvelopeHead,
+                   key: bytes, glyph_map: Dict[str, str]) -> None:
+    header = head.env["header"]
+    prefix = base64.b64decode(header["nonce_b64"])
+    aead = AESGCM(key)
+    transform = None
+    if header.get("pre_transform"):
+        transform = GlyphStream(glyph_map, invert=True, escape=envelope_escaped(header))
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp = out_path + ".part"
+    try:
+        with open(in_path, "rb") as f, open(tmp, "wb") as out:
+            counter = 0
+            for ct, final in iter_cipher_segments(f, head):
+                try:
+                    pt = aead.decrypt(stream_nonce(prefix, counter, final), ct, head.raw)
+                except InvalidTag:
+                    raise ValueError(
+                        f"Segment {counter} failed authentication "
+                        "(wrong key, or envelope tampered/truncated)."
+                    )
+                out.write(transform.feed(pt, final=final) if transform else pt)
+                counter += 1
+            if not counter:
+                raise ValueError("Malformed envelope: stream has no segments.")
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
 def encrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
                  sp_id: str, shen_level: int, passphrase: Optional[str],
-                 sp_gate: Optional[list] = None, min_shen_level: Optional[int] = None) -> str:
+                 sp_gate: Optional[list] = None, min_shen_level: Optional[int] = None,
+                 chunk_bytes: Optional[int] = None, armor: Optional[bool] = None,
+                 salt: Optional[bytes] = None, key: Optional[bytes] = None) -> str:
+    """
+    Seal in_path. Pass a pre-derived (salt, key) pair to skip the KDF, as
+    encrypt_tree does to share one derivation across many files.
+    """
     defaults = cfg.get("defaults", {})
     crypto = defaults.get("crypto", {})
     envelope_def = defaults.get("envelope", {})
@@ -144,37 +557,35 @@ def encrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
     nonce_bytes = int(crypto.get("nonce_bytes", 12))
     hash_name = crypto.get("hash", "SHA256")
 
-    armor = bool(envelope_def.get("armor", True))
-    hdr_version = envelope_def.get("version", "1.0")
+    if armor is None:
+        armor = bool(envelope_def.get("armor", True))
     hdr_scheme = envelope_def.get("scheme", "GlyphCrypt-AEAD")
+    if chunk_bytes is None:
+        chunk_bytes = int(envelope_def.get("chunk_bytes", 0) or 0)
 
     if sp_gate is None:
         sp_gate = policy_def.get("sp_gate", [])
     if min_shen_level is None:
         min_shen_level = int(policy_def.get("min_shen_level", 0))
 
-    # Read plaintext
-    raw = read_bytes(in_path)
-
-    # If probable text, apply glyph pre-transform
     glyph_map = cfg.get("glyph_map", {}) or {}
-    try:
-        as_text = raw.decode("utf-8")
-        as_text = pre_transform(as_text, glyph_map, invert=False)
-        raw = as_text.encode("utf-8")
-    except UnicodeDecodeError:
-        # Binary—skip pre-transform
-        pass
+    stream = chunk_bytes > 0 and os.path.getsize(in_path) > chunk_bytes
 
-    salt = secrets.token_bytes(salt_bytes)
-    key = derive_key(passphrase or prompt_passphrase(), sp_id, shen_level, salt, iterations, hash_name)
+    # Only probable text gets the glyph pre-transform; binary skips decode/encode
+    is_text = sniff_text(in_path)
 
-    nonce = secrets.token_bytes(nonce_bytes)
-    aead = AESGCM(key)
-    ct = aead.encrypt(nonce, raw, None)
+    if key is None or salt is None:
+        salt = secrets.token_bytes(salt_bytes)
+        key = derive_key(passphrase or prompt_passphrase(), sp_id, shen_level, salt, iterations, hash_name)
+
+    if stream:
+        # Per-file prefix; each segment appends a counter and a final-chunk flag
+        nonce = secrets.token_bytes(nonce_bytes - STREAM_COUNTER_BYTES - 1)
+    else:
+        nonce = secrets.token_bytes(nonce_bytes)
 
     header = {
-        "version": hdr_version,
+        "version": ENVELOPE_VERSION,
         "scheme": hdr_scheme,
         "algo": algo,
         "kdf": "PBKDF2HMAC",
@@ -185,26 +596,55 @@ def encrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
         "sp_gate": sp_gate,
         "min_shen_level": min_shen_level,
         "audit": (cfg.get("audit") or {}),
+        "pre_transform": is_text,
     }
 
-    envelope = {
-        "header": header,
-        "payload_b64": base64.b64encode(ct).decode(),
-        "filename": os.path.basename(in_path),
-    }
+    if not out_path:
+        # Armored and binary envelopes share the suffix; decrypt auto-detects
+        out_path = in_path + io_def.get("header_suffix", ".gcrypt")
 
-    text = json.dumps(envelope, ensure_ascii=False, indent=2)
-    if armor:
-        # Write as text with .gcrypt
-        if not out_path:
-            suffix = io_def.get("header_suffix", ".gcrypt")
-            out_path = in_path + suffix
-        write_text(out_path, text)
+    if stream:
+        header.update({"stream": STREAM_SCHEME, "chunk_bytes": chunk_bytes})
+        env_head = {"header": header, "filename": os.path.basename(in_path)}
+        transform = GlyphStream(glyph_map) if is_text else None
+        try:
+            write_stream_envelope(out_path, env_head, key, nonce,
+                                  iter_segments(in_path, chunk_bytes, transform),
+                                  binary=not armor)
+        except UnicodeDecodeError:
+            # Prefix looked like text but the body is not UTF-8: reseal as
+            # binary under a fresh nonce prefix (never reuse one with this key)
+            nonce = secrets.token_bytes(len(nonce))
+            header.update({"nonce_b64": base64.b64encode(nonce).decode(), "pre_transform": False})
+            write_stream_envelope(out_path, env_head, key, nonce,
+                                  iter_segments(in_path, chunk_bytes), binary=not armor)
     else:
-        # Raw binary — not typical for this workflow
-        if not out_path:
-            out_path = in_path + ".bin"
-        write_bytes(out_path, text.encode("utf-8"))
+        aead = AESGCM(key)
+        ct = None
+        if is_text:
+            raw = read_bytes(in_path)
+            try:
+                raw = pre_transform(raw.decode("utf-8"), glyph_map, invert=False).encode("utf-8")
+            except UnicodeDecodeError:
+                header["pre_transform"] = False
+            ct = aead.encrypt(nonce, raw, header_aad(header))
+            del raw
+        if ct is None:
+            # Binary: AEAD reads straight from the mapped file
+            with map_file(in_path) as view:
+                ct = aead.encrypt(nonce, view, header_aad(header))
+
+        if armor:
+            envelope = {
+                "header": header,
+                "payload_b64": base64.b64encode(ct).decode(),
+                "filename": os.path.basename(in_path),
+            }
+            write_text(out_path, json.dumps(envelope, ensure_ascii=False, indent=2))
+        else:
+            # Magic + length-prefixed JSON header + raw ciphertext
+            env_head = {"header": header, "filename": os.path.basename(in_path)}
+            write_binary_envelope(out_path, env_head, ct)
 
     if not io_def.get("keep_plaintext", False):
         try:
@@ -216,7 +656,52 @@ def encrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
 
 
 def decrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
-                 sp_id: str, shen_level: int, passphrase: Optional[str]) -> str:
+                 sp_id: str, shen_level: int, passphrase: Optional[str],
+                 key: Optional[bytes] = None) -> str:
+    """
+    Open in_path. key, if given, must match the envelope's KDF parameters
+    (see header_key_params); decrypt_tree uses it to derive once per policy.
+    Otherwise the key agent is consulted before falling back to the KDF.
+    """
+    glyph_map = cfg.get("glyph_map", {}) or {}
+    remember = lambda: None  # noqa: E731
+
+    # Binary and streaming envelopes only need their header up front
+    head = read_envelope_head(in_path)
+    if head is not None:
+        env = head.env
+        header = env["header"]
+        check_policy(header, sp_id, shen_level)
+        escaped = envelope_escaped(header)
+
+        iterations = int(header.get("iterations", 200000))
+        hash_name = header.get("hash", "SHA256")
+        salt = base64.b64decode(header["salt_b64"])
+        if key is None:
+            key, remember = resolve_key(cfg, lambda: passphrase or prompt_passphrase(),
+                                        sp_id, shen_level, salt, iterations, hash_name)
+
+        if not out_path:
+            base_name = env.get("filename") or os.path.basename(in_path).replace(".gcrypt", "")
+            out_path = os.path.join(os.path.dirname(in_path), base_name)
+
+        if header.get("stream"):
+            decrypt_stream(in_path, out_path, head, key, glyph_map)
+            remember()
+            return out_path
+
+        nonce = base64.b64decode(header["nonce_b64"])
+        with map_file(in_path, head.offset) as ct:
+            pt = AESGCM(key).decrypt(nonce, ct, header_aad(header))
+        remember()
+        if header.get("pre_transform", True):
+            try:
+                pt = pre_transform(pt.decode("utf-8"), glyph_map, invert=True, escape=escaped).encode("utf-8")
+            except UnicodeDecodeError:
+                pass
+        write_bytes(out_path, pt)
+        return out_path
+
     # Load envelope
     raw = read_bytes(in_path)
     try:
@@ -230,12 +715,8 @@ def decrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
         raise ValueError("Malformed envelope: missing header or payload.")
 
     # Policy gates
-    sp_gate = header.get("sp_gate", []) or []
-    min_shen = int(header.get("min_shen_level", 0))
-    if sp_gate and sp_id not in sp_gate:
-        raise PermissionError(f"SP '{sp_id}' is not permitted (gate={sp_gate}).")
-    if shen_level < min_shen:
-        raise PermissionError(f"Shen level {shen_level} < required {min_shen}.")
+    check_policy(header, sp_id, shen_level)
+    escaped = envelope_escaped(header)
 
     iterations = int(header.get("iterations", 200000))
     hash_name = header.get("hash", "SHA256")
@@ -243,18 +724,21 @@ def decrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
     nonce = base64.b64decode(header["nonce_b64"])
     ct = base64.b64decode(payload_b64)
 
-    key = derive_key(passphrase or prompt_passphrase(), sp_id, shen_level, salt, iterations, hash_name)
+    if key is None:
+        key, remember = resolve_key(cfg, lambda: passphrase or prompt_passphrase(),
+                                    sp_id, shen_level, salt, iterations, hash_name)
     aead = AESGCM(key)
-    pt = aead.decrypt(nonce, ct, None)
+    pt = aead.decrypt(nonce, ct, header_aad(header))
+    remember()
 
-    # Try to reverse pre-transform
-    glyph_map = cfg.get("glyph_map", {}) or {}
-    try:
-        as_text = pt.decode("utf-8")
-        as_text = pre_transform(as_text, glyph_map, invert=True)
-        pt = as_text.encode("utf-8")
-    except UnicodeDecodeError:
-        pass
+    # Try to reverse pre-transform (envelopes record whether it was applied)
+    if header.get("pre_transform", True):
+        try:
+            as_text = pt.decode("utf-8")
+            as_text = pre_transform(as_text, glyph_map, invert=True, escape=escaped)
+            pt = as_text.encode("utf-8")
+        except UnicodeDecodeError:
+            pass
 
     # Output name
     if not out_path:
@@ -267,6 +751,14 @@ def decrypt_file(cfg: Dict[str, Any], in_path: str, out_path: Optional[str],
 
 
 def inspect_envelope(path: str):
+    try:
+        head = read_envelope_head(path)
+    except ValueError as e:
+        print(f"Not a GlyphCrypt envelope ({e}).")
+        return 1
+    if head is not None:
+        print(json.dumps(head.env["header"], ensure_ascii=False, indent=2))
+        return 0
     raw = read_bytes(path)
     try:
         env = json.loads(raw.decode("utf-8"))
@@ -278,6 +770,153 @@ def inspect_envelope(path: str):
     return 0
 
 
+def read_header(path: str) -> Dict[str, Any]:
+    head = read_envelope_head(path)
+    if head is not None:
+        return head.env["header"]
+    try:
+        env = json.loads(read_bytes(path).decode("utf-8"))
+    except Exception:
+        raise ValueError("Input does not look like a GlyphCrypt envelope (JSON)")
+    header = env.get("header") if isinstance(env, dict) else None
+    if not header:
+        raise ValueError("Malformed envelope: missing header or payload.")
+    return header
+
+
+def header_key_params(header: Dict[str, Any]):
+    """(salt_b64, iterations, hash) — envelopes sharing these share a derived key."""
+    return header["salt_b64"], int(header.get("iterations", 200000)), header.get("hash", "SHA256")
+
+
+def walk_tree(root: str, suffix: str, encrypted: bool) -> List[str]:
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            if name.endswith(".part") or os.path.islink(path) or not os.path.isfile(path):
+                continue
+            if name.endswith(suffix) == encrypted:
+                paths.append(path)
+    return paths
+
+
+def _encrypt_tree_job(job):
+    cfg, path, sp_id, shen_level, opts = job
+    size = os.path.getsize(path)
+    encrypt_file(cfg, path, None, sp_id, shen_level, None, **opts)
+    return size
+
+
+def _decrypt_tree_job(job):
+    cfg, path, sp_id, shen_level, key = job
+    size = os.path.getsize(path)
+    decrypt_file(cfg, path, None, sp_id, shen_level, None, key=key)
+    return size
+
+
+def run_tree_jobs(fn, jobs: List[tuple], workers: Optional[int]) -> Dict[str, Any]:
+    """Run per-file jobs (job[1] is the path) over a process pool and collect throughput stats."""
+    stats = {"files": 0, "bytes": 0, "seconds": 0.0, "failed": []}
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            try:
+                stats["bytes"] += fn(job)
+                stats["files"] += 1
+            except Exception as e:
+                stats["failed"].append((job[1], str(e)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(fn, job): job[1] for job in jobs}
+            for fut in as_completed(futures):
+                try:
+                    stats["bytes"] += fut.result()
+                    stats["files"] += 1
+                except Exception as e:
+                    stats["failed"].append((futures[fut], str(e)))
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def encrypt_tree(cfg: Dict[str, Any], root: str, sp_id: str, shen_level: int,
+                 passphrase: Optional[str], sp_gate: Optional[list] = None,
+                 min_shen_level: Optional[int] = None, chunk_bytes: Optional[int] = None,
+                 armor: Optional[bool] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Encrypt every plaintext file under root. The KDF runs once per call: all
+    envelopes share one salt (and so one key) while nonces stay per-file.
+    """
+    crypto = cfg.get("defaults", {}).get("crypto", {})
+    suffix = cfg.get("defaults", {}).get("io", {}).get("header_suffix", ".gcrypt")
+    paths = walk_tree(root, suffix, encrypted=False)
+    if not paths:
+        return run_tree_jobs(_encrypt_tree_job, [], workers)
+
+    salt = secrets.token_bytes(int(crypto.get("salt_bytes", 16)))
+    key = derive_key(passphrase or prompt_passphrase(), sp_id, shen_level, salt,
+                     int(crypto.get("iterations", 200000)), crypto.get("hash", "SHA256"))
+    opts = {
+        "sp_gate": sp_gate, "min_shen_level": min_shen_level,
+        "chunk_bytes": chunk_bytes, "armor": armor, "salt": salt, "key": key,
+    }
+    jobs = [(cfg, path, sp_id, shen_level, opts) for path in paths]
+    return run_tree_jobs(_encrypt_tree_job, jobs, workers)
+
+
+def decrypt_tree(cfg: Dict[str, Any], root: str, sp_id: str, shen_level: int,
+                 passphrase: Optional[str], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Decrypt every envelope under root, resolving one key per distinct (salt, iterations, hash)."""
+    suffix = cfg.get("defaults", {}).get("io", {}).get("header_suffix", ".gcrypt")
+    keys: Dict[tuple, tuple] = {}
+    groups: Dict[tuple, List[str]] = {}
+    jobs, rejected = [], []
+
+    def get_passphrase() -> str:
+        nonlocal passphrase
+        if passphrase is None:
+            passphrase = prompt_passphrase()
+        return passphrase
+
+    for path in walk_tree(root, suffix, encrypted=True):
+        try:
+            header = read_header(path)
+            check_policy(header, sp_id, shen_level)
+        except Exception as e:
+            rejected.append((path, str(e)))
+            continue
+        params = header_key_params(header)
+        if params not in keys:
+            salt_b64, iterations, hash_name = params
+            keys[params] = resolve_key(cfg, get_passphrase, sp_id, shen_level,
+                                       base64.b64decode(salt_b64), iterations, hash_name)
+        groups.setdefault(params, []).append(path)
+        jobs.append((cfg, path, sp_id, shen_level, keys[params][0]))
+    stats = run_tree_jobs(_decrypt_tree_job, jobs, workers)
+
+    # Cache keys that opened at least one envelope
+    failed = {path for path, _ in stats["failed"]}
+    for params, paths in groups.items():
+        if any(path not in failed for path in paths):
+            keys[params][1]()
+
+    stats["failed"] = rejected + stats["failed"]
+    stats["keys_resolved"] = len(keys)
+    return stats
+
+
+def print_tree_stats(verb: str, stats: Dict[str, Any]) -> int:
+    secs = max(stats["seconds"], 1e-9)
+    mb = stats["bytes"] / (1024 * 1024)
+    print(f"✅ {verb} {stats['files']} files ({mb:.2f} MiB) in {stats['seconds']:.2f}s — "
+          f"{stats['files'] / secs:.1f} files/s, {mb / secs:.2f} MiB/s")
+    for path, err in stats["failed"]:
+        print(f"❌ {path}: {err}", file=sys.stderr)
+    return 1 if stats["failed"] else 0
+
+
 def prompt_passphrase() -> str:
     pw = getpass.getpass("Passphrase: ")
     if not pw:
@@ -299,6 +938,10 @@ def main():
     p_enc.add_argument("--out", help="Output path")
     p_enc.add_argument("--gate", action="append", help="Allowed SP ids (repeatable)")
     p_enc.add_argument("--min-shen", type=int, help="Minimum shen level")
+    p_enc.add_argument("--chunk-bytes", type=int,
+                       help="Stream inputs larger than this in AEAD segments (0 disables)")
+    p_enc.add_argument("--armor", action=argparse.BooleanOptionalAction, default=None,
+                       help="JSON/base64 envelope (--no-armor writes the compact binary format)")
 
     p_dec = sub.add_parser("decrypt", help="Decrypt a file")
     p_dec.add_argument("path", help="Encrypted file (.gcrypt)")
@@ -307,6 +950,26 @@ def main():
     p_dec.add_argument("--passphrase", help="Passphrase (omit to prompt)")
     p_dec.add_argument("--out", help="Output path")
 
+    p_etree = sub.add_parser("encrypt-tree", help="Encrypt every file under a directory")
+    p_etree.add_argument("path", help="Directory (e.g., Codex/Core)")
+    p_etree.add_argument("--sp", required=True, help="SP id (e.g., SP-ethos)")
+    p_etree.add_argument("--shen", type=int, required=True, help="Shen level (int)")
+    p_etree.add_argument("--passphrase", help="Passphrase (omit to prompt)")
+    p_etree.add_argument("--gate", action="append", help="Allowed SP ids (repeatable)")
+    p_etree.add_argument("--min-shen", type=int, help="Minimum shen level")
+    p_etree.add_argument("--chunk-bytes", type=int,
+                         help="Stream inputs larger than this in AEAD segments (0 disables)")
+    p_etree.add_argument("--armor", action=argparse.BooleanOptionalAction, default=None,
+                         help="JSON/base64 envelope (--no-armor writes the compact binary format)")
+    p_etree.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+
+    p_dtree = sub.add_parser("decrypt-tree", help="Decrypt every envelope under a directory")
+    p_dtree.add_argument("path", help="Directory (e.g., Codex/Core)")
+    p_dtree.add_argument("--sp", required=True, help="SP id (e.g., SP-ethos)")
+    p_dtree.add_argument("--shen", type=int, required=True, help="Shen level (int)")
+    p_dtree.add_argument("--passphrase", help="Passphrase (omit to prompt)")
+    p_dtree.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+
     p_ins = sub.add_parser("inspect", help="Inspect envelope header")
     p_ins.add_argument("path", help="Encrypted file (.gcrypt)")
 
@@ -317,12 +980,24 @@ def main():
         if args.cmd == "encrypt":
             out = encrypt_file(
                 cfg, args.path, args.out, args.sp, args.shen, args.passphrase,
-                sp_gate=args.gate, min_shen_level=args.min_shen
+                sp_gate=args.gate, min_shen_level=args.min_shen,
+                chunk_bytes=args.chunk_bytes, armor=args.armor
             )
             print(f"✅ Encrypted: {out}")
         elif args.cmd == "decrypt":
             out = decrypt_file(cfg, args.path, args.out, args.sp, args.shen, args.passphrase)
             print(f"✅ Decrypted → {out}")
+        elif args.cmd == "encrypt-tree":
+            stats = encrypt_tree(
+                cfg, args.path, args.sp, args.shen, args.passphrase,
+                sp_gate=args.gate, min_shen_level=args.min_shen,
+                chunk_bytes=args.chunk_bytes, armor=args.armor, workers=args.workers
+            )
+            sys.exit(print_tree_stats("Encrypted", stats))
+        elif args.cmd == "decrypt-tree":
+            stats = decrypt_tree(cfg, args.path, args.sp, args.shen, args.passphrase,
+                                 workers=args.workers)
+            sys.exit(print_tree_stats("Decrypted", stats))
         elif args.cmd == "inspect":
             sys.exit(inspect_envelope(args.path))
         else:
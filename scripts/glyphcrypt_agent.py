@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+GlyphCrypt key agent
+- Caches PBKDF2-derived keys in memory so repeated decrypts skip the KDF
+- Keyed by (sp_id, shen_level, salt, iterations, hash); entries expire after a TTL
+- Keys live in bytearrays and are zeroed on eviction, flush and shutdown
+- Unix socket only, in a 0700 directory; peers with another uid are refused
+
+Usage:
+  # Run the agent (foreground; background it with & or a service manager)
+  ./scripts/glyphcrypt_agent.py serve [--ttl 900]
+
+  # Inspect / flush / stop
+  ./scripts/glyphcrypt_agent.py status
+  ./scripts/glyphcrypt_agent.py flush
+  ./scripts/glyphcrypt_agent.py stop
+
+Notes:
+- glyphcrypt.py decrypt uses the agent automatically when its socket exists
+  (defaults.agent.enabled in GlyphCrypt.yaml). Only keys that successfully
+  authenticated an envelope are stored.
+- Nothing is ever written to disk. Override the socket with GLYPHCRYPT_AGENT_SOCK.
+"""
+
+import argparse
+import base64
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_TTL = 900
+CLIENT_TIMEOUT = 0.5
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def default_socket_path() -> str:
+    env = os.environ.get("GLYPHCRYPT_AGENT_SOCK")
+    if env:
+        return env
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"glyphcrypt-{os.getuid()}")
+    return os.path.join(base, "glyphcrypt-agent.sock")
+
+
+def cache_id(sp_id: str, shen_level: int, salt: bytes, iterations: int, hash_name: str) -> str:
+    return json.dumps([sp_id, int(shen_level), base64.b64encode(salt).decode(), int(iterations), hash_name.upper()])
+
+
+def zero(buf: bytearray):
+    buf[:] = bytes(len(buf))
+
+
+class KeyAgent:
+    def __init__(self, sock_path: str, ttl: int = DEFAULT_TTL):
+        self.sock_path = sock_path
+        self.ttl = ttl
+        self.keys: Dict[str, Tuple[bytearray, float]] = {}
+        self.running = False
+        self.hits = 0
+        self.misses = 0
+
+    # --- cache -------------------------------------------------------------
+    def evict(self, cid: str):
+        entry = self.keys.pop(cid, None)
+        if entry is not None:
+            zero(entry[0])
+
+    def sweep(self):
+        now = time.monotonic()
+        for cid in [c for c, (_, exp) in self.keys.items() if exp <= now]:
+            self.evict(cid)
+
+    def flush(self):
+        for cid in list(self.keys):
+            self.evict(cid)
+
+    def handle(self, req: dict) -> dict:
+        self.sweep()
+        op = req.get("op")
+        if op == "get":
+            entry = self.keys.get(req.get("id"))
+            if entry is None:
+                self.misses += 1
+                return {"ok": True, "key_b64": None}
+            self.hits += 1
+            return {"ok": True, "key_b64": base64.b64encode(bytes(entry[0])).decode()}
+        if op == "put":
+            cid = req.get("id")
+            self.evict(cid)
+            self.keys[cid] = (bytearray(base64.b64decode(req["key_b64"])), time.monotonic() + self.ttl)
+            return {"ok": True}
+        if op == "status":
+            return {"ok": True, "entries": len(self.keys), "ttl": self.ttl,
+                    "hits": self.hits, "misses": self.misses, "pid": os.getpid()}
+        if op == "flush":
+            self.flush()
+            return {"ok": True}
+        if op == "stop":
+            self.running = False
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    # --- socket ------------------------------------------------------------
+    def peer_allowed(self, conn: socket.socket) -> bool:
+        if not hasattr(socket, "SO_PEERCRED"):
+            return True
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", creds)
+        return uid == os.getuid()
+
+    def serve(self):
+        sock_dir = os.path.dirname(self.sock_path)
+        os.makedirs(sock_dir, mode=0o700, exist_ok=True)
+        if AgentClient(self.sock_path).request({"op": "status"}) is not None:
+            raise RuntimeError(f"An agent is already listening on {self.sock_path}")
+        if os.path.exists(self.sock_path):
+            os.remove(self.sock_path)
+
+        srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            srv.bind(self.sock_path)
+        finally:
+            os.umask(old_umask)
+        srv.listen(16)
+        srv.settimeout(1.0)
+        self.running = True
+
+        def _stop(signum, frame):
+            self.running = False
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+        try:
+            while self.running:
+                self.sweep()
+                try:
+                    conn, _ = srv.accept()
+                except socket.timeout:
+                    continue
+                except InterruptedError:
+                    continue
+                with conn:
+                    conn.settimeout(CLIENT_TIMEOUT)
+                    try:
+                        if not self.peer_allowed(conn):
+                            continue
+                        line = conn.makefile("rb").readline(MAX_REQUEST_BYTES)
+                        resp = self.handle(json.loads(line.decode("utf-8")))
+                    except Exception as e:
+                        resp = {"ok": False, "error": str(e)}
+                    try:
+                        conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+                    except OSError:
+                        pass
+        finally:
+            self.flush()
+            srv.close()
+            if os.path.exists(self.sock_path):
+                os.remove(self.sock_path)
+
+
+class AgentClient:
+    """Best-effort client: every call returns None when no agent is reachable."""
+
+    def __init__(self, sock_path: Optional[str] = None):
+        self.sock_path = sock_path or default_socket_path()
+
+    def request(self, req: dict) -> Optional[dict]:
+        if not os.path.exists(self.sock_path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.settimeout(CLIENT_TIMEOUT)
+                s.connect(self.sock_path)
+                s.sendall(json.dumps(req).encode("utf-8") + b"\n")
+                line = s.makefile("rb").readline(MAX_REQUEST_BYTES)
+            resp = json.loads(line.decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+        return resp if resp.get("ok") else None
+
+    def get(self, sp_id: str, shen_level: int, salt: bytes, iterations: int, hash_name: str) -> Optional[bytes]:
+        resp = self.request({"op": "get", "id": cache_id(sp_id, shen_level, salt, iterations, hash_name)})
+        if not resp or not resp.get("key_b64"):
+            return None
+        return base64.b64decode(resp["key_b64"])
+
+    def put(self, sp_id: str, shen_level: int, salt: bytes, iterations: int, hash_name: str, key: bytes) -> bool:
+        resp = self.request({
+            "op": "put",
+            "id": cache_id(sp_id, shen_level, salt, iterations, hash_name),
+            "key_b64": base64.b64encode(key).decode(),
+        })
+        return resp is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="glyphcrypt-agent", description="GlyphCrypt key agent")
+    parser.add_argument("--socket", default=None, help="Socket path (default: $GLYPHCRYPT_AGENT_SOCK or runtime dir)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="Run the agent in the foreground")
+    p_serve.add_argument("--ttl", type=int, default=DEFAULT_TTL, help="Seconds a derived key stays cached")
+    sub.add_parser("status", help="Show cache statistics")
+    sub.add_parser("flush", help="Zero and drop all cached keys")
+    sub.add_parser("stop", help="Stop the agent")
+    args = parser.parse_args()
+
+    sock_path = args.socket or default_socket_path()
+    if args.cmd == "serve":
+        try:
+            print(f"🔑 GlyphCrypt agent listening on {sock_path} (ttl={args.ttl}s)")
+            KeyAgent(sock_path, ttl=args.ttl).serve()
+        except RuntimeError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    resp = AgentClient(sock_path).request({"op": args.cmd})
+    if resp is None:
+        print(f"❌ No agent reachable at {sock_path}", file=sys.stderr)
+        sys.exit(1)
+    if args.cmd == "status":
+        resp.pop("ok", None)
+        print(json.dumps(resp, indent=2))
+    else:
+        print(f"✅ {args.cmd}: ok")
+
+
+if __name__ == "__main__":
+    main()
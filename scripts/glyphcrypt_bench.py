@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: GlyphCrypt pre-transform engines.
+Compares the original per-entry str.replace loop with the compiled
+single-pass GlyphTransform on real Codex text, on the Codex files with no
+glyph and no code letter in them (GlyphTransform's fast path), and on a
+glyph-dense synthetic text, and checks both directions round-trip.
+
+Usage:
+  python3 scripts/glyphcrypt_bench.py [--size-kb 1024] [--repeat 5] [--config Codex/System/GlyphCrypt.yaml]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import glyphcrypt  # noqa: E402
+
+
+def legacy_pre_transform(text, glyph_map, invert=False):
+    """The original implementation: one full str.replace pass per glyph_map entry."""
+    if not glyph_map:
+        return text
+    if invert:
+        rev = {v: k for k, v in glyph_map.items()}
+        for k, v in rev.items():
+            text = text.replace(k, v)
+        return text
+    for k, v in glyph_map.items():
+        text = text.replace(k, v)
+    return text
+
+
+def codex_text(size_kb):
+    """Real Codex Markdown/YAML, repeated up to size_kb."""
+    paths = sorted(glob.glob(os.path.join(glyphcrypt.REPO_ROOT, "Codex", "**", "*.*"), recursive=True))
+    corpus = "".join(
+        open(p, encoding="utf-8").read() for p in paths if p.endswith((".md", ".yaml", ".yml"))
+    )
+    reps = max(1, (size_kb * 1024) // max(len(corpus), 1))
+    return corpus * reps
+
+
+def plain_text(glyph_map, size_kb):
+    """Codex files that take GlyphTransform's fast path in both directions, repeated up to size_kb."""
+    probes = set(glyphcrypt.get_glyph_transform(glyph_map).probes or ())
+    probes |= set(glyphcrypt.get_glyph_transform(glyph_map, invert=True).probes or ())
+    paths = sorted(glob.glob(os.path.join(glyphcrypt.REPO_ROOT, "Codex", "**", "*.*"), recursive=True))
+    texts = (open(p, encoding="utf-8").read() for p in paths if p.endswith((".md", ".yaml", ".yml")))
+    corpus = "".join(t for t in texts if not any(p in t for p in probes))
+    reps = max(1, (size_kb * 1024) // max(len(corpus), 1))
+    return corpus * reps
+
+
+def dense_text(glyph_map, size_kb, seed=7):
+    """Synthetic worst case: roughly every tenth token is a glyph or a literal code."""
+    rnd = random.Random(seed)
+    words = ["spiral", "codex", "harmony", "resonance", "law", "shen", "\n"]
+    words += list(glyph_map.keys()) + list(glyph_map.values())[:2]
+    out, n = [], 0
+    while n < size_kb * 1024:
+        w = rnd.choice(words)
+        out.append(w)
+        n += len(w) + 1
+    return " ".join(out)
+
+
+def scaled_map(glyph_map, entries):
+    """glyph_map padded with synthetic private-use glyphs up to `entries` entries."""
+    scaled = dict(glyph_map)
+    i = 0
+    while len(scaled) < entries:
+        scaled.setdefault(chr(0xF000 + i), f"G-Synthetic-{i:03d}")
+        i += 1
+    return scaled
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=glyphcrypt.DEFAULT_CFG)
+    ap.add_argument("--size-kb", type=int, default=1024)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--scale-entries", type=int, default=64,
+                    help="Also time a glyph_map padded to this many entries")
+    args = ap.parse_args()
+
+    glyph_map = glyphcrypt.load_config(args.config).get("glyph_map", {}) or {}
+    codex = codex_text(args.size_kb)
+    cases = [
+        ("codex", glyph_map, codex),
+        ("plain", glyph_map, plain_text(glyph_map, args.size_kb)),
+        ("dense", glyph_map, dense_text(glyph_map, args.size_kb)),
+    ]
+    if args.scale_entries > len(glyph_map):
+        cases.append((f"codex, {args.scale_entries}-entry map", scaled_map(glyph_map, args.scale_entries), codex))
+
+    all_ok = True
+    for label, glyph_map, text in cases:
+        sealed = glyphcrypt.pre_transform(text, glyph_map)
+        legacy_sealed = legacy_pre_transform(text, glyph_map)
+        rows = [
+            ("forward", lambda: legacy_pre_transform(text, glyph_map),
+             lambda: glyphcrypt.pre_transform(text, glyph_map)),
+            ("inverse", lambda: legacy_pre_transform(legacy_sealed, glyph_map, invert=True),
+             lambda: glyphcrypt.pre_transform(sealed, glyph_map, invert=True)),
+        ]
+
+        print(f"[{label}] {len(text)} chars, {len(glyph_map)} glyph_map entries")
+        for name, legacy, compiled in rows:
+            t_old = best_of(legacy, args.repeat)
+            t_new = best_of(compiled, args.repeat)
+            print(f"  {name:8s} legacy {t_old * 1e3:8.2f} ms   compiled {t_new * 1e3:8.2f} ms   "
+                  f"x{t_old / max(t_new, 1e-12):.2f}")
+
+        legacy_ok = legacy_pre_transform(legacy_sealed, glyph_map, invert=True) == text
+        compiled_ok = glyphcrypt.pre_transform(sealed, glyph_map, invert=True) == text
+        all_ok = all_ok and compiled_ok
+        print(f"  round-trip: legacy={'ok' if legacy_ok else 'LOSSY'} "
+              f"compiled={'ok' if compiled_ok else 'LOSSY'}")
+    sys.exit(0 if all_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,15 @@ Inject FCP counters into Codex/SPs/*.yaml:
     fcp_trigger_count: 0
 Idempotent; preserves existing values.
 """
-import sys, glob
+import os, sys, glob
 from pathlib import Path
 try: import yaml
 except Exception: print("PyYAML required (pip install pyyaml)"); sys.exit(1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 def ensure_fields(p:Path):
-    data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    data = codex.load_yaml(p) or {}
     shen = data.get("shen") or {}
     if "last_fcp_trigger" not in shen: shen["last_fcp_trigger"] = None
     if "fcp_trigger_count" not in shen: shen["fcp_trigger_count"] = 0
@@ -1,29 +1,357 @@
 #!/usr/bin/env python3
 """
 Audit Chain Verify:
-Placeholder integrity checker for QSecure/GlyphCrypt chain over audits + reports.
-Currently: hashes files and prints a digest list (for CI diffing).
+Append-only Merkle log (RFC 6962 hashing) over Codex/Core/*Audit.yaml and reports/*.{json,md}.
+
+Each run stats the tracked files, re-hashes only those whose (size, mtime_ns) changed,
+appends one leaf per new/changed/deleted file, and appends a signed tree head. The new
+head is checked against the previous one with a consistency proof, so a rewritten history
+fails the run. Inclusion and consistency proofs cost O(log n) stored subtree hashes, and
+--prove reads its leaf record with one seek through leaves.idx.
+reports/Audit_Chain_Digests.md is still written for CI diffing.
+
+State (reports/audit_chain/):
+  state.json      path -> {size, mtime_ns, sha256, leaf}; the stat cache
+  leaves.jsonl    leaf records in log order: {path, size, mtime_ns, sha256} (sha256 null = deleted)
+  leaves.idx      8-byte big-endian offset of each leaf's line in leaves.jsonl; rebuilt when behind
+  level-K.bin     32-byte hashes of the complete 2^K-leaf subtrees, in order (level-0 = leaf hashes)
+  heads.jsonl     signed tree heads: {size, root, ts, sig}
+Heads are signed with HMAC-SHA256 under $HARMONY_AUDIT_KEY (hex) or .qsecure/keys/audit_chain.key,
+created on first use.
+
+Usage:
+  python3 scripts/lint/audit_chain_verify.py                  # update the log, verify, write digests
+  python3 scripts/lint/audit_chain_verify.py --full           # re-hash every file regardless of stat
+  python3 scripts/lint/audit_chain_verify.py --prove PATH     # inclusion proof for PATH's latest leaf
+  python3 scripts/lint/audit_chain_verify.py --consistency N  # proof from the head of size N to the latest
+  python3 scripts/lint/audit_chain_verify.py --audit          # recompute the whole tree from leaves.jsonl, check every level
 """
-import sys, hashlib, glob
+import sys, os, json, hmac, hashlib, glob, argparse, secrets, struct
+from datetime import datetime, timezone
 from pathlib import Path
 
+LOG_DIR = Path("reports/audit_chain")
+DIGESTS = Path("reports/Audit_Chain_Digests.md")
+KEY_PATH = Path(".qsecure/keys/audit_chain.key")
+
+def targets():
+    found = glob.glob("Codex/Core/*Audit.yaml") + glob.glob("reports/*.json") + glob.glob("reports/*.md")
+    return sorted(t for t in found if Path(t) != DIGESTS)
+
 def digest(p:Path):
     h=hashlib.sha256()
     with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""): h.update(chunk)
+        for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
     return h.hexdigest()
 
+# === MERKLE HASHING (RFC 6962 §2.1) ===
+
+def leaf_hash(record:dict) -> bytes:
+    data = json.dumps(record, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(b"\x00" + data).digest()
+
+def node_hash(left:bytes, right:bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def split(n:int) -> int:
+    """Largest power of two strictly less than n."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+class MerkleLog:
+    def __init__(self, root:Path=LOG_DIR, levels:list=None):
+        self.root = root
+        self.levels = levels if levels is not None else []
+        if levels is not None:
+            return
+        k = 0
+        while (root / f"level-{k}.bin").exists():
+            raw = (root / f"level-{k}.bin").read_bytes()
+            self.levels.append([raw[i:i + 32] for i in range(0, len(raw) - len(raw) % 32, 32)])
+            k += 1
+        if not self.levels:
+            self.levels = [[]]
+
+    @property
+    def size(self):
+        return len(self.levels[0])
+
+    def append(self, record:dict):
+        """Add a leaf; completes at most one subtree per level, so O(log n) hashes and writes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        idx = self.offset_index()
+        with (self.root / "leaves.jsonl").open("ab") as f:
+            offset = f.tell()
+            f.write((json.dumps(record, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8"))
+        with idx.open("ab") as f:
+            f.write(struct.pack(">Q", offset))
+        h, k = leaf_hash(record), 0
+        while True:
+            if k == len(self.levels):
+                self.levels.append([])
+            self.levels[k].append(h)
+            with (self.root / f"level-{k}.bin").open("ab") as f:
+                f.write(h)
+            if len(self.levels[k]) % 2:
+                return self.size - 1
+            h, k = node_hash(self.levels[k][-2], self.levels[k][-1]), k + 1
+
+    def offset_index(self) -> Path:
+        """leaves.idx, rebuilt with one scan of leaves.jsonl if it has fewer entries than the tree (older logs)."""
+        idx, p = self.root / "leaves.idx", self.root / "leaves.jsonl"
+        if (idx.stat().st_size // 8 if idx.exists() else 0) < self.size and p.exists():
+            offsets, pos = [], 0
+            with p.open("rb") as f:
+                for line in f:
+                    offsets.append(pos); pos += len(line)
+            idx.write_bytes(b"".join(struct.pack(">Q", o) for o in offsets[:self.size]))
+        return idx
+
+    def leaf(self, index:int):
+        """The record appended as leaf `index` (state.json's stat cache may have moved on): one seek, no scan."""
+        idx = self.offset_index()
+        if not 0 <= index < self.size or not idx.exists():
+            return None
+        with idx.open("rb") as f:
+            f.seek(8 * index)
+            raw = f.read(8)
+        if len(raw) < 8:
+            return None
+        with (self.root / "leaves.jsonl").open("rb") as f:
+            f.seek(struct.unpack(">Q", raw)[0])
+            line = f.readline()
+        return json.loads(line) if line.strip() else None
+
+    def subtree(self, start:int, end:int) -> bytes:
+        """MTH(D[start:end]); complete aligned subtrees are a stored lookup."""
+        n = end - start
+        if n == 0:
+            return hashlib.sha256(b"").digest()
+        if n & (n - 1) == 0 and start % n == 0:
+            return self.levels[n.bit_length() - 1][start // n]
+        k = split(n)
+        return node_hash(self.subtree(start, start + k), self.subtree(start + k, end))
+
+    def root_hash(self, size:int=None) -> bytes:
+        return self.subtree(0, self.size if size is None else size)
+
+    def inclusion_proof(self, index:int, size:int) -> list:
+        def path(m, start, end):
+            if end - start == 1:
+                return []
+            k = split(end - start)
+            if m < k:
+                return path(m, start, start + k) + [self.subtree(start + k, end)]
+            return path(m - k, start + k, end) + [self.subtree(start, start + k)]
+        return path(index, 0, size)
+
+    def consistency_proof(self, old:int, new:int) -> list:
+        def subproof(m, start, end, complete):
+            n = end - start
+            if m == n:
+                return [] if complete else [self.subtree(start, end)]
+            k = split(n)
+            if m <= k:
+                return subproof(m, start, start + k, complete) + [self.subtree(start + k, end)]
+            return subproof(m - k, start + k, end, False) + [self.subtree(start, start + k)]
+        return subproof(old, 0, new, True) if 0 < old < new else []
+
+def verify_inclusion(leaf:bytes, index:int, size:int, proof:list, root:bytes) -> bool:
+    """RFC 9162 §2.1.3.2."""
+    if index >= size:
+        return False
+    fn, sn, r = index, size - 1, leaf
+    for p in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn:
+                fn >>= 1; sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1; sn >>= 1
+    return sn == 0 and r == root
+
+def verify_consistency(old:int, new:int, old_root:bytes, new_root:bytes, proof:list) -> bool:
+    """RFC 9162 §2.1.4.2."""
+    if old == new:
+        return not proof and old_root == new_root
+    if old == 0:
+        return not proof
+    if old > new:
+        return False
+    if old & (old - 1) == 0:
+        proof = [old_root] + list(proof)
+    if not proof:
+        return False
+    fn, sn = old - 1, new - 1
+    while fn & 1:
+        fn >>= 1; sn >>= 1
+    fr = sr = proof[0]
+    for c in proof[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr, sr = node_hash(c, fr), node_hash(c, sr)
+            while not fn & 1 and fn:
+                fn >>= 1; sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1; sn >>= 1
+    return sn == 0 and fr == old_root and sr == new_root
+
+# === SIGNED TREE HEADS ===
+
+def signing_key() -> bytes:
+    env = os.environ.get("HARMONY_AUDIT_KEY")
+    if env:
+        return bytes.fromhex(env)
+    if not KEY_PATH.exists():
+        KEY_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+    return bytes.fromhex(KEY_PATH.read_text().strip())
+
+def sign_head(key:bytes, size:int, root:str, ts:str) -> str:
+    return hmac.new(key, f"{size}\n{root}\n{ts}".encode(), hashlib.sha256).hexdigest()
+
+def load_heads(root:Path=LOG_DIR) -> list:
+    p = root / "heads.jsonl"
+    if not p.exists(): return []
+    return [json.loads(line) for line in p.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+def check_head(key:bytes, head:dict) -> bool:
+    return hmac.compare_digest(head.get("sig", ""), sign_head(key, head["size"], head["root"], head["ts"]))
+
+# === COMMANDS ===
+
+def update(log:MerkleLog, full:bool=False):
+    """Append leaves for files that changed since the last run; returns the number appended."""
+    state_path = log.root / "state.json"
+    state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+    appended = 0
+    current = targets()
+    for t in current:
+        st = os.stat(t)
+        prev = state.get(t)
+        if prev and not full and (prev["size"], prev["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+            continue
+        sha = digest(Path(t))
+        if prev and prev["sha256"] == sha:
+            prev.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            continue
+        record = {"path": t, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+        state[t] = dict(record, leaf=log.append(record)); appended += 1
+    for t in sorted(set(state) - set(current)):
+        log.append({"path": t, "size": None, "mtime_ns": None, "sha256": None})
+        del state[t]; appended += 1
+    log.root.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, state_path)
+    return appended, state
+
+def append_head(log:MerkleLog, key:bytes, heads:list) -> dict:
+    """Sign the current root; the previous head must be a prefix of this tree."""
+    root = log.root_hash().hex()
+    if heads and heads[-1]["size"] == log.size:
+        if heads[-1]["root"] != root:
+            raise SystemExit(f"FAIL: tree of size {log.size} no longer matches its signed head")
+        return heads[-1]
+    if heads:
+        prev = heads[-1]
+        proof = log.consistency_proof(prev["size"], log.size)
+        if not verify_consistency(prev["size"], log.size, bytes.fromhex(prev["root"]), bytes.fromhex(root), proof):
+            raise SystemExit(f"FAIL: log is not an extension of signed head size={prev['size']}")
+    ts = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    head = {"size": log.size, "root": root, "ts": ts, "sig": sign_head(key, log.size, root, ts)}
+    with (log.root / "heads.jsonl").open("a", encoding="utf-8") as f:
+        f.write(json.dumps(head) + "\n")
+    return head
+
+def write_digests(state:dict, head:dict):
+    lines=["# Audit Chain Digests\n", f"\nMerkle head: size={head['size']} · root={head['root']} · {head['ts']}\n\n"]
+    for t in sorted(state):
+        lines.append(f"- {t} · sha256={state[t]['sha256']} · leaf={state[t]['leaf']}\n")
+    DIGESTS.parent.mkdir(parents=True, exist_ok=True)
+    DIGESTS.write_text("".join(lines), encoding="utf-8")
+
+def prove(log:MerkleLog, head:dict, path:str) -> int:
+    state_path = log.root / "state.json"
+    entry = (json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}).get(path)
+    if not entry or entry["leaf"] >= head["size"]:
+        print(f"FAIL: {path} has no leaf in the signed tree"); return 1
+    record = log.leaf(entry["leaf"])
+    if not record or record.get("path") != path:
+        print(f"FAIL: leaf {entry['leaf']} in leaves.jsonl is not a record for {path}"); return 1
+    proof = log.inclusion_proof(entry["leaf"], head["size"])
+    ok = verify_inclusion(leaf_hash(record), entry["leaf"], head["size"], proof, bytes.fromhex(head["root"]))
+    print(json.dumps({"leaf": entry["leaf"], "record": record, "tree_size": head["size"], "root": head["root"],
+                      "proof": [p.hex() for p in proof], "verified": ok}, indent=2))
+    return 0 if ok else 1
+
+def consistency(log:MerkleLog, heads:list, old_size:int) -> int:
+    old = next((h for h in heads if h["size"] == old_size), None)
+    if old is None:
+        print(f"FAIL: no signed head of size {old_size}"); return 1
+    new = heads[-1]
+    proof = log.consistency_proof(old["size"], new["size"])
+    ok = verify_consistency(old["size"], new["size"], bytes.fromhex(old["root"]), bytes.fromhex(new["root"]), proof)
+    print(json.dumps({"old": old, "new": new, "proof": [p.hex() for p in proof], "verified": ok}, indent=2))
+    return 0 if ok else 1
+
+def audit(log:MerkleLog, heads:list, key:bytes) -> int:
+    """O(n): recompute the tree from leaves.jsonl, compare every stored level, check every signed head."""
+    p = log.root / "leaves.jsonl"
+    records = [json.loads(line) for line in p.read_text(encoding="utf-8").splitlines() if line.strip()] if p.exists() else []
+    levels = [[leaf_hash(r) for r in records]]
+    while len(levels[-1]) > 1:
+        below = levels[-1]
+        levels.append([node_hash(below[i], below[i + 1]) for i in range(0, len(below) - 1, 2)])
+    fresh = MerkleLog(None, levels)
+    errors = 0
+    for k in range(max(len(fresh.levels), len(log.levels))):
+        stored = log.levels[k] if k < len(log.levels) else []
+        expected = fresh.levels[k] if k < len(fresh.levels) else []
+        if stored != expected:
+            bad = next((i for i, (a, b) in enumerate(zip(stored, expected)) if a != b), min(len(stored), len(expected)))
+            print(f"FAIL: level-{k}.bin differs from leaves.jsonl at entry {bad} "
+                  f"({len(stored)} stored, {len(expected)} expected)"); errors += 1
+    for h in heads:
+        if not check_head(key, h):
+            print(f"FAIL: bad signature on head size={h['size']}"); errors += 1
+        elif h["size"] > fresh.size or fresh.root_hash(h["size"]).hex() != h["root"]:
+            print(f"FAIL: head size={h['size']} does not match the leaves"); errors += 1
+    print(f"Audit: {fresh.size} leaves, {len(heads)} heads, {errors} errors")
+    return 1 if errors else 0
+
 def main():
-    targets = []
-    targets += glob.glob("Codex/Core/*Audit.yaml")
-    targets += glob.glob("reports/*.json")
-    targets += glob.glob("reports/*.md")
-    if not targets:
+    ap = argparse.ArgumentParser(description="Incremental Merkle log over audits and reports")
+    ap.add_argument("--full", action="store_true", help="re-hash every file, ignoring the stat cache")
+    ap.add_argument("--prove", metavar="PATH", help="print and verify an inclusion proof for PATH")
+    ap.add_argument("--consistency", type=int, metavar="SIZE", help="prove the head of SIZE is a prefix of the latest")
+    ap.add_argument("--audit", action="store_true", help="recompute the whole tree from leaves.jsonl")
+    args = ap.parse_args()
+
+    key = signing_key()
+    log = MerkleLog()
+    heads = load_heads()
+    if heads and not check_head(key, heads[-1]):
+        print(f"FAIL: latest tree head (size={heads[-1]['size']}) has a bad signature"); return 1
+    if args.audit:
+        return audit(log, heads, key)
+    if args.prove or args.consistency is not None:
+        if not heads:
+            print("FAIL: no signed tree head yet; run without arguments first"); return 1
+        return prove(log, heads[-1], args.prove) if args.prove else consistency(log, heads, args.consistency)
+
+    appended, state = update(log, full=args.full)
+    if not state and not heads:
         print("WARN: no audit/report files found"); return 0
-    lines=["# Audit Chain Digests\n"]
-    for t in sorted(targets):
-        lines.append(f"- {t} · sha256={digest(Path(t))}\n")
-    Path("reports/Audit_Chain_Digests.md").write_text("".join(lines), encoding="utf-8")
-    print("Wrote reports/Audit_Chain_Digests.md"); return 0
+    head = append_head(log, key, heads)
+    write_digests(state, head)
+    print(f"Audit chain: {appended} new leaves, size={head['size']} root={head['root'][:16]}… "
+          f"(wrote {DIGESTS})"); return 0
 
 if __name__=="__main__": sys.exit(main())
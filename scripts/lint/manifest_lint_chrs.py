@@ -3,17 +3,17 @@
 CHRS Manifest Lint:
 Ensures Seven Core Theories + FCP + QSecure + shen are mentioned in Codex/System/CHRS_Manifest.yaml
 """
-import sys
+import os, sys
 from pathlib import Path
-try: import yaml
-except Exception: print("PyYAML required"); sys.exit(1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SDK"))
+from harmony_cli import codex
 
 REQ_THEORIES = ["SDFT","SPRC","RCT","TRT","SPM","Echoverse","RRM"]
 
 def main():
     p = Path("Codex/System/CHRS_Manifest.yaml")
     if not p.exists(): print("WARN: CHRS_Manifest.yaml missing"); return 0
-    doc = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    doc = codex.load_yaml(p) or {}
     theories = doc.get("theories") or []
     missing=[t for t in REQ_THEORIES if t not in theories]
     errs=[]
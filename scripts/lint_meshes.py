@@ -1,6 +1,10 @@
 import os
+import sys
 import yaml
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
 MESHES_DIR = "Codex/Meshes"
 REQUIRED_KEYS = ["name", "title", "purpose", "features", "agents"]
 
@@ -12,13 +16,12 @@ def lint_and_repair_meshes():
             continue
 
         path = os.path.join(MESHES_DIR, filename)
-        with open(path, "r") as f:
-            try:
-                data = yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                print(f"❌ Invalid YAML: {filename} — {e}")
-                skipped += 1
-                continue
+        try:
+            data = codex.load_yaml(path)
+        except yaml.YAMLError as e:
+            print(f"❌ Invalid YAML: {filename} — {e}")
+            skipped += 1
+            continue
 
         if not isinstance(data, dict):
             print(f"⚠️ Skipping non-dict YAML: {filename}")
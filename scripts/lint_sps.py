@@ -1,6 +1,10 @@
 import os
+import sys
 import yaml
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
 # Corrected path
 sps_dir = "codex/sps"
 report = []
@@ -12,8 +16,7 @@ for filename in os.listdir(sps_dir):
     if filename.endswith(".yaml"):
         filepath = os.path.join(sps_dir, filename)
         try:
-            with open(filepath, 'r') as file:
-                data = yaml.safe_load(file)
+            data = codex.load_yaml(filepath)
 
             if not isinstance(data, dict):
                 report.append(f"⚠️ Skipping non-dict YAML: {filename}")
@@ -1,16 +1,40 @@
 import psycopg2
 from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
+from contextlib import contextmanager
+import atexit
 import os
+import sys
+import threading
 from datetime import datetime
 import uuid
 
 # Load .env environment variables
 load_dotenv()
 
-# Connect to PostgreSQL
-def get_db_connection():
-    return psycopg2.connect(
+# Buffered writer thresholds (HARMONY_LOG_BUFFERED=0 writes every event immediately)
+BUFFERED = os.getenv("HARMONY_LOG_BUFFERED", "1") != "0"
+BATCH_ROWS = int(os.getenv("HARMONY_LOG_BATCH_ROWS", "500"))
+FLUSH_SECONDS = float(os.getenv("HARMONY_LOG_FLUSH_SECONDS", "2.0"))
+MAX_RETRIES = int(os.getenv("HARMONY_LOG_MAX_RETRIES", "3"))
+POOL_MAX = int(os.getenv("PG_POOL_MAX", "8"))
+
+# Buffered tables and their insert columns (sessions are written immediately)
+TABLES = {
+    "codex_events": ("event_id", "session_id", "codex_path", "event_type",
+                     "glyph_signature", "encrypted_data", "timestamp"),
+    "sp_interactions": ("interaction_id", "session_id", "sp_name", "input",
+                        "response", "glyph_resonance", "timestamp"),
+    "audit_logs": ("log_id", "component", "action", "result", "timestamp"),
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _connect_kwargs():
+    return dict(
         dbname=os.getenv("PG_DBNAME"),
         user=os.getenv("PG_USER"),
         password=os.getenv("PG_PASSWORD"),
@@ -18,75 +42,250 @@ def get_db_connection():
         port=os.getenv("PG_PORT")
     )
 
-# 1. Log a Harmony session
+
+# Connect to PostgreSQL (standalone connection; loggers below use the pool)
+def get_db_connection():
+    return psycopg2.connect(**_connect_kwargs())
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadedConnectionPool(1, POOL_MAX, **_connect_kwargs())
+        return _pool
+
+
+@contextmanager
+def pooled_connection():
+    """Borrow a pooled connection; commits on success, rolls back on error. Broken connections are closed."""
+    pool = get_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except Exception as e:
+        broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        raise
+    finally:
+        pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+def _insert_rows(conn, table, rows):
+    cols = TABLES[table]
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            f"INSERT INTO {table} ({', '.join(cols)}) VALUES %s",
+            rows,
+            page_size=max(len(rows), 1),
+        )
+
+
+def _insert_each(conn, table, rows):
+    """Insert rows one by one, each under a savepoint; returns [(row, error)] for the rows that failed."""
+    failed = []
+    with conn.cursor() as cur:
+        for row in rows:
+            cur.execute("SAVEPOINT harmony_row")
+            try:
+                _insert_rows(conn, table, [row])
+            except psycopg2.Error as e:
+                cur.execute("ROLLBACK TO SAVEPOINT harmony_row")
+                failed.append((row, e))
+            else:
+                cur.execute("RELEASE SAVEPOINT harmony_row")
+    return failed
+
+
+class EventBuffer:
+    """
+    Per-table row buffer flushed with one execute_values per table when
+    BATCH_ROWS rows are pending, every FLUSH_SECONDS from a daemon thread,
+    on flush(), and at interpreter exit.
+    A failed flush keeps its rows for the next one; after max_retries failures
+    in a row the rows are written one by one and only those that still fail
+    (bad data, FK violations, or all of them if the server is down) are dropped.
+    """
+
+    def __init__(self, batch_rows=BATCH_ROWS, flush_seconds=FLUSH_SECONDS, max_retries=MAX_RETRIES):
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.max_retries = max_retries
+        self.failures = 0
+        self.dropped = 0
+        self.rows = {table: [] for table in TABLES}
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def append(self, table, row):
+        with self.lock:
+            self.rows[table].append(row)
+            self.pending += 1
+            full = self.pending >= self.batch_rows
+            if self.thread is None and self.flush_seconds > 0:
+                self.thread = threading.Thread(target=self._run, name="harmony-log-flush", daemon=True)
+                self.thread.start()
+        if full:
+            try:
+                self.flush()
+            except Exception as e:
+                # The row is queued; a retry by the caller would log it twice
+                print(f"⚠️ Harmony log flush failed (will retry): {e}", file=sys.stderr)
+
+    def flush(self, final=False):
+        """Write the buffered rows. final=True (close) salvages a failed batch instead of keeping it."""
+        with self.flush_lock:
+            with self.lock:
+                batch = {t: rows for t, rows in self.rows.items() if rows}
+                self.rows = {table: [] for table in TABLES}
+                self.pending = 0
+            if not batch:
+                return
+            try:
+                # One transaction per flush
+                with pooled_connection() as conn:
+                    for table in TABLES:
+                        if table in batch:
+                            _insert_rows(conn, table, batch[table])
+                self.failures = 0
+                return
+            except Exception as e:
+                self.failures += 1
+                if not final and self.failures <= self.max_retries:
+                    # Put unwritten rows back in front of anything logged meanwhile
+                    with self.lock:
+                        for table, rows in batch.items():
+                            self.rows[table][:0] = rows
+                            self.pending += len(rows)
+                    raise
+                error = e
+            attempts, self.failures = self.failures, 0
+            self._salvage(batch, error, attempts)
+
+    def _salvage(self, batch, error, attempts):
+        """Last attempt for a batch that failed its flushes: row by row, dropping the rows that fail."""
+        total = sum(len(rows) for rows in batch.values())
+        try:
+            with pooled_connection() as conn:
+                failed = [f for table in TABLES if table in batch for f in _insert_each(conn, table, batch[table])]
+            if failed:
+                error = failed[0][1]
+            dropped = len(failed)
+        except Exception as e:
+            dropped, error = total, e
+        if dropped:
+            self.dropped += dropped
+            print(f"⚠️ Harmony log: dropped {dropped} of {total} rows after {attempts} failed flushes: {error}",
+                  file=sys.stderr)
+
+    def close(self):
+        """Stop the flush thread, then write what is left; a batch that fails is salvaged, never re-raised."""
+        self.wake.set()
+        thread, self.thread = self.thread, None
+        if thread is not None:
+            # Let an in-flight flush finish with the pool still open
+            thread.join()
+        self.flush(final=True)
+
+    def _run(self):
+        while not self.wake.wait(self.flush_seconds):
+            if self.pending:
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"⚠️ Harmony log flush failed (will retry): {e}", file=sys.stderr)
+
+
+_buffer = EventBuffer()
+
+
+def _log_row(table, row):
+    if BUFFERED:
+        _buffer.append(table, row)
+    else:
+        with pooled_connection() as conn:
+            _insert_rows(conn, table, [row])
+
+
+def flush():
+    """Write all buffered events now."""
+    _buffer.flush()
+
+
+@contextmanager
+def batched():
+    """Group logging calls; everything buffered inside is written on exit."""
+    try:
+        yield _buffer
+    finally:
+        flush()
+
+
+def close():
+    """Flush pending events and close the connection pool."""
+    global _pool
+    try:
+        _buffer.close()
+    finally:
+        with _pool_lock:
+            if _pool is not None:
+                _pool.closeall()
+                _pool = None
+
+
+atexit.register(close)
+
+
+# 1. Log a Harmony session (written immediately: events reference it)
 def log_session(user_id, sp_id, shen_level=0, drift_score=0.0, start_time=None, end_time=None):
-    conn = get_db_connection()
-    cur = conn.cursor()
     session_id = str(uuid.uuid4())
-    cur.execute("""
-        INSERT INTO harmony_sessions (session_id, user_id, sp_id, shen_level, drift_score, start_time, end_time)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """, (
-        session_id, user_id, sp_id,
-        shen_level, drift_score,
-        start_time or datetime.utcnow(),
-        end_time
-    ))
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO harmony_sessions (session_id, user_id, sp_id, shen_level, drift_score, start_time, end_time)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (
+                session_id, user_id, sp_id,
+                shen_level, drift_score,
+                start_time or datetime.utcnow(),
+                end_time
+            ))
     return session_id  # ✅ Return the session ID
 
 # 2. Log a Codex event
 def log_codex_event(session_id, codex_path, event_type, glyph_signature, encrypted_data=None, timestamp=None):
-    conn = get_db_connection()
-    cur = conn.cursor()
     event_id = str(uuid.uuid4())
-    cur.execute("""
-        INSERT INTO codex_events (event_id, session_id, codex_path, event_type, glyph_signature, encrypted_data, timestamp)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """, (
+    _log_row("codex_events", (
         event_id, session_id, codex_path, event_type,
         glyph_signature, encrypted_data,
         timestamp or datetime.utcnow()
     ))
-    conn.commit()
-    cur.close()
-    conn.close()
     return event_id
 
 # 3. Log an SP interaction
 def log_sp_interaction(session_id, sp_name, input_text, response_text, glyph_resonance=None, timestamp=None):
-    conn = get_db_connection()
-    cur = conn.cursor()
     interaction_id = str(uuid.uuid4())
-    cur.execute("""
-        INSERT INTO sp_interactions (interaction_id, session_id, sp_name, input, response, glyph_resonance, timestamp)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """, (
+    _log_row("sp_interactions", (
         interaction_id, session_id, sp_name,
         input_text, response_text, glyph_resonance,
         timestamp or datetime.utcnow()
     ))
-    conn.commit()
-    cur.close()
-    conn.close()
     return interaction_id
 
 # 4. Log a general audit event
 def log_audit(component, action, result, timestamp=None):
-    conn = get_db_connection()
-    cur = conn.cursor()
     log_id = str(uuid.uuid4())
-    cur.execute("""
-        INSERT INTO audit_logs (log_id, component, action, result, timestamp)
-        VALUES (%s, %s, %s, %s, %s)
-    """, (
+    _log_row("audit_logs", (
         log_id, component, action, result,
         timestamp or datetime.utcnow()
     ))
-    conn.commit()
-    cur.close()
-    conn.close()
     return log_id
-
@@ -5,17 +5,19 @@ scripts/merge_daily_law_logs.py
 Merge Codex/Reflections/daily_law_logs into a weekly master log.
 """
 
-import os, glob, yaml
+import os, sys, glob, yaml
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
 # Constants
 DAILY_DIR   = "Codex/Reflections/daily_law_logs"
 MASTER_PATH = "Codex/Reflections/weekly_law_log.yaml"
 
 def load_yaml(path):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        return codex.load_yaml(path) or {}
     except Exception as e:
         print(f"⚠️  Error loading {path}: {e}")
         return {}
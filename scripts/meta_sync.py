@@ -1,8 +1,16 @@
 import os
+import sys
+import glob
 import hashlib
+import datetime
+import json
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 
-# Updated file paths relative to the Harmony project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
+# Named nodes, relative to the Harmony project root
 FILES_TO_TRACK = {
     "codex_taoica": "Codex/Theory/Codex_Taoica.md",
     "spirit_trials": "Codex/Core/Spirit_Trials.yaml",
@@ -11,49 +19,183 @@ FILES_TO_TRACK = {
     "taoic_law_8": "Codex/Laws/Law_8.yml"  # note the .yml extension
 }
 
+# Everything else matching these is tracked as a node whose id is its path.
+# MetaField.yaml may override the list with its own `track_patterns:`.
+TRACK_PATTERNS = ["Codex/**/*.yaml", "Codex/**/*.yml", "Codex/**/*.md"]
+
 META_PATH = "Codex/System/MetaField.yaml"
+# path -> {size, mtime_ns, hash}: lets unchanged files skip hashing. Kept out of MetaField.yaml,
+# which is in git, because mtimes differ per checkout.
+STAT_CACHE = ".cache/meta_sync.json"
+CHUNK_BYTES = 1 << 20
 
 def file_hash(path):
-    """Return SHA256 hash of the given file."""
+    """Return SHA256 hash of the given file, read in CHUNK_BYTES pieces."""
     h = hashlib.sha256()
     with open(path, "rb") as f:
-        h.update(f.read())
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            h.update(chunk)
     return h.hexdigest()
 
-def update_meta_field():
-    updated = False
+def tracked_files(patterns):
+    """{path: id} for the named nodes plus every file matching patterns (MetaField.yaml itself excluded)."""
+    tracked = {path: key for key, path in FILES_TO_TRACK.items()}
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            path = path.replace(os.sep, "/")
+            if path != META_PATH and os.path.isfile(path):
+                tracked.setdefault(path, path)
+    return tracked
+
+def load_stat_cache():
+    try:
+        with open(STAT_CACHE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
+def save_stat_cache(cache):
+    os.makedirs(os.path.dirname(STAT_CACHE), exist_ok=True)
+    tmp = STAT_CACHE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=0, sort_keys=True)
+    os.replace(tmp, STAT_CACHE)
+
+def write_meta(nodes, legacy_keys):
+    """Rewrite MetaField.yaml with this node list, round-tripping the rest (---, block scalars, spacing)."""
+    try:
+        from ruamel.yaml import YAML
+        from ruamel.yaml.comments import CommentedMap, CommentedSeq
+    except ImportError:
+        YAML = None
+    if YAML is None:
+        meta = codex.load_yaml(META_PATH) if os.path.exists(META_PATH) else {}
+        meta = meta or {}
+        for key in legacy_keys:
+            meta.pop(key, None)
+        meta["nodes"] = nodes
+        with open(META_PATH, "w", encoding="utf-8") as f:
+            yaml.safe_dump(meta, f, sort_keys=False, allow_unicode=True, explicit_start=True)
+        return
+    rt = YAML()
+    rt.preserve_quotes = True
+    rt.explicit_start = True
+    rt.width = 220
+    rt.indent(mapping=2, sequence=4, offset=2)
+    rt.representer.add_representer(type(None), lambda r, _: r.represent_scalar("tag:yaml.org,2002:null", "null"))
+    if os.path.exists(META_PATH):
+        with open(META_PATH, "r", encoding="utf-8") as f:
+            meta = rt.load(f)
+    else:
+        meta = None
+    if meta is None:
+        meta = CommentedMap()
+    for key in legacy_keys:
+        meta.pop(key, None)
+    # Keep the existing node mappings (and the comments/blank lines attached to them) in place
+    existing = {n.get("path"): n for n in meta.get("nodes") or [] if isinstance(n, dict)}
+    out, fresh = [], []
+    for node in nodes:
+        target = existing.get(node["path"])
+        if target is None:
+            fresh.append(len(out))
+            out.append(CommentedMap(node))
+            continue
+        for k in list(target):
+            if k not in node:
+                del target[k]
+        for k, v in node.items():
+            if target.get(k) != v:
+                target[k] = v
+        out.append(target)
+    if isinstance(meta.get("nodes"), CommentedSeq):
+        meta["nodes"][:] = out
+    else:
+        meta["nodes"] = CommentedSeq(out)
+    for i in fresh:  # a blank line before each new node, like the hand-written ones
+        meta["nodes"].yaml_set_comment_before_after_key(i, before="\n")
+    with open(META_PATH, "w", encoding="utf-8") as f:
+        rt.dump(meta, f)
+
+def update_meta_field():
     # Load existing meta field if it exists
     if os.path.exists(META_PATH):
-        with open(META_PATH, 'r') as f:
-            meta = yaml.safe_load(f) or {}
+        meta = codex.load_yaml(META_PATH) or {}
     else:
         meta = {}
 
-    for key, path in FILES_TO_TRACK.items():
-        if not os.path.exists(path):
-            print(f"[!] File not found for {key}: {path}")
+    nodes = {n["path"]: n for n in meta.get("nodes") or [] if isinstance(n, dict) and n.get("path")}
+    # Earlier versions of this script wrote {path, hash} at the top level
+    legacy_keys = [key for key in FILES_TO_TRACK if key in meta]
+    for key in legacy_keys:
+        legacy = meta[key]
+        if isinstance(legacy, dict) and legacy.get("path") and legacy["path"] not in nodes:
+            nodes[legacy["path"]] = {"id": key, "path": legacy["path"], "hash": legacy.get("hash")}
+    # ...and briefly stored stat fields in the nodes themselves
+    cleaned = False
+    for node in nodes.values():
+        for k in ("size", "mtime_ns"):
+            if k in node:
+                del node[k]
+                cleaned = True
+
+    cache = load_stat_cache()
+    tracked = tracked_files(meta.get("track_patterns") or TRACK_PATTERNS)
+    current, missing, stale = {}, [], []
+    for path, key in tracked.items():
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            missing.append((key, path))
             continue
+        entry = cache.get(path)
+        if entry and (entry.get("size"), entry.get("mtime_ns")) == (st.st_size, st.st_mtime_ns):
+            current[path] = entry["hash"]
+        else:
+            stale.append((path, st))
 
-        new_hash = file_hash(path)
-        current_hash = meta.get(key, {}).get("hash", "")
+    # Only files whose (size, mtime_ns) moved since the cache was written are read, hashed concurrently
+    with ThreadPoolExecutor() as pool:
+        hashes = pool.map(file_hash, [path for path, _ in stale])
+        for (path, st), new_hash in zip(stale, hashes):
+            cache[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": new_hash}
+            current[path] = new_hash
 
-        if new_hash != current_hash:
+    updated, added = [], []
+    for path, new_hash in current.items():
+        key = tracked[path]
+        node = nodes.get(path)
+        if node is None:
+            node = nodes[path] = {"id": key, "path": path, "hash": None, "last_synced": None, "shen_sync": False}
+            added.append(key)
+        if node.get("hash") != new_hash:
+            node["hash"] = new_hash
+            node["last_synced"] = datetime.datetime.now().isoformat()
+            updated.append(key)
             print(f"[+] Updated {key} with new hash.")
-            meta[key] = {
-                "path": path,
-                "hash": new_hash
-            }
-            updated = True
-        else:
-            print(f"[-] Skipped {key} — already synced.")
 
-    if updated:
-        with open(META_PATH, 'w') as f:
-            yaml.dump(meta, f, sort_keys=False)
-        print("\n✅ MetaField.yaml updated.")
+    for key, path in missing:
+        print(f"[!] File not found for {key}: {path}")
+    removed = [path for path, node in nodes.items()
+               if node.get("id") == path and path not in tracked]
+    for path in removed:
+        del nodes[path]
+        print(f"[-] Removed {path} — no longer present.")
+
+    # MetaField.yaml is only rewritten when a hash or the node set changed
+    if updated or removed or legacy_keys or cleaned:
+        write_meta(list(nodes.values()), legacy_keys)
+    dropped = [path for path in cache if path not in tracked]
+    for path in dropped:
+        del cache[path]
+    if stale or dropped:
+        save_stat_cache(cache)
+    print(f"\n{len(tracked)} tracked, {len(stale)} re-hashed, {len(updated)} changed "
+          f"({len(added)} new), {len(removed)} removed.")
+    if updated or removed or legacy_keys or cleaned:
+        print("✅ MetaField.yaml updated.")
     else:
-        print("\n✔ All files already synced. No changes.")
+        print("✔ All files already synced. No changes.")
 
 if __name__ == "__main__":
     update_meta_field()
@@ -2,6 +2,9 @@
 # scripts/migrate_shen_schema.py
 import os, sys, glob, yaml, datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 SP_DIR = os.path.join(ROOT, "Codex", "SPs")
 REPORT_PATH = os.path.join(ROOT, "reports", "shen_migration_report.txt")
@@ -80,9 +83,7 @@ def main():
 
     for path in sorted(glob.glob(os.path.join(SP_DIR, "*.yaml"))):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                text = f.read()
-            data = yaml.safe_load(text)
+            data = codex.load_yaml(path)
             if not isinstance(data, dict):
                 skipped.append((path, "not a YAML mapping"))
                 continue
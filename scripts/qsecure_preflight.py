@@ -7,12 +7,10 @@ Checks:
   - rotation aligned with FCP (align_with_fcp: true OR cycle_days: 7)
 Exit codes: 0 OK, 1 file missing/unreadable, 2 overlay off, 3 rotation misaligned if --strict-rotation
 """
-import argparse, sys
+import argparse, os, sys
 from pathlib import Path
-try:
-    import yaml
-except Exception:
-    print("ERROR: PyYAML is required (pip install pyyaml)", file=sys.stderr); sys.exit(1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 QSECURE = Path("Codex/System/QSecure.yaml")
 
@@ -24,7 +22,7 @@ def main():
     if not QSECURE.exists():
         print("ERROR: Codex/System/QSecure.yaml missing", file=sys.stderr); return 1
     try:
-        cfg = yaml.safe_load(QSECURE.read_text(encoding="utf-8")) or {}
+        cfg = codex.load_yaml(QSECURE) or {}
     except Exception as e:
         print(f"ERROR: Failed to read QSecure.yaml: {e}", file=sys.stderr); return 1
 
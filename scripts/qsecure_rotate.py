@@ -14,6 +14,8 @@ try:
 except ImportError:
     print("ERROR: PyYAML not installed. `pip install pyyaml`", file=sys.stderr)
     sys.exit(2)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 QSECURE_PATH = ROOT / "Codex" / "System" / "QSecure.yaml"
@@ -37,8 +39,7 @@ def load_qsecure():
             "rotation": {"frequency": "weekly"},
             "keys": [],
         }
-    with open(QSECURE_PATH, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = codex.load_yaml(QSECURE_PATH) or {}
     # defaults
     data.setdefault("scheme", "hybrid-pqc")
     data.setdefault("rotation_index", 0)
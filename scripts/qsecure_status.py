@@ -11,13 +11,13 @@ import argparse, json, os, sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-import yaml
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 CFG_PATH = Path("Codex/System/QSecure.yaml")
 
 def load_cfg(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return codex.load_yaml(path) or {}
 
 def iso_now():
     return datetime.now(timezone.utc)
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
-import argparse, json
+import argparse, json, os, sys
 from datetime import datetime, timezone
 from pathlib import Path
-try: import yaml
-except Exception: yaml=None
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SDK"))
+try: from harmony_cli import codex
+except Exception: codex=None
 
 CFG_PATH = Path("Codex/System/Quantum_CHRS.yaml")
 
@@ -13,9 +14,9 @@ def load_json(p:Path):
 
 def load_threshold():
     out={"fidelity_threshold": None}
-    if yaml and CFG_PATH.exists():
+    if codex and CFG_PATH.exists():
         try:
-            cfg = yaml.safe_load(CFG_PATH.read_text(encoding="utf-8")) or {}
+            cfg = codex.load_yaml(CFG_PATH) or {}
             qspm = (cfg.get("modules",{}) or {}).get("qSPM",{})
             out["fidelity_threshold"] = (qspm.get("collapse_policy",{}) or {}).get("fidelity_threshold")
         except Exception: pass
@@ -23,14 +24,21 @@ def load_threshold():
 
 def main():
     ap=argparse.ArgumentParser()
-    ap.add_argument("--belief", type=Path, required=True)
-    ap.add_argument("--entangle", type=Path, required=True)
-    ap.add_argument("--decoherence", type=Path, required=True)
+    ap.add_argument("--qsim", type=Path, help="combined output of qsim.py (replaces the three per-simulation files)")
+    ap.add_argument("--belief", type=Path)
+    ap.add_argument("--entangle", type=Path)
+    ap.add_argument("--decoherence", type=Path)
     ap.add_argument("--out-md", type=Path, required=True)
     ap.add_argument("--out-json", type=Path, required=True)
     a=ap.parse_args()
+    if not a.qsim and not (a.belief and a.entangle and a.decoherence):
+        ap.error("--qsim or all of --belief/--entangle/--decoherence required")
 
-    b, e, d = load_json(a.belief), load_json(a.entangle), load_json(a.decoherence)
+    if a.qsim:
+        q = load_json(a.qsim)
+        b, e, d = q.get("belief",{}), q.get("entangle",{}), q.get("decoherence",{})
+    else:
+        b, e, d = load_json(a.belief), load_json(a.entangle), load_json(a.decoherence)
     thr = load_threshold()
     ts = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+qsim — run every Quantum CHRS simulation in one process and print one JSON document.
+
+Circuits are simulated on the NumPy statevector backend (qsim_backend.py), batched: circuits
+with the same gate layout (qubit count, gate kinds and wiring) are stacked and every gate is
+applied to the whole batch at once, so a theta sweep of thousands of points is a single pass.
+
+Output sections:
+  belief       superpositional_belief: belief_norm, phase_coherence, statevector
+               (+ "sweep": per-theta rows with --sweep-theta)
+  entangle     entangled_multi_sp: entanglement_entropy, mutual_information, statevector
+  decoherence  decoherence_filtering (see qsim_decoherence_filtering.py)
+  circuits     one row per circuit spec given with --circuits
+The belief/entangle/decoherence sections carry the same keys as the per-script outputs,
+so gen_quantum_chrs_status.py --qsim reads them directly.
+
+Usage:
+  python3 scripts/quantum/qsim.py [--config Codex/System/Quantum_CHRS.yaml]
+      [--sweep-theta START:STOP:NUM] [--circuits specs.yaml] [--statevectors] > reports/.qsim.json
+
+Circuit specs (YAML config or --circuits list) look like
+  {n_qubits: 2, ops: [{type: h, target: 0}, {type: rz, target: 0, theta: "pi/3"}, {type: cx, control: 0, target: 1}]}
+with ops under `ops`, `unitary_ops` or `circuit` and the gate under `type` or `op`. Supported:
+h, x, y, z, rx, ry, rz, u/u3 (theta, phi, lam), cx/cnot. Angles are numbers or expressions
+over `pi`; only the belief sweep binds `theta`: --sweep-theta sweeps the belief circuit's
+`theta` expressions or, when no op mentions it, the theta of every rotation. An angle using
+`theta` anywhere else (the belief/entangle configs themselves, --circuits specs) is an error.
+"""
+import argparse, json, os, sys, time
+from pathlib import Path
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SDK"))
+from harmony_cli import codex
+from qsim_backend import (Job, bind_sweep, circuit_ops, compile_ops, config_node, evaluate, phase_coherence,
+                          reduced_density, run_jobs, statevector_repr, uses_theta, von_neumann)
+
+DEFAULT_CONFIG = "Codex/System/Quantum_CHRS.yaml"
+SECTIONS = {"belief": "superpositional_belief", "entangle": "entangled_multi_sp",
+            "decoherence": "decoherence_filtering"}
+BELL = [{"op": "h", "target": 0}, {"op": "cx", "control": 0, "target": 1}]
+
+# === METRICS ===
+
+def belief_metrics(psi):
+    return {"belief_norm": float(np.sum(np.abs(psi) ** 2)), "phase_coherence": float(phase_coherence(psi))}
+
+def entangle_metrics(psi, n, keep=None):
+    """Entropy of the qubits in keep; by default every qubit but 1, as qsim_entangled_sps.py."""
+    if keep is None:
+        keep = [q for q in range(n) if q != 1]
+    s_a = float(von_neumann(reduced_density(psi, n, keep))) if n > 1 else 0.0
+    return {"entanglement_entropy": s_a, "mutual_information": 2.0 * s_a}
+
+# === CONFIG ===
+
+def load_specs(path):
+    if str(path).endswith(".json"):
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    return codex.load_yaml(path)
+
+def parse_sweep(spec):
+    start, stop, num = spec.split(":")
+    return np.linspace(evaluate(start), evaluate(stop), int(num))
+
+def main():
+    ap = argparse.ArgumentParser(description="Batched Quantum CHRS simulations in one process")
+    ap.add_argument("--config", default=DEFAULT_CONFIG)
+    ap.add_argument("--sweep-theta", metavar="START:STOP:NUM", help="sweep the belief circuit, e.g. 0:2*pi:1000")
+    ap.add_argument("--circuits", type=Path, help="YAML/JSON list of extra circuit specs")
+    ap.add_argument("--statevectors", action="store_true", help="include statevectors for sweep and --circuits rows")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    sims = config_node(codex.load_yaml(args.config.split("::")[0]), "simulations")
+    belief_cfg = sims.get(SECTIONS["belief"]) or {}
+    entangle_cfg = sims.get(SECTIONS["entangle"]) or {}
+
+    jobs, names = [], []
+    def add(name, cfg, default=(), theta=None, n_default=1):
+        ops = compile_ops(circuit_ops(cfg, default))
+        if theta is None and uses_theta(ops):
+            ap.error(f"{name}: an angle uses theta, which only --sweep-theta binds (for the belief circuit)")
+        n = int(cfg.get("config", cfg).get("n_qubits", n_default))
+        jobs.append(Job(n, bind_sweep(ops) if theta is not None else ops, theta)); names.append(name)
+
+    add("belief", belief_cfg)
+    add("entangle", entangle_cfg, BELL, n_default=2)
+    thetas = parse_sweep(args.sweep_theta) if args.sweep_theta else None
+    if thetas is not None:
+        add("sweep", belief_cfg, theta=thetas)
+    extra = load_specs(args.circuits) if args.circuits else []
+    for i, spec in enumerate(extra):
+        add(spec.get("name") or f"--circuits[{i}]", spec, n_default=spec.get("n_qubits", 1))
+
+    states = run_jobs(jobs)
+    out = {}
+    belief = states[0]
+    out["belief"] = dict(belief_metrics(belief), statevector=statevector_repr(belief))
+    n_ent = jobs[1].n
+    out["entangle"] = dict(entangle_metrics(states[1], n_ent), statevector=statevector_repr(states[1]))
+    if thetas is not None:
+        sweep = states[2]
+        norms, coh = np.sum(np.abs(sweep) ** 2, axis=-1), phase_coherence(sweep)
+        out["belief"]["sweep"] = [dict({"theta": float(t), "belief_norm": float(nm), "phase_coherence": float(c)},
+                                       **({"statevector": statevector_repr(s)} if args.statevectors else {}))
+                                  for t, nm, c, s in zip(thetas, norms, coh, sweep)]
+    if extra:
+        rows = []
+        for job, psi, spec in zip(jobs[-len(extra):], states[-len(extra):], extra):
+            row = dict(belief_metrics(psi), **entangle_metrics(psi, job.n, spec.get("subsystem", (0,))))
+            if spec.get("name"): row = dict(name=spec["name"], **row)
+            if args.statevectors: row["statevector"] = statevector_repr(psi)
+            rows.append(row)
+        out["circuits"] = rows
+
+    from qsim_decoherence_filtering import run as decoherence
+    out["decoherence"] = decoherence(sims.get(SECTIONS["decoherence"]) or {})
+    out["engine"] = {"backend": "numpy", "circuits": sum(j.rows for j in jobs),
+                     "elapsed_ms": round((time.perf_counter() - t0) * 1000, 3)}
+    print(json.dumps(out, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+qsim_backend — pure-NumPy statevector backend for the Quantum CHRS circuits.
+
+Replaces Qiskit's Statevector/DensityMatrix/partial_trace for the small circuits in
+Codex/System/Quantum_CHRS.yaml, with Qiskit's conventions: same gate matrices, and
+qubit 0 is the least significant bit of the statevector index.
+- A statevector of n qubits is held as a (rows, 2, ..., 2) tensor (axis 1 is qubit n-1,
+  the last axis qubit 0), so a gate touches only its own axes: tensordot for a gate
+  shared by every row, einsum for per-row (swept) rotations.
+- Fixed gates (h, x, y, z, cx) are module constants; rotations with constant angles are
+  built once per distinct angle (gate_matrix is cached), swept ones in one batched pass.
+- Jobs with the same layout (qubit count, gate kinds and wiring) are simulated together.
+- Metrics take batches: phase_coherence, reduced_density (partial trace), von_neumann.
+
+Ops: h/hadamard, x, y, z, rx/ry/rz (theta), u/u3 (theta, phi, lam), cx/cnot (control,
+target); the gate name goes under `type` or `op`. Angles are numbers or expressions over
+`pi` and `theta`, the sweep variable; evaluating one that uses theta with no sweep bound
+raises ValueError.
+
+Qiskit is only needed for the optional cross-checks (qsim_belief_evolution.py and
+qsim_entangled_sps.py --cross-check) and qsim_bench.py; it is listed in
+requirements-optional.txt.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+SQ2 = 1 / math.sqrt(2)
+FIXED = {
+    "h": np.array([[SQ2, SQ2], [SQ2, -SQ2]], dtype=complex),
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.array([[1, 0], [0, -1]], dtype=complex),
+}
+# CX on (control, target) axes, basis |c t>: 00, 01, 10, 11
+CX = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex).reshape(2, 2, 2, 2)
+ALIASES = {"hadamard": "h", "cnot": "cx", "u3": "u"}
+PARAMS = {"rx": ("theta",), "ry": ("theta",), "rz": ("theta",), "u": ("theta", "phi", "lam")}
+OPS = sorted(set(FIXED) | set(PARAMS) | {"cx"} | set(ALIASES))
+
+
+# === GATES ===
+
+def _stack(rows):
+    """[[a, b], [c, d]] of (B,) arrays -> (B, 2, 2)."""
+    return np.stack([np.stack(r, axis=-1) for r in rows], axis=-2)
+
+
+def rotation(kind, theta, phi=None, lam=None):
+    """Batched Qiskit-convention rotation matrices, (B, 2, 2) for (B,) angle arrays."""
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    z = np.zeros_like(c)
+    if kind == "rx":
+        return _stack([[c + 0j, -1j * s], [-1j * s, c + 0j]])
+    if kind == "ry":
+        return _stack([[c + 0j, -s + 0j], [s + 0j, c + 0j]])
+    if kind == "rz":
+        return _stack([[np.exp(-0.5j * theta), z + 0j], [z + 0j, np.exp(0.5j * theta)]])
+    if kind == "u":
+        return _stack([[c + 0j, -np.exp(1j * lam) * s], [np.exp(1j * phi) * s, np.exp(1j * (phi + lam)) * c]])
+    raise ValueError(f"Unsupported rotation: {kind}")
+
+
+@lru_cache(maxsize=256)
+def gate_matrix(kind, *angles):
+    """The (2, 2) matrix of a single-qubit gate with constant angles (computed once per angle)."""
+    if kind in FIXED:
+        return FIXED[kind]
+    m = rotation(kind, *(np.array([a]) for a in angles))[0]
+    m.setflags(write=False)
+    return m
+
+
+# === CIRCUIT SPECS ===
+
+def config_node(doc, subtree=""):
+    """The node at a dotted path ("simulations.entangled_multi_sp") in a loaded Quantum_CHRS.yaml.
+    The file keeps its simulations at the top level, so a `simulations` step it lacks is skipped."""
+    node = doc or {}
+    for k in filter(None, (subtree or "").split(".")):
+        if k == "simulations" and k not in node:
+            continue
+        node = node[k]
+    return node
+
+
+def circuit_ops(cfg, default=()):
+    """The op list of a circuit spec ({config: {...}} or bare): `ops`, `unitary_ops` or `circuit`."""
+    node = cfg.get("config", cfg)
+    return node.get("ops") or node.get("unitary_ops") or node.get("circuit") or list(default)
+
+
+def compile_ops(raw_ops):
+    """YAML ops -> [(kind, qubits, {param: expression})]."""
+    ops = []
+    for op in raw_ops:
+        t = str(op.get("type") or op.get("op") or "").lower()
+        kind = ALIASES.get(t, t)
+        if kind in FIXED:
+            ops.append((kind, (int(op["target"]),), {}))
+        elif kind in PARAMS:
+            ops.append((kind, (int(op["target"]),), {p: op.get(p, 0.0) for p in PARAMS[kind]}))
+        elif kind == "cx":
+            ops.append((kind, (int(op["control"]), int(op["target"])), {}))
+        else:
+            raise ValueError(f"Unsupported op: {op}")
+    return ops
+
+
+def _mentions_theta(expr):
+    return isinstance(expr, str) and "theta" in compile(expr, "<angle>", "eval").co_names
+
+
+def uses_theta(ops):
+    """Whether any angle of the compiled ops is an expression over theta."""
+    return any(_mentions_theta(e) for _, _, params in ops for e in params.values())
+
+
+def evaluate(expr, theta=None):
+    if isinstance(expr, str):
+        if theta is None and _mentions_theta(expr):
+            raise ValueError(f"Angle {expr!r} uses theta, but no theta sweep is bound for this circuit")
+        return eval(expr, {"__builtins__": {}}, {"pi": math.pi, "theta": theta})
+    return float(expr)
+
+
+def bind_sweep(ops):
+    """Ops for a theta sweep: as written if any angle mentions theta, else every rotation's theta swept."""
+    if uses_theta(ops):
+        return ops
+    return [(k, q, dict(p, theta="theta") if k in PARAMS else p) for k, q, p in ops]
+
+
+class Job:
+    """One circuit, or one circuit swept over a theta array (rows = len(theta))."""
+
+    def __init__(self, n, ops, theta=None):
+        self.n, self.ops, self.theta = n, ops, theta
+        self.rows = 1 if theta is None else len(theta)
+        self.layout = (n, tuple((k, q) for k, q, _ in ops))
+
+
+# === SIMULATION ===
+
+def _apply_shared(psi, gate, axes):
+    """Apply one (2,)*2k gate tensor to axes of every row: contract, then put the new axes back."""
+    k = len(axes)
+    psi = np.tensordot(psi, gate, axes=(axes, tuple(range(k, 2 * k))))
+    return np.moveaxis(psi, tuple(range(-k, 0)), axes)
+
+
+def _apply_rows(psi, gates, axis):
+    """Apply per-row (rows, 2, 2) gates to one qubit axis."""
+    psi = np.moveaxis(psi, axis, -1)
+    psi = np.einsum("bij,b...j->b...i", gates, psi)
+    return np.moveaxis(psi, -1, axis)
+
+
+def _angles(jobs, i, kind):
+    """Per-param angle arrays over all rows for op i, or a tuple of scalars when every row agrees."""
+    values = [[evaluate(j.ops[i][2][p], j.theta) for p in PARAMS[kind]] for j in jobs]
+    if all(j.theta is None for j in jobs) and all(v == values[0] for v in values):
+        return tuple(float(a) for a in values[0])
+    return {p: np.concatenate([np.broadcast_to(np.asarray(v[n], float), (j.rows,)) for v, j in zip(values, jobs)])
+            for n, p in enumerate(PARAMS[kind])}
+
+
+def simulate(jobs):
+    """Statevectors (rows, 2**n) for jobs sharing one layout, concatenated in job order."""
+    n, layout = jobs[0].layout
+    rows = sum(j.rows for j in jobs)
+    psi = np.zeros((rows,) + (2,) * n, dtype=complex)
+    psi[(slice(None),) + (0,) * n] = 1.0
+    axis = lambda q: 1 + (n - 1 - q)  # row axis first, then qubits n-1 ... 0
+    for i, (kind, qubits) in enumerate(layout):
+        if kind == "cx":
+            psi = _apply_shared(psi, CX, tuple(axis(q) for q in qubits))
+        elif kind in FIXED:
+            psi = _apply_shared(psi, FIXED[kind], (axis(qubits[0]),))
+        else:
+            angles = _angles(jobs, i, kind)
+            if isinstance(angles, tuple):
+                psi = _apply_shared(psi, gate_matrix(kind, *angles), (axis(qubits[0]),))
+            else:
+                psi = _apply_rows(psi, rotation(kind, **angles), axis(qubits[0]))
+    return psi.reshape(rows, 2 ** n)
+
+
+def run_jobs(jobs):
+    """Statevector per job (shape (2**n,) or (rows, 2**n) for sweeps), batching jobs by layout."""
+    groups = {}
+    for idx, job in enumerate(jobs):
+        groups.setdefault(job.layout, []).append(idx)
+    out = [None] * len(jobs)
+    for idxs in groups.values():
+        states, start = simulate([jobs[i] for i in idxs]), 0
+        for i in idxs:
+            block = states[start:start + jobs[i].rows]
+            out[i] = block[0] if jobs[i].theta is None else block
+            start += jobs[i].rows
+    return out
+
+
+def statevector(n, raw_ops):
+    """Statevector (2**n,) of one circuit given as YAML ops."""
+    return run_jobs([Job(n, compile_ops(raw_ops))])[0]
+
+
+# === METRICS (batched over leading axes) ===
+
+def phase_coherence(psi):
+    """Mean |rho_ij| over i != j for rho = |psi><psi|, without building rho."""
+    a = np.abs(psi)
+    dim = psi.shape[-1]
+    if dim < 2:
+        return np.zeros(psi.shape[:-1])
+    return (a.sum(-1) ** 2 - (a ** 2).sum(-1)) / (dim * dim - dim)
+
+
+def reduced_density(psi, n, keep):
+    """Density matrix of the qubits in keep, tracing out the rest: (..., 2**k, 2**k)."""
+    lead = psi.shape[:-1]
+    t = psi.reshape(lead + (2,) * n)
+    kept = [len(lead) + (n - 1 - q) for q in sorted(keep, reverse=True)]
+    t = np.moveaxis(t, kept, range(len(lead), len(lead) + len(kept)))
+    m = t.reshape(lead + (2 ** len(keep), -1))
+    return m @ np.conj(np.swapaxes(m, -1, -2))
+
+
+def von_neumann(rho):
+    """Entropy in bits; eigenvalues clipped at 1e-16 as the Qiskit-era scripts did."""
+    vals = np.clip(np.linalg.eigvalsh(rho).real, 1e-16, 1.0)
+    return -np.sum(vals * np.log2(vals), axis=-1)
+
+
+def statevector_repr(psi):
+    return [complex(z).__repr__() for z in psi.tolist()]
@@ -1,18 +1,13 @@
 #!/usr/bin/env python3
-import argparse, json, math, sys
-from pathlib import Path
+import argparse, json, math, os, sys
 import numpy as np
-try: import yaml
-except Exception: print("PyYAML required", file=sys.stderr); raise
-from qiskit.quantum_info import Statevector, DensityMatrix  # no Aer
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SDK"))
+from harmony_cli import codex
+import qsim_backend as qb  # NumPy statevectors; Qiskit only for --cross-check
 
 def load_cfg(spec):
     path, subtree = (spec.split("::") + [""])[:2]
-    data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
-    node = data
-    for k in filter(None, subtree.split(".")):
-        node = node[k]
-    return node
+    return qb.config_node(codex.load_yaml(path), subtree)
 
 def apply_op(qc, op):
     t = op.get("type","").lower()
@@ -30,33 +25,39 @@ def apply_op(qc, op):
         qc.cx(op["control"], op["target"]); return
     raise ValueError(f"Unsupported op: {op}")
 
-def coherence_metric(dm):
-    rho = np.array(dm.data); n = rho.shape[0]
-    mask = ~np.eye(n, dtype=bool); off = np.abs(rho[mask])
-    return float(off.mean()) if off.size else 0.0
+def cross_check(n, ops, psi):
+    """Max |difference| from Qiskit's Statevector for the same circuit; None without Qiskit."""
+    try:
+        from qiskit import QuantumCircuit
+        from qiskit.quantum_info import Statevector  # no Aer
+    except ImportError:
+        return None
+    qc = QuantumCircuit(n)
+    for op in ops:
+        apply_op(qc, op)
+    return float(np.max(np.abs(Statevector.from_instruction(qc).data - psi)))
 
 def main():
-    from qiskit import QuantumCircuit  # import here to avoid heavy import at module load
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", default="Codex/System/Quantum_CHRS.yaml::simulations.superpositional_belief")
+    ap.add_argument("--cross-check", action="store_true", help="compare against Qiskit (if installed); exit 1 on mismatch")
     args = ap.parse_args()
 
     cfg = load_cfg(args.config)
     n = int(cfg.get("config",{}).get("n_qubits",1))
-    qc = QuantumCircuit(n)
-    for op in cfg.get("config",{}).get("unitary_ops",[]):
-        apply_op(qc, op)
-
-    # No Aer: build state directly
-    state = Statevector.from_instruction(qc)
-    dm = DensityMatrix(state)
-    norm = float((state.data.conj()*state.data).sum().real)
+    ops = cfg.get("config",{}).get("unitary_ops",[])
+    psi = qb.statevector(n, ops)
 
     out = {
-        "belief_norm": norm,
-        "phase_coherence": coherence_metric(dm),
-        "statevector": [complex(z).__repr__() for z in state.data.tolist()]
+        "belief_norm": float(np.sum(np.abs(psi) ** 2)),
+        "phase_coherence": float(qb.phase_coherence(psi)),
+        "statevector": qb.statevector_repr(psi)
     }
+    if args.cross_check:
+        diff = cross_check(n, ops, psi)
+        out["qiskit_max_abs_diff"] = diff
+        if diff is None: print("qiskit not installed; cross-check skipped", file=sys.stderr)
+        elif diff > 1e-9: print(json.dumps(out, indent=2)); sys.exit(1)
     print(json.dumps(out, indent=2))
 
 if __name__ == "__main__":
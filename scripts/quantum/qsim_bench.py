@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: NumPy statevector backend (qsim_backend) vs Qiskit quantum_info.
+- startup: a fresh interpreter importing each backend (plus a bare interpreter for
+  reference), best of --repeat
+- per circuit: the belief and entangled-SP circuits from Quantum_CHRS.yaml, statevector
+  plus the metrics the scripts report, one circuit at a time
+- batched: --batch copies of the belief circuit with swept theta in one pass
+When Qiskit is importable its statevectors are compared with the backend's; without it
+the Qiskit columns read n/a.
+
+Usage:
+  python3 scripts/quantum/qsim_bench.py [--config Codex/System/Quantum_CHRS.yaml] [--repeat 5] [--loops 200] [--batch 4096]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+import qsim  # noqa: E402
+import qsim_backend as qb  # noqa: E402
+
+QISKIT_IMPORT = "from qiskit import QuantumCircuit; from qiskit.quantum_info import Statevector, DensityMatrix, partial_trace"
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def startup(code, repeat):
+    """Best wall time of `python -c code`, or None if it fails (e.g. module not installed)."""
+    def run():
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=HERE,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        return best_of(run, repeat)
+    except subprocess.CalledProcessError:
+        return None
+
+
+def qiskit_runner(n, ops, keep_entropy):
+    """Closure running one circuit through Qiskit as the old scripts did, or None without Qiskit."""
+    try:
+        from qiskit import QuantumCircuit
+        from qiskit.quantum_info import Statevector, DensityMatrix, partial_trace
+    except ImportError:
+        return None
+    from qsim_belief_evolution import apply_op
+    ops = [dict(g, type=g.get("type") or {"hadamard": "h"}.get(g["op"].lower(), g["op"])) for g in ops]
+
+    def run():
+        qc = QuantumCircuit(n)
+        for op in ops:
+            apply_op(qc, op)
+        state = Statevector.from_instruction(qc)
+        dm = DensityMatrix(state)
+        if keep_entropy:
+            qb.von_neumann(np.array(partial_trace(dm, [1]).data))
+        return state.data
+    return run
+
+
+def numpy_runner(n, ops, keep_entropy):
+    def run():
+        psi = qb.statevector(n, ops)
+        qb.phase_coherence(psi)
+        if keep_entropy:
+            qb.von_neumann(qb.reduced_density(psi, n, [q for q in range(n) if q != 1]))
+        return psi
+    return run
+
+
+def fmt(seconds, scale=1e3, unit="ms"):
+    return f"{seconds * scale:9.3f} {unit}" if seconds is not None else "      n/a   "
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=qsim.DEFAULT_CONFIG)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--loops", type=int, default=200, help="circuits per per-circuit timing")
+    ap.add_argument("--batch", type=int, default=4096, help="rows in the batched theta sweep")
+    args = ap.parse_args()
+
+    print("[startup] fresh interpreter, best of", args.repeat)
+    bare = startup("pass", args.repeat)
+    t_np = startup("import qsim_backend", args.repeat)
+    t_qk = startup(QISKIT_IMPORT, args.repeat)
+    print(f"  python        {fmt(bare)}")
+    print(f"  qsim_backend  {fmt(t_np)}")
+    print(f"  qiskit        {fmt(t_qk)}" + (f"   x{t_qk / t_np:.1f}" if t_qk and t_np else ""))
+
+    sims = qb.config_node(qsim.codex.load_yaml(args.config), "simulations")
+    circuits = [
+        ("belief", sims.get(qsim.SECTIONS["belief"]) or {}, (), 1, False),
+        ("entangle", sims.get(qsim.SECTIONS["entangle"]) or {}, qsim.BELL, 2, True),
+    ]
+    ok = True
+    print(f"[per circuit] {args.loops} circuits, best of {args.repeat}")
+    for label, cfg, default, n_default, entropy in circuits:
+        n = int(cfg.get("config", cfg).get("n_qubits", n_default))
+        ops = qb.circuit_ops(cfg, default)
+        new = numpy_runner(n, ops, entropy)
+        old = qiskit_runner(n, ops, entropy)
+        t_new = best_of(lambda: [new() for _ in range(args.loops)], args.repeat) / args.loops
+        t_old = best_of(lambda: [old() for _ in range(args.loops)], args.repeat) / args.loops if old else None
+        line = f"  {label:9s} numpy {fmt(t_new, 1e6, 'us')}   qiskit {fmt(t_old, 1e6, 'us')}"
+        if old:
+            diff = float(np.max(np.abs(old() - new())))
+            ok = ok and diff < 1e-9
+            line += f"   x{t_old / t_new:.1f}   max|diff| {diff:.1e}"
+        print(line)
+
+    belief = circuits[0][1]
+    n = int(belief.get("config", belief).get("n_qubits", 1))
+    ops = qb.bind_sweep(qb.compile_ops(qb.circuit_ops(belief)))
+    thetas = np.linspace(0, 2 * np.pi, args.batch)
+    t_batch = best_of(lambda: qb.phase_coherence(qb.run_jobs([qb.Job(n, ops, thetas)])[0]), args.repeat)
+    print(f"[batched] {args.batch}-point theta sweep: {fmt(t_batch)} total, {fmt(t_batch / args.batch, 1e6, 'us')} per circuit")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
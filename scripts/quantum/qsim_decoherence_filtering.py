@@ -1,38 +1,118 @@
 #!/usr/bin/env python3
-import argparse, json, sys
-from pathlib import Path
+"""
+Dephasing of a qubit density matrix and Uhlmann fidelity to its diagonal (decoherence_filtering).
+
+Step t multiplies the coherence rho[0,1] by exp(-gamma*t), so after t steps it is
+rho0[0,1] * exp(-gamma * t(t+1)/2); the populations are untouched. Everything is computed
+from that closed form, broadcast over NumPy arrays: rho may be a batch (..., 2, 2), gamma
+and steps arrays, so a (gamma, steps) sweep is one expression. Fidelity uses eigh on
+Hermitian inputs, and an elementwise root when one side is diagonal (as for the fidelity
+to the diagonal); scipy's sqrtm is only a fallback for non-Hermitian inputs.
+
+Usage:
+  python3 scripts/quantum/qsim_decoherence_filtering.py [--config Quantum_CHRS.yaml::decoherence_filtering]
+      [--trajectory] [--sweep-gamma START:STOP:NUM --sweep-steps START:STOP:NUM]
+"""
+import argparse, json, os, sys
 import numpy as np
-try: import yaml
-except Exception: print("PyYAML required", file=sys.stderr); raise
-try:
-    from scipy.linalg import sqrtm; HAVE_SCIPY = True
-except Exception: HAVE_SCIPY = False
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SDK"))
+from harmony_cli import codex
+from qsim_backend import config_node
+
+RHO0 = np.array([[0.5,0.5],[0.5,0.5]], dtype=complex)
+
+def decay(gamma, steps):
+    """Factor on rho[0,1] after `steps` steps: exp(-gamma * steps(steps+1)/2), broadcast."""
+    steps = np.asarray(steps, dtype=float)
+    return np.exp(-np.asarray(gamma, dtype=float) * steps * (steps + 1) / 2)
+
+def coherence_trajectory(rho, gamma, steps):
+    """rho[..., 0, 1] at t = 0..steps: shape broadcast(rho[...,0,1], gamma) + (steps+1,)."""
+    c0 = np.asarray(rho)[..., 0, 1]
+    t = np.arange(int(steps) + 1)
+    return np.asarray(c0)[..., None] * decay(np.asarray(gamma)[..., None], t)
+
+def dephase(rho, gamma, steps):
+    """Density matrices after `steps` dephasing steps, broadcast over rho (..., 2, 2), gamma and steps."""
+    rho = np.asarray(rho, dtype=complex)
+    off = rho[..., 0, 1] * decay(gamma, steps)
+    out = np.empty(off.shape + (2, 2), dtype=complex)
+    out[..., 0, 0] = np.broadcast_to(rho[..., 0, 0], off.shape)
+    out[..., 1, 1] = np.broadcast_to(rho[..., 1, 1], off.shape)
+    out[..., 0, 1] = off; out[..., 1, 0] = np.conj(off)
+    return out
 
 def decohere_dephasing(rho, gamma, steps):
-    rhos=[rho.copy()]
-    for t in range(1, steps+1):
-        r=rhos[-1].copy(); decay=np.exp(-gamma*t); r[0,1]=r[0,1]*decay; r[1,0]=np.conj(r[0,1]); rhos.append(r)
-    return rhos
+    """All steps+1 matrices (steps+1, 2, 2); prefer dephase/coherence_trajectory, which don't build them."""
+    return dephase(rho, gamma, np.arange(int(steps) + 1))
+
+def _is_hermitian(m):
+    return np.allclose(m, np.conj(np.swapaxes(m, -1, -2)))
+
+def _is_diagonal(m):
+    return not np.any(m * (1 - np.eye(m.shape[-1])))
+
+def _sqrt_psd(m):
+    if _is_diagonal(m):
+        return np.sqrt(np.clip(m.real, 0.0, None)) * np.eye(m.shape[-1])
+    w, v = np.linalg.eigh(m)
+    return (v * np.sqrt(np.clip(w, 0.0, None))[..., None, :]) @ np.conj(np.swapaxes(v, -1, -2))
 
 def fidelity_uhlmann(rho, sigma):
-    if not HAVE_SCIPY: return float("nan")
-    A=sqrtm(rho); F=np.trace(sqrtm(A @ sigma @ A)).real; return float(np.clip(F, 0.0, 1.0))
+    """tr sqrt(sqrt(rho) sigma sqrt(rho)), clipped to [0, 1]; batched over leading axes."""
+    rho, sigma = np.asarray(rho, dtype=complex), np.asarray(sigma, dtype=complex)
+    if _is_hermitian(rho) and _is_hermitian(sigma):
+        if _is_diagonal(sigma): rho, sigma = sigma, rho  # F is symmetric; a diagonal root is elementwise
+        a = _sqrt_psd(rho)
+        m = a @ sigma @ a
+        m = (m + np.conj(np.swapaxes(m, -1, -2))) / 2  # rounding can leave it a hair off Hermitian
+        F = np.sqrt(np.clip(np.linalg.eigvalsh(m), 0.0, None)).sum(-1)
+    else:
+        try: from scipy.linalg import sqrtm
+        except Exception: return float("nan")
+        A = sqrtm(rho); F = np.trace(sqrtm(A @ sigma @ A)).real
+    F = np.clip(F, 0.0, 1.0)
+    return float(F) if np.ndim(F) == 0 else F
+
+def to_diagonal(rho):
+    return np.asarray(rho) * np.eye(2)
+
+def sweep(gammas, steps, rho=RHO0):
+    """coherence_final and fidelity to diagonal over the (gamma, steps) grid: arrays (len(gammas), len(steps))."""
+    g = np.asarray(gammas, dtype=float)[:, None]; s = np.asarray(steps)[None, :]
+    final = dephase(rho, g, s)
+    return {"gamma": g[:, 0].tolist(), "timesteps": s[0].astype(int).tolist(),
+            "coherence_final": np.abs(final[..., 0, 1]).tolist(),
+            "uhlmann_fidelity_to_diagonal": np.asarray(fidelity_uhlmann(final, to_diagonal(final))).tolist()}
+
+def run(cfg, trajectory=False):
+    """Metrics for a decoherence_filtering node ({config: {gamma, timesteps}}); also used by qsim.py."""
+    conf=(cfg or {}).get("config",{}) or {}
+    gamma=float(conf.get("gamma", 0.1)); steps=int(conf.get("timesteps", 50))
+    rho_final=dephase(RHO0, gamma, steps)
+    out={"gamma":gamma,"timesteps":steps,"coherence_initial":float(abs(RHO0[0,1])),"coherence_final":float(abs(rho_final[0,1])),"uhlmann_fidelity_to_diagonal":fidelity_uhlmann(rho_final, to_diagonal(rho_final))}
+    if trajectory: out["coherence_trajectory"]=np.abs(coherence_trajectory(RHO0, gamma, steps)).tolist()
+    return out
+
+def parse_range(spec, cast=float):
+    start, stop, num = spec.split(":")
+    return np.linspace(float(start), float(stop), int(num)).astype(cast)
 
 def main():
     ap=argparse.ArgumentParser()
     ap.add_argument("--config", default="Codex/System/Quantum_CHRS.yaml::simulations.decoherence_filtering")
+    ap.add_argument("--trajectory", action="store_true", help="include |rho[0,1]| for every step")
+    ap.add_argument("--sweep-gamma", metavar="START:STOP:NUM", help="grid sweep; needs --sweep-steps")
+    ap.add_argument("--sweep-steps", metavar="START:STOP:NUM")
     args=ap.parse_args()
+    if bool(args.sweep_gamma) != bool(args.sweep_steps): ap.error("--sweep-gamma and --sweep-steps go together")
     cfg_path, subtree=(args.config.split('::')+[None])[:2]
     # gamma/timesteps from YAML if exists, else defaults
-    gamma=0.1; steps=50
+    cfg={}
     try:
-        cfg = yaml.safe_load(Path(cfg_path).read_text(encoding="utf-8")) or {}
-        for k in filter(None, subtree.split(".")): cfg = cfg[k]
-        gamma=float(cfg.get("config",{}).get("gamma", gamma))
-        steps=int(cfg.get("config",{}).get("timesteps", steps))
-    except Exception: pass
-    rho0=np.array([[0.5,0.5],[0.5,0.5]], dtype=complex); rhos=decohere_dephasing(rho0, gamma, steps)
-    rho_final=rhos[-1]; sigma_diag=np.diag(np.diag(rho_final))
-    out={"gamma":gamma,"timesteps":steps,"coherence_initial":float(abs(rho0[0,1])),"coherence_final":float(abs(rho_final[0,1])),"uhlmann_fidelity_to_diagonal":fidelity_uhlmann(rho_final, sigma_diag)}
+        cfg = config_node(codex.load_yaml(cfg_path), subtree)
+    except Exception: cfg={}
+    out=run(cfg, trajectory=args.trajectory)
+    if args.sweep_gamma: out["sweep"]=sweep(parse_range(args.sweep_gamma), parse_range(args.sweep_steps, int))
     print(json.dumps(out, indent=2))
 if __name__=="__main__": main()
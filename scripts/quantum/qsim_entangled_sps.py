@@ -1,49 +1,54 @@
 #!/usr/bin/env python3
-import argparse, json, sys
-from pathlib import Path
+import argparse, json, os, sys
 import numpy as np
-try: import yaml
-except Exception: print("PyYAML required", file=sys.stderr); raise
-from qiskit.quantum_info import Statevector, DensityMatrix, partial_trace  # no Aer
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SDK"))
+from harmony_cli import codex
+import qsim_backend as qb  # NumPy statevectors; Qiskit only for --cross-check
 
 def load_cfg(spec):
     path, subtree = (spec.split("::") + [""])[:2]
-    data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
-    node = data
-    for k in filter(None, subtree.split(".")):
-        node = node[k]
-    return node
+    return qb.config_node(codex.load_yaml(path), subtree)
 
-def S_von_neumann(rho):
-    vals = np.linalg.eigvalsh(rho); vals = np.clip(vals.real, 1e-16, 1.0)
-    return float(-np.sum(vals * np.log2(vals)))
+def cross_check(n, ops, S_A):
+    """Max |difference| (statevector, entropy) from Qiskit for the same circuit; None without Qiskit."""
+    try:
+        from qiskit import QuantumCircuit
+        from qiskit.quantum_info import Statevector, DensityMatrix, partial_trace  # no Aer
+    except ImportError:
+        return None
+    from qsim_belief_evolution import apply_op
+    qc = QuantumCircuit(n)
+    for g in ops:
+        apply_op(qc, dict(g, type=g.get("type") or {"hadamard": "h"}.get(g["op"].lower(), g["op"])))
+    state = Statevector.from_instruction(qc)
+    rho_A = partial_trace(DensityMatrix(state), [1]).data
+    return float(max(np.max(np.abs(state.data - qb.statevector(n, ops))),
+                     abs(float(qb.von_neumann(np.array(rho_A))) - S_A)))
 
 def main():
-    from qiskit import QuantumCircuit  # import here
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", default="Codex/System/Quantum_CHRS.yaml::simulations.entangled_multi_sp")
+    ap.add_argument("--cross-check", action="store_true", help="compare against Qiskit (if installed); exit 1 on mismatch")
     args = ap.parse_args()
 
     cfg = load_cfg(args.config)
     n = int(cfg.get("config",{}).get("n_qubits",2))
-    qc = QuantumCircuit(n)
-    for g in cfg.get("config",{}).get("circuit", [{"op":"h","target":0},{"op":"cx","control":0,"target":1}]):
-        op = g["op"].lower()
-        if op in ("h","hadamard"): qc.h(g["target"])
-        elif op in ("cx","cnot"):  qc.cx(g["control"], g["target"])
-        else: raise ValueError(f"Unsupported gate: {g}")
-
-    # No Aer: state directly
-    state = Statevector.from_instruction(qc)
-    dm = DensityMatrix(state)
-    rho_A = partial_trace(dm, [1]).data
-    S_A = S_von_neumann(np.array(rho_A))
+    ops = cfg.get("config",{}).get("circuit", [{"op":"h","target":0},{"op":"cx","control":0,"target":1}])
+    psi = qb.statevector(n, ops)
+    # Trace out qubit 1 and keep the rest, as partial_trace(dm, [1]) did
+    keep = [q for q in range(n) if q != 1]
+    S_A = float(qb.von_neumann(qb.reduced_density(psi, n, keep)))
 
     out = {
         "entanglement_entropy": S_A,
         "mutual_information": 2.0 * S_A,
-        "statevector": [complex(z).__repr__() for z in state.data.tolist()]
+        "statevector": qb.statevector_repr(psi)
     }
+    if args.cross_check:
+        diff = cross_check(n, ops, S_A)
+        out["qiskit_max_abs_diff"] = diff
+        if diff is None: print("qiskit not installed; cross-check skipped", file=sys.stderr)
+        elif diff > 1e-9: print(json.dumps(out, indent=2)); sys.exit(1)
     print(json.dumps(out, indent=2))
 
 if __name__ == "__main__":
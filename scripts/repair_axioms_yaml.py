@@ -15,11 +15,13 @@ from __future__ import annotations
 import sys, os, typing as t
 import yaml
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
 AXIOMS_PATH = "Codex/Core/Laws/Axioms.yaml"
 
 def load_yaml(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return codex.load_yaml(path)
 
 def dump_yaml(data, path: str):
     with open(path, "w", encoding="utf-8") as f:
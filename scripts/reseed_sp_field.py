@@ -1,13 +1,16 @@
 import os
+import sys
 import yaml
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
 # Dynamically resolve the absolute path to Codex/SPs
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SP_DIR = os.path.join(BASE_DIR, "Codex", "SPs")
 
 def reseed_sp_file(filepath):
-    with open(filepath, 'r') as f:
-        data = yaml.safe_load(f) or {}
+    data = codex.load_yaml(filepath) or {}
 
     if 'shen_level' in data:
         print(f"[-] Skipped {os.path.basename(filepath)} — already has shen_level")
@@ -5,11 +5,14 @@ Local key 'rotation': updates QSecure.yaml fields to simulate a QKD key change.
 Writes a rotation log under reports/qsecure_rotations.log.
 Use --commit to git add/commit the change automatically.
 """
-import argparse, subprocess
+import argparse, os, subprocess, sys
 from datetime import datetime, timezone
 from pathlib import Path
 import yaml
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
+
 CFG = Path("Codex/System/QSecure.yaml")
 LOG = Path("reports/qsecure_rotations.log")
 
@@ -25,8 +28,7 @@ def main():
     if not CFG.exists():
         raise SystemExit("Missing Codex/System/QSecure.yaml")
 
-    with CFG.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = codex.load_yaml(CFG) or {}
 
     q = data.setdefault("qsecure", {})
     meta = q.setdefault("meta", {})
@@ -1,19 +1,24 @@
 import psycopg2
 from psycopg2.extras import execute_batch
 from dotenv import load_dotenv
+import argparse
 import os
+import re
+from datetime import date
 
 # Load environment variables from .env file
 load_dotenv()
 
+
 # PostgreSQL connection using environment variables
-conn = psycopg2.connect(
-    dbname=os.getenv("PG_DBNAME"),
-    user=os.getenv("PG_USER"),
-    password=os.getenv("PG_PASSWORD"),
-    host=os.getenv("PG_HOST"),
-    port=os.getenv("PG_PORT")
-)
+def connect():
+    return psycopg2.connect(
+        dbname=os.getenv("PG_DBNAME"),
+        user=os.getenv("PG_USER"),
+        password=os.getenv("PG_PASSWORD"),
+        host=os.getenv("PG_HOST"),
+        port=os.getenv("PG_PORT")
+    )
 
 # Define schema creation statements
 schema_statements = [
@@ -61,14 +66,310 @@ schema_statements = [
     """
 ]
 
+# Monthly range partitions: <table>_YYYY_MM plus a <table>_default catch-all
+partition_functions = [
+    """
+    CREATE OR REPLACE FUNCTION harmony_ensure_monthly_partitions(parent TEXT, from_month DATE, to_month DATE)
+    RETURNS INTEGER LANGUAGE plpgsql AS $$
+    DECLARE
+        m DATE := date_trunc('month', from_month)::date;
+        part TEXT;
+        created INTEGER := 0;
+    BEGIN
+        WHILE m <= to_month LOOP
+            part := format('%s_%s', parent, to_char(m, 'YYYY_MM'));
+            IF to_regclass(part) IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                               part, parent, m, (m + interval '1 month')::date);
+                created := created + 1;
+            END IF;
+            m := (m + interval '1 month')::date;
+        END LOOP;
+        RETURN created;
+    END $$;
+    """,
+]
+
+
+# v2 of the helper (migration 8): a month whose rows already landed in <table>_default (the
+# job lapsed longer than months_ahead) can't be CREATEd as a partition - Postgres refuses while
+# the default holds rows in its range. Such months are created standalone, the rows moved out of
+# the default under a lock that blocks writers to it, and the table attached.
+partition_functions_v2 = [
+    """
+    CREATE OR REPLACE FUNCTION harmony_ensure_monthly_partitions(parent TEXT, from_month DATE, to_month DATE)
+    RETURNS INTEGER LANGUAGE plpgsql AS $$
+    DECLARE
+        m DATE := date_trunc('month', from_month)::date;
+        next_m DATE;
+        part TEXT;
+        dflt TEXT := parent || '_default';
+        pending BOOLEAN;
+        created INTEGER := 0;
+    BEGIN
+        WHILE m <= to_month LOOP
+            next_m := (m + interval '1 month')::date;
+            part := format('%s_%s', parent, to_char(m, 'YYYY_MM'));
+            IF to_regclass(part) IS NULL THEN
+                pending := false;
+                IF to_regclass(dflt) IS NOT NULL THEN
+                    EXECUTE format('LOCK TABLE %I IN SHARE ROW EXCLUSIVE MODE', dflt);
+                    EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE timestamp >= %L AND timestamp < %L)',
+                                   dflt, m, next_m) INTO pending;
+                END IF;
+                IF pending THEN
+                    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)', part, parent);
+                    EXECUTE format('WITH moved AS (DELETE FROM %I WHERE timestamp >= %L AND timestamp < %L RETURNING *) '
+                                   'INSERT INTO %I SELECT * FROM moved', dflt, m, next_m, part);
+                    EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                                   parent, part, m, next_m);
+                ELSE
+                    EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                                   part, parent, m, next_m);
+                END IF;
+                created := created + 1;
+            END IF;
+            m := next_m;
+        END LOOP;
+        RETURN created;
+    END $$;
+    """,
+]
+
+
+def partition_statements(table, columns, primary_key):
+    """Swap an unpartitioned table for a RANGE(timestamp) partitioned copy, keeping its rows."""
+    legacy = f"{table}_unpartitioned"
+    return [
+        f"ALTER TABLE {table} RENAME TO {legacy};",
+        f"ALTER INDEX IF EXISTS {table}_pkey RENAME TO {legacy}_pkey;",
+        f"""
+        CREATE TABLE {table} (
+            {columns},
+            PRIMARY KEY ({primary_key}, timestamp)
+        ) PARTITION BY RANGE (timestamp);
+        """,
+        f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT;",
+        f"""
+        SELECT harmony_ensure_monthly_partitions(
+            '{table}',
+            COALESCE((SELECT min(timestamp) FROM {legacy}), now())::date,
+            (date_trunc('month', now()) + interval '3 months')::date
+        );
+        """,
+        # The partition key must be NOT NULL; undated legacy rows get the migration time
+        f"UPDATE {legacy} SET timestamp = now() WHERE timestamp IS NULL;",
+        f"INSERT INTO {table} SELECT * FROM {legacy};",
+        f"DROP TABLE {legacy};",
+    ]
+
+
+# Versioned migrations; each runs once, in its own transaction
+MIGRATIONS = [
+    (1, "baseline tables", schema_statements),
+    (2, "monthly partition helper", partition_functions),
+    (3, "partition codex_events by month", partition_statements(
+        "codex_events",
+        """event_id UUID NOT NULL DEFAULT gen_random_uuid(),
+            session_id UUID REFERENCES harmony_sessions(session_id),
+            timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+            codex_path TEXT,
+            event_type TEXT,
+            glyph_signature TEXT,
+            encrypted_data BYTEA""",
+        "event_id",
+    )),
+    (4, "partition audit_logs by month", partition_statements(
+        "audit_logs",
+        """log_id UUID NOT NULL DEFAULT gen_random_uuid(),
+            component TEXT,
+            action TEXT,
+            result TEXT,
+            timestamp TIMESTAMPTZ NOT NULL DEFAULT now()""",
+        "log_id",
+    )),
+    (5, "session/SP time-ordered indexes", [
+        "CREATE INDEX IF NOT EXISTS codex_events_session_ts_idx ON codex_events (session_id, timestamp);",
+        "CREATE INDEX IF NOT EXISTS sp_interactions_session_ts_idx ON sp_interactions (session_id, timestamp);",
+        "CREATE INDEX IF NOT EXISTS sp_interactions_sp_ts_idx ON sp_interactions (sp_name, timestamp DESC);",
+        "CREATE INDEX IF NOT EXISTS audit_logs_component_ts_idx ON audit_logs (component, timestamp);",
+        "CREATE INDEX IF NOT EXISTS harmony_sessions_sp_start_idx ON harmony_sessions (sp_id, start_time);",
+    ]),
+    (6, "BRIN timestamp indexes", [
+        "CREATE INDEX IF NOT EXISTS codex_events_ts_brin ON codex_events USING brin (timestamp);",
+        "CREATE INDEX IF NOT EXISTS sp_interactions_ts_brin ON sp_interactions USING brin (timestamp);",
+        "CREATE INDEX IF NOT EXISTS audit_logs_ts_brin ON audit_logs USING brin (timestamp);",
+    ]),
+    (7, "daily rollup tables", [
+        """
+        CREATE TABLE IF NOT EXISTS codex_events_daily (
+            day DATE NOT NULL,
+            event_type TEXT NOT NULL,
+            events BIGINT NOT NULL,
+            sessions BIGINT NOT NULL,
+            PRIMARY KEY (day, event_type)
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS audit_logs_daily (
+            day DATE NOT NULL,
+            component TEXT NOT NULL,
+            action TEXT NOT NULL,
+            result TEXT NOT NULL,
+            events BIGINT NOT NULL,
+            PRIMARY KEY (day, component, action, result)
+        );
+        """,
+    ]),
+    (8, "partition helper moves rows out of the default partition", partition_functions_v2),
+]
+
+# Rollups computed from a whole monthly partition before it is dropped (idempotent)
+ROLLUPS = {
+    "codex_events": """
+        INSERT INTO codex_events_daily (day, event_type, events, sessions)
+        SELECT timestamp::date, COALESCE(event_type, ''), count(*), count(DISTINCT session_id)
+        FROM {partition} GROUP BY 1, 2
+        ON CONFLICT (day, event_type) DO UPDATE
+        SET events = EXCLUDED.events, sessions = EXCLUDED.sessions;
+    """,
+    "audit_logs": """
+        INSERT INTO audit_logs_daily (day, component, action, result, events)
+        SELECT timestamp::date, COALESCE(component, ''), COALESCE(action, ''), COALESCE(result, ''), count(*)
+        FROM {partition} GROUP BY 1, 2, 3, 4
+        ON CONFLICT (day, component, action, result) DO UPDATE
+        SET events = EXCLUDED.events;
+    """,
+}
+
+# Rows left in <table>_default for months before the retention cutoff (late or backdated writes
+# after their month was rolled up and dropped): added to the daily totals, then deleted.
+# codex_events sessions are summed per batch, so a session split across batches counts twice.
+DEFAULT_ROLLUPS = {
+    "codex_events": """
+        INSERT INTO codex_events_daily (day, event_type, events, sessions)
+        SELECT timestamp::date, COALESCE(event_type, ''), count(*), count(DISTINCT session_id)
+        FROM codex_events_default WHERE timestamp < %(cutoff)s GROUP BY 1, 2
+        ON CONFLICT (day, event_type) DO UPDATE
+        SET events = codex_events_daily.events + EXCLUDED.events,
+            sessions = codex_events_daily.sessions + EXCLUDED.sessions;
+    """,
+    "audit_logs": """
+        INSERT INTO audit_logs_daily (day, component, action, result, events)
+        SELECT timestamp::date, COALESCE(component, ''), COALESCE(action, ''), COALESCE(result, ''), count(*)
+        FROM audit_logs_default WHERE timestamp < %(cutoff)s GROUP BY 1, 2, 3, 4
+        ON CONFLICT (day, component, action, result) DO UPDATE
+        SET events = audit_logs_daily.events + EXCLUDED.events;
+    """,
+}
+
+PARTITION_NAME = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def applied_versions(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TIMESTAMPTZ DEFAULT now()
+        );
+    """)
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def migrate(conn):
+    cur = conn.cursor()
+    done = applied_versions(cur)
+    conn.commit()
+    for version, name, statements in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            for stmt in statements:
+                cur.execute(stmt)
+            cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+            print(f"✅ Migration {version}: {name}")
+        except Exception:
+            conn.rollback()
+            print(f"❌ Migration {version} failed: {name}")
+            raise
+    cur.close()
+
+
+def status(conn):
+    cur = conn.cursor()
+    done = applied_versions(cur)
+    conn.commit()
+    for version, name, _ in MIGRATIONS:
+        print(f"{'✅' if version in done else '⏳'} {version:3d} {name}")
+    cur.close()
+
+
+def shift_month(d, months):
+    m = d.year * 12 + d.month - 1 + months
+    return date(m // 12, m % 12 + 1, 1)
+
+
+def maintain(conn, keep_months=12, months_ahead=3):
+    """
+    Retention job: pre-create upcoming monthly partitions, then roll up and
+    drop partitions that ended more than keep_months ago. Rows that landed in
+    <table>_default get their month's partition (and move into it) when the
+    month is within retention, or are rolled up and deleted when it is not.
+    """
+    cur = conn.cursor()
+    this_month = date.today().replace(day=1)
+    cutoff = shift_month(this_month, -keep_months)
+    for parent, rollup in ROLLUPS.items():
+        cur.execute(f"SELECT min(timestamp)::date FROM {parent}_default WHERE timestamp >= %s", (cutoff,))
+        stray = cur.fetchone()[0]
+        cur.execute("SELECT harmony_ensure_monthly_partitions(%s, %s, %s)",
+                    (parent, min(this_month, stray or this_month), shift_month(this_month, months_ahead)))
+        created = cur.fetchone()[0]
+        cur.execute(DEFAULT_ROLLUPS[parent], {"cutoff": cutoff})
+        cur.execute(f"DELETE FROM {parent}_default WHERE timestamp < %s", (cutoff,))
+        expired = cur.rowcount
+        cur.execute("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s
+        """, (parent,))
+        dropped = 0
+        for (partition,) in sorted(cur.fetchall()):
+            m = PARTITION_NAME.search(partition)
+            if not m or shift_month(date(int(m.group(1)), int(m.group(2)), 1), 1) > cutoff:
+                continue
+            cur.execute(rollup.format(partition=partition))
+            cur.execute(f"DROP TABLE {partition}")
+            dropped += 1
+        conn.commit()
+        print(f"✅ {parent}: {created} partition(s) created, {dropped} rolled up and dropped, "
+              f"{expired} default-partition row(s) rolled up and deleted (< {cutoff})")
+    cur.close()
+
+
 def run():
+    parser = argparse.ArgumentParser(description="Create/upgrade the Harmony PostgreSQL schema")
+    parser.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    parser.add_argument("--maintain", action="store_true",
+                        help="Run the partition/retention job (schedule monthly, e.g. from cron)")
+    parser.add_argument("--keep-months", type=int, default=int(os.getenv("HARMONY_RETENTION_MONTHS", "12")),
+                        help="Months of raw codex_events/audit_logs to keep")
+    parser.add_argument("--months-ahead", type=int, default=3, help="Future monthly partitions to pre-create")
+    args = parser.parse_args()
+
+    conn = connect()
     try:
-        cur = conn.cursor()
-        for stmt in schema_statements:
-            cur.execute(stmt)
-        conn.commit()
-        cur.close()
-        print("✅ PostgreSQL Harmony schema created.")
+        if args.status:
+            status(conn)
+        elif args.maintain:
+            maintain(conn, keep_months=args.keep_months, months_ahead=args.months_ahead)
+        else:
+            migrate(conn)
+            print("✅ PostgreSQL Harmony schema created.")
     except Exception as e:
         print(f"❌ Schema creation failed: {e}")
     finally:
@@ -76,4 +377,3 @@ def run():
 
 if __name__ == "__main__":
     run()
-
@@ -12,32 +12,27 @@ Validates:
 3. Coverage indexes in Shepherd_Map.yaml are consistent.
 """
 
+import os
 import sys
-import yaml
 from pathlib import Path
 
-AXIOMS_FILE = Path("Codex/Core/Laws/Axioms.yaml")
-MAP_FILE = Path("Codex/Core/Laws/Shepherd_Map.yaml")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
-def load_yaml(path):
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+AXIOMS_FILE = Path(codex.AXIOMS_FILE)
+MAP_FILE = Path(codex.SHEPHERD_MAP_FILE)
 
-def validate_axioms():
-    try:
-        axioms_data = load_yaml(AXIOMS_FILE)
-    except Exception as e:
-        print(f"ERROR: Failed to parse {AXIOMS_FILE}: {e}")
+def validate_axioms(graph):
+    if codex.AXIOMS_FILE in graph.errors:
+        print(f"ERROR: Failed to parse {AXIOMS_FILE}: {graph.errors[codex.AXIOMS_FILE]}")
         return False, []
 
     # Handle shape: allow list OR mapping with key "axioms"
-    if isinstance(axioms_data, list):
-        axioms = axioms_data
-    elif isinstance(axioms_data, dict) and isinstance(axioms_data.get("axioms"), list):
-        axioms = axioms_data["axioms"]
-    else:
+    doc = graph.axioms_doc
+    if not (isinstance(doc, list) or (isinstance(doc, dict) and isinstance(doc.get("axioms"), list))):
         print("- Axioms.yaml is not a list or mapping with 'axioms'")
         return False, []
+    axioms = graph.axioms
 
     ok = True
     for i, ax in enumerate(axioms, 1):
@@ -52,17 +47,13 @@ def validate_axioms():
             ok = False
     return ok, axioms
 
-def validate_shepherds(axioms):
-    try:
-        mp = load_yaml(MAP_FILE)
-    except Exception as e:
-        print(f"ERROR: Failed to parse {MAP_FILE}: {e}")
+def validate_shepherds(graph):
+    if codex.SHEPHERD_MAP_FILE in graph.errors:
+        print(f"ERROR: Failed to parse {MAP_FILE}: {graph.errors[codex.SHEPHERD_MAP_FILE]}")
         return False
 
-    by_no = {a["no"]: a for a in axioms if "no" in a}
     ok = True
-
-    for shepherd in mp.get("shepherds", []):
+    for shepherd in graph.shepherds:
         sid = shepherd.get("id", "<unknown>")
         for idx, ax in enumerate(shepherd.get("axioms", []), 1):
             if not isinstance(ax, dict):
@@ -73,14 +64,15 @@ def validate_shepherds(axioms):
                 print(f"- Shepherd {sid}: axioms item #{idx} missing 'no' key → {ax!r}")
                 ok = False
                 continue
-            if ax["no"] not in by_no:
+            if ax["no"] not in graph.axioms_by_no:
                 print(f"- Shepherd {sid}: axioms item #{idx} references unknown axiom no={ax['no']}.")
                 ok = False
     return ok
 
 def main():
-    axioms_ok, axioms = validate_axioms()
-    shepherds_ok = validate_shepherds(axioms) if axioms else False
+    graph = codex.CodexGraph(Path.cwd())
+    axioms_ok, axioms = validate_axioms(graph)
+    shepherds_ok = validate_shepherds(graph) if axioms else False
     print("AXIOM VALIDATION:", "OK" if axioms_ok and shepherds_ok else "FAIL")
 
 if __name__ == "__main__":
@@ -9,12 +9,10 @@ Checks:
   - shen_counterweight.suspend_if_shen_above defined
   - audit_trail.log_file present (e.g., Codex/Core/FCP_Audit.yaml)
 """
-import sys, json
+import os, sys, json
 from pathlib import Path
-try:
-    import yaml
-except Exception:
-    print("ERROR: PyYAML required (pip install pyyaml)", file=sys.stderr); sys.exit(2)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SDK"))
+from harmony_cli import codex
 
 FCP = Path("Codex/System/FCP.yaml")
 REQUIRED_VIRTUES = ["忠","孝","礼","义","信"]
@@ -27,7 +25,7 @@ def main():
     if not FCP.exists():
         fail("Codex/System/FCP.yaml missing")
 
-    cfg = yaml.safe_load(FCP.read_text(encoding="utf-8")) or {}
+    cfg = codex.load_yaml(FCP) or {}
 
     # triggers
     trig = cfg.get("triggers") or cfg.get("explicit_triggers")
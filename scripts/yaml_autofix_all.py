@@ -3,6 +3,7 @@ import sys
 from pathlib import Path
 from ruamel.yaml import YAML
 from ruamel.yaml.scalarstring import DoubleQuotedScalarString
+from yaml_fix_runner import main as run_fixer
 
 yaml = YAML()
 yaml.version = (1, 2)
@@ -57,8 +58,8 @@ def ensure_docstart(text: str) -> str:
     return text if stripped.startswith("---") else ("---\n" + text)
 
 def process_file(p: Path):
-    raw = p.read_text(encoding="utf-8")
-    raw = ensure_docstart(raw)
+    original = p.read_text(encoding="utf-8")
+    raw = ensure_docstart(original)
 
     # Parse -> mutate -> dump (block style)
     data = yaml.load(raw)
@@ -73,21 +74,13 @@ def process_file(p: Path):
     buf = StringIO()
     yaml.dump(data, buf)
     out = buf.getvalue().rstrip() + "\n"
+    if out == original:
+        return False
     p.write_text(out, encoding="utf-8")
     return True
 
 def main():
-    root = Path(sys.argv[1] if len(sys.argv) > 1 else "Codex")
-    files = list(root.rglob("*.yaml")) + list(root.rglob("*.yml"))
-    fixed = 0
-    for p in files:
-        try:
-            if process_file(p):
-                fixed += 1
-                print(f"[FIXED] {p}")
-        except Exception as e:
-            print(f"[SKIP ] {p} ({e})")
-    print(f"\nScanned: {len(files)}; Fixed: {fixed}")
+    return run_fixer("yaml_autofix_all", process_file, __file__)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
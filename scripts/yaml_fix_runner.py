@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Shared driver for the whole-Codex YAML fixers (yaml_roundtrip_fix_all.py,
+yaml_autofix_all.py, yaml_flow_spacing_fix.py).
+
+- Files are fanned out over a process pool; each fixer only supplies
+  fix(path) -> bool (True when it rewrote the file).
+- A per-fixer manifest (.cache/yaml_fix/<fixer>.json) records the sha256 of every
+  file as the fixer last left it, plus its (size, mtime_ns). Files whose stat is
+  unchanged, or whose content still hashes to the recorded value, are already
+  normalized and are skipped without parsing. The manifest is discarded when the
+  fixer's own source changes, so edited rules are re-applied everywhere.
+- Every processed file is reported with its time; the summary names the slowest.
+
+Usage (from each fixer): main("<fixer name>", fix, __file__)
+  python3 scripts/<fixer>.py [ROOT ...] [--full] [--jobs N]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MANIFEST_DIR = REPO_ROOT / ".cache" / "yaml_fix"
+EXTS = {".yaml", ".yml"}
+
+
+def sha256_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def yaml_files(roots):
+    found = set()
+    for root in roots:
+        root = Path(root)
+        if root.is_file():
+            found.add(root.resolve())
+            continue
+        for p in root.rglob("*"):
+            if p.suffix.lower() in EXTS and p.is_file():
+                found.add(p.resolve())
+    return sorted(found)
+
+
+def load_manifest(path: Path, rules: str) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data.get("files", {}) if data.get("rules") == rules else {}
+
+
+def save_manifest(path: Path, rules: str, files: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"rules": rules, "files": files}, indent=0, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _run_one(fix, path: Path):
+    """Worker: apply fix and return (path, changed, seconds, error, stat+hash after)."""
+    start = time.perf_counter()
+    try:
+        changed = bool(fix(path))
+        error = None
+    except Exception as e:
+        changed, error = False, str(e)
+    elapsed = time.perf_counter() - start
+    record = None
+    if error is None:
+        st = path.stat()
+        record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256_file(path)}
+    return path, changed, elapsed, error, record
+
+
+def main(name, fix, fixer_file, argv=None, default_roots=("Codex",), fixed_label="FIXED"):
+    ap = argparse.ArgumentParser(prog=Path(fixer_file).name)
+    ap.add_argument("roots", nargs="*", default=list(default_roots), help="directories or files (default: Codex)")
+    ap.add_argument("--full", action="store_true", help="ignore the manifest and process every file")
+    ap.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    rules = sha256_file(Path(fixer_file))
+    manifest_path = MANIFEST_DIR / f"{name}.json"
+    manifest = {} if args.full else load_manifest(manifest_path, rules)
+
+    files = yaml_files(args.roots)
+    todo, clean = [], 0
+    for p in files:
+        key = str(p)
+        prev = manifest.get(key)
+        st = p.stat()
+        if prev and (prev["size"], prev["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+            clean += 1
+            continue
+        if prev and prev["sha256"] == sha256_file(p):
+            prev.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            clean += 1
+            continue
+        todo.append(p)
+
+    results = []
+    if len(todo) > 1 and args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(todo))) as pool:
+            futures = [pool.submit(_run_one, fix, p) for p in todo]
+            for fut in as_completed(futures):
+                results.append(fut.result())
+    else:
+        results = [_run_one(fix, p) for p in todo]
+
+    changed = 0
+    for path, did_change, elapsed, error, record in sorted(results, key=lambda r: r[0]):
+        rel = os.path.relpath(path)
+        if error is not None:
+            print(f"[SKIP ] {rel} ({error})")
+            manifest.pop(str(path), None)
+            continue
+        manifest[str(path)] = record
+        if did_change:
+            changed += 1
+            print(f"[{fixed_label}] {rel} ({elapsed * 1000:.1f} ms)")
+        else:
+            print(f"[OK   ] {rel} ({elapsed * 1000:.1f} ms)")
+
+    # Entries for files outside this run's roots stay; deleted files drop out
+    save_manifest(manifest_path, rules, {k: v for k, v in manifest.items() if os.path.exists(k)})
+
+    slowest = sorted(results, key=lambda r: r[2], reverse=True)[:5]
+    print(f"\nScanned: {len(files)}; Processed: {len(todo)}; Fixed: {changed}; "
+          f"Unchanged since last run: {clean}; {time.perf_counter() - t0:.2f}s")
+    if slowest:
+        print("Slowest: " + ", ".join(f"{os.path.relpath(p)} {t * 1000:.0f} ms" for p, _, t, _, _ in slowest))
+    return 0
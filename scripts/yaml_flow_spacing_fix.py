@@ -4,13 +4,14 @@ Tighten YAML flow-style spacing across Codex:
 - "{  foo: 1 }"  -> "{foo: 1}"
 - "[  a,  b ]"   -> "[a, b]"
 - ",   "         -> ", "   (single space after comma)
-It only rewrites files that actually change and prints a summary.
+It only rewrites files that actually change and prints a summary; files unchanged
+since the last run are skipped (see yaml_fix_runner.py).
 """
 from pathlib import Path
 import re
 import sys
 
-ROOT = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("Codex")
+from yaml_fix_runner import main as run_fixer
 
 def tighten_flow_spaces(text: str) -> str:
     s = text
@@ -29,22 +30,16 @@ def tighten_flow_spaces(text: str) -> str:
 
     return s
 
+def tighten_file(p: Path) -> bool:
+    original = p.read_text(encoding="utf-8")
+    tightened = tighten_flow_spaces(original)
+    if tightened == original:
+        return False
+    p.write_text(tightened, encoding="utf-8")
+    return True
+
 def main():
-    yaml_paths = list(ROOT.rglob("*.yaml")) + list(ROOT.rglob("*.yml"))
-    changed = 0
-    checked = 0
-    for p in sorted(yaml_paths):
-        try:
-            original = p.read_text(encoding="utf-8")
-        except Exception:
-            continue
-        checked += 1
-        tightened = tighten_flow_spaces(original)
-        if tightened != original:
-            p.write_text(tightened, encoding="utf-8")
-            changed += 1
-            print(f"[TIGHTENED] {p}")
-    print(f"\nChecked: {checked} files; Tightened: {changed}")
+    return run_fixer("yaml_flow_spacing_fix", tighten_file, __file__, fixed_label="TIGHTENED")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
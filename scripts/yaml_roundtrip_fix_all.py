@@ -4,10 +4,12 @@
 # - 2-space mapping + sequence indentation
 # - CRLF stripped
 # - preserve comments & key order
+# Unchanged files are skipped and the rest run in parallel (see yaml_fix_runner.py).
 import sys, re
 from pathlib import Path
 from ruamel.yaml import YAML
 from ruamel.yaml.scalarstring import PreservedScalarString
+from yaml_fix_runner import main as run_fixer
 
 def normalize_file(path: Path) -> bool:
     text = path.read_text(encoding="utf-8", errors="replace")
@@ -53,21 +55,7 @@ def normalize_file(path: Path) -> bool:
     return False
 
 def main():
-    roots = [Path(p) for p in (sys.argv[1:] or ["Codex"])]
-    changed = 0
-    scanned = 0
-    exts = {".yaml", ".yml"}
-    for root in roots:
-        for p in root.rglob("*"):
-            if p.is_file() and p.suffix.lower() in exts:
-                scanned += 1
-                try:
-                    if normalize_file(p):
-                        print(f"[FIXED] {p}")
-                        changed += 1
-                except Exception as e:
-                    print(f"[SKIP ] {p} ({e})")
-    print(f"\nScanned: {scanned}; Fixed: {changed}")
+    return run_fixer("yaml_roundtrip_fix_all", normalize_file, __file__)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())